@@ -0,0 +1,508 @@
+# -*- coding: utf-8 -*-
+"""
+Chunker performans ölçümü: sentetik korpus üzerinde her yöntem için hız, bellek ve
+girdi boyutuyla ölçeklenme.
+
+    python benchmark.py --sizes 100K 1M 10M
+    python benchmark.py --sizes 1M 10M --methods hybrid agentic --set hybrid:window=4
+    python benchmark.py --baseline out/benchmark_prev.json   # gerileme kontrolü
+
+Her ölçüm ayrı (spawn) bir süreçte yapılır; böylece peak RSS diğer yöntemlerden
+etkilenmez. Ölçülenler (yöntem x parametre seti x boyut):
+  - seconds (repeat içinde en iyi), mb_per_s, chunks_per_s
+  - peak_rss_mb: run() sırasında sürecin RSS tepe değerinin girdiyi okuduktan sonraki artışı
+  - py_peak_mb, alloc_blocks: tracemalloc altında ayrı bir çalıştırmada Python heap tepesi
+    ve çalıştırma sonunda canlı kalan blok (tahsis) sayısı (--no-alloc ile atlanır)
+Yöntem başına ölçeklenme üssü k (süre ~ boyut^k) log-log doğrusal uydurmayla bulunur.
+--tokenizers: cümle bölücü backend'lerinin (regex, punkt) hızı ve sınır uyumu (punkt'a göre
+precision/recall/F1) da ölçülür.
+
+Çıktı: out/benchmark.json. Eşikler aşılırsa (k > --max-exponent ya da baseline'a göre
+hız düşüşü > --tolerance) çıkış kodu 1 olur.
+
+--streaming: chunkers.streaming kontrolü (yalnızca streaming destekleyen yöntemler).
+
+    python benchmark.py --streaming --sizes 10M 100M 2G --buffer-chars 64K 1M
+
+Her boyut ve tampon için iter_chunks() çıktısı, aynı dosyada batch run() çıktısıyla
+(chunk dizisinin hash'i) karşılaştırılır ve akışın peak RSS artışı ölçülür; her ölçüm
+ayrı süreçte. Korpusun denk gelmediği tampon sınırı durumları (STREAM_EDGE_CASES) da
+karşılaştırılır. Çıktı out/benchmark_streaming.json; chunk'lar farklıysa ya da peak RSS
+boyutlar arasında --stream-rss-slack MB'tan fazla değişiyorsa (bellek sabit değil)
+çıkış kodu 1 olur. --compare-max'tan büyük korpuslarda batch karşılaştırması atlanır.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import argparse
+import hashlib
+import importlib
+import io
+import json
+import multiprocessing as mp
+import random
+import re
+import sys
+import time
+
+from main import METHODS
+
+CORPUS_DIR = Path(".cache/bench")
+OUT_PATH = Path("out/benchmark.json")
+STREAM_OUT_PATH = Path("out/benchmark_streaming.json")
+
+# sentetik korpusun denk gelmediği tampon sınırı durumları: (metin, tampon boyutları).
+# 1) cap'i aşan birim, tampon '. \n"' ile bitiyor: 'son.' sınırı açılış tırnağından
+#    sonraki harfe bağlı
+STREAM_EDGE_CASES: List[Tuple[str, List[int]]] = [
+    ("Giriş cümlesi burada. " + "kelime " * 301 + 'son. \n"Alıntı yapıldı." Sonra geldi.',
+     [178, 267, 356, 534, 1068]),
+]
+
+# --- sentetik korpus -----------------------------------------------------------
+
+_TR_WORDS = (
+    "veri model bölüm metin analiz sistem kullanıcı süreç sonuç yöntem örnek değer "
+    "çalışma güncel önemli büyük küçük yeni eski hızlı yavaş doğru farklı genel özel "
+    "ağ bilgi kaynak şehir ülke tarih bilim teknoloji eğitim sağlık ekonomi toplum"
+).split()
+_TR_VERBS = "gösterir sağlar etkiler içerir belirler açıklar oluşturur destekler".split()
+_EN_WORDS = (
+    "data model section text analysis system user process result method example value "
+    "study current important large small new old fast slow correct different general "
+    "network information source city country history science technology education"
+).split()
+_EN_VERBS = "shows provides affects contains determines explains creates supports".split()
+
+
+def _sentence(rng: random.Random, words: List[str], verbs: List[str]) -> str:
+    n = rng.randint(6, 22)
+    ws = [rng.choice(words) for _ in range(n)]
+    ws.insert(rng.randint(1, n - 1), rng.choice(verbs))
+    return ws[0].capitalize() + " " + " ".join(ws[1:]) + rng.choice("...!?")
+
+
+def _paragraph(rng: random.Random) -> str:
+    tr = rng.random() < 0.6
+    words, verbs = (_TR_WORDS, _TR_VERBS) if tr else (_EN_WORDS, _EN_VERBS)
+    return " ".join(_sentence(rng, words, verbs) for _ in range(rng.randint(2, 9)))
+
+
+def _heading(rng: random.Random, n: int) -> str:
+    style = rng.randrange(3)
+    title = " ".join(rng.choice(_TR_WORDS + _EN_WORDS) for _ in range(rng.randint(1, 5)))
+    if style == 0:
+        return f"{n}.{rng.randint(1, 9)} {title.capitalize()}"
+    if style == 1:
+        return title.upper()
+    return title.capitalize()
+
+
+def _record(rng: random.Random, n: int) -> str:
+    rec = {
+        "id": n,
+        "title": _heading(rng, n),
+        "qa_pairs": [
+            {"question": _sentence(rng, _TR_WORDS, _TR_VERBS)[:-1] + "?",
+             "answer": _sentence(rng, _TR_WORDS, _TR_VERBS)}
+            for _ in range(rng.randint(1, 3))
+        ],
+    }
+    return json.dumps(rec, ensure_ascii=False)
+
+
+def generate_corpus(path: Path, size_bytes: int, seed: int = 0) -> Path:
+    """
+    ~size_bytes büyüklüğünde (UTF-8) karışık korpus yazar: başlıklar, Türkçe/İngilizce
+    paragraflar, ara sıra JSON benzeri kayıt satırları. Aynı seed aynı metni üretir.
+    """
+    rng = random.Random(seed)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    written = 0
+    n = 0
+    with tmp.open("w", encoding="utf-8") as f:
+        while written < size_bytes:
+            n += 1
+            block = [_heading(rng, n)]
+            for _ in range(rng.randint(1, 6)):
+                block.append(_record(rng, n) if rng.random() < 0.1 else _paragraph(rng))
+            s = "\n\n".join(block) + "\n\n"
+            f.write(s)
+            written += len(s.encode("utf-8"))
+    tmp.replace(path)
+    return path
+
+
+def corpus_path(size_bytes: int, seed: int = 0) -> Path:
+    """Boyut/seed için cache'lenmiş korpus dosyası (yoksa üretilir)."""
+    path = CORPUS_DIR / f"corpus_{size_bytes}_{seed}.txt"
+    if not path.exists():
+        generate_corpus(path, size_bytes, seed)
+    return path
+
+
+def parse_size(s: str) -> int:
+    m = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([KMG]?)B?", s.strip().upper())
+    if not m:
+        raise argparse.ArgumentTypeError(f"geçersiz boyut: {s}")
+    return int(float(m.group(1)) * {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}[m.group(2)])
+
+
+def parse_set(s: str) -> Tuple[str, Dict[str, object]]:
+    """'method:k=v,k2=v2' -> (method, {k: v, ...}); değerler JSON olarak çözülür."""
+    method, _, rest = s.partition(":")
+    params: Dict[str, object] = {}
+    for kv in filter(None, rest.split(",")):
+        k, _, v = kv.partition("=")
+        try:
+            params[k.strip()] = json.loads(v)
+        except ValueError:
+            params[k.strip()] = v
+    return method.strip(), params
+
+# --- ölçüm (alt süreçte) ---------------------------------------------------------
+
+def _rss_mb() -> float:
+    import resource
+    r = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux'ta KB, macOS'ta bayt
+    return r / (1 << 20) if sys.platform == "darwin" else r / 1024
+
+
+def _measure(method: str, params: Dict[str, object], path: str, repeat: int, alloc: bool) -> Dict[str, object]:
+    """Tek ölçüm; ayrı süreçte çalışır. Hata süreci düşürmez, sonuç olarak döner."""
+    try:
+        mod = importlib.import_module(f"chunkers.{method}")
+        text = Path(path).read_text(encoding="utf-8")
+        rss0 = _rss_mb()
+        best = float("inf")
+        n_chunks = 0
+        for _ in range(max(1, repeat)):
+            t0 = time.perf_counter()
+            chunks = mod.run(text, **params)
+            best = min(best, time.perf_counter() - t0)
+            n_chunks = len(chunks)
+            del chunks
+        res: Dict[str, object] = {
+            "seconds": best,
+            "chunks": n_chunks,
+            "peak_rss_mb": max(0.0, _rss_mb() - rss0),
+        }
+        if alloc:
+            import tracemalloc
+            tracemalloc.start()
+            chunks = mod.run(text, **params)
+            _, peak = tracemalloc.get_traced_memory()
+            # izleme başladıktan sonra tahsis edilip hâlâ canlı olan bloklar (chunk'lar dahil)
+            snap = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            res["py_peak_mb"] = peak / (1 << 20)
+            res["alloc_blocks"] = sum(st.count for st in snap.statistics("filename"))
+            del chunks
+        return res
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+def _digest(chunks) -> Tuple[str, int]:
+    """Chunk dizisinin hash'i ve uzunluğu (chunk'lar bellekte tutulmadan)."""
+    h = hashlib.blake2b(digest_size=16)
+    n = 0
+    for ch in chunks:
+        h.update(ch.encode("utf-8"))
+        h.update(b"\0")
+        n += 1
+    return h.hexdigest(), n
+
+
+def _measure_stream(method: str, params: Dict[str, object], path: str, buffer_chars: int) -> Dict[str, object]:
+    """iter_chunks() ile tek geçiş; ayrı süreçte çalışır."""
+    try:
+        from chunkers.streaming import iter_chunks
+        rss0 = _rss_mb()
+        t0 = time.perf_counter()
+        digest, n = _digest(iter_chunks(path, method, buffer_chars, **params))
+        return {"seconds": time.perf_counter() - t0, "chunks": n, "digest": digest,
+                "peak_rss_mb": max(0.0, _rss_mb() - rss0)}
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+def _measure_batch(method: str, params: Dict[str, object], path: str) -> Dict[str, object]:
+    """Aynı dosyada batch run(); ayrı süreçte çalışır."""
+    try:
+        mod = importlib.import_module(f"chunkers.{method}")
+        rss0 = _rss_mb()
+        t0 = time.perf_counter()
+        digest, n = _digest(mod.run(Path(path).read_text(encoding="utf-8"), **params))
+        return {"seconds": time.perf_counter() - t0, "chunks": n, "digest": digest,
+                "peak_rss_mb": max(0.0, _rss_mb() - rss0)}
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+def _run_isolated(ctx, *args, fn=_measure) -> Dict[str, object]:
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+        try:
+            return pool.submit(fn, *args).result()
+        except Exception as e:
+            return {"error": f"{type(e).__name__}: {e}"}
+
+def bench_tokenizers(path: Path, repeat: int = 1) -> Dict[str, object]:
+    """Cümle backend'lerinin hızı ve regex sınırlarının punkt sınırlarıyla uyumu."""
+    from chunkers.sentences import resolve_backend, sent_spans
+
+    text = path.read_text(encoding="utf-8")
+    mb = path.stat().st_size / (1 << 20)
+    res: Dict[str, object] = {}
+    ends: Dict[str, set] = {}
+    for backend in ("regex", "punkt"):
+        try:
+            resolve_backend(backend)
+        except RuntimeError as e:
+            res[backend] = {"error": str(e)}
+            continue
+        best = float("inf")
+        for _ in range(max(1, repeat)):
+            t0 = time.perf_counter()
+            spans = sent_spans(text, backend)
+            best = min(best, time.perf_counter() - t0)
+        ends[backend] = set(spans[1])
+        res[backend] = {"seconds": best, "mb_per_s": mb / best if best > 0 else float("inf"),
+                        "sentences": len(spans[1])}
+    if len(ends) == 2:
+        hit = len(ends["regex"] & ends["punkt"])
+        p = hit / len(ends["regex"]) if ends["regex"] else 1.0
+        r = hit / len(ends["punkt"]) if ends["punkt"] else 1.0
+        res["agreement"] = {"precision": p, "recall": r, "f1": 2 * p * r / (p + r) if p + r else 0.0}
+    return res
+
+def bench_streaming(
+    ctx,
+    runs: List[Tuple[str, Dict[str, object]]],
+    sizes: List[int],
+    buffers: List[int],
+    seed: int,
+    compare_max: int,
+) -> Dict[str, object]:
+    """Yöntem x boyut: batch sonucu ve tampon başına akış sonucu (match: hash'ler aynı mı)."""
+    out: Dict[str, object] = {}
+    for method, params in runs:
+        key = _key(method, params)
+        entry = out[key] = {}
+        for size in sizes:
+            path = str(corpus_path(size, seed))
+            per: Dict[str, object] = {}
+            batch = _run_isolated(ctx, method, params, path, fn=_measure_batch) if size <= compare_max else None
+            per["batch"] = batch if batch is not None else {"skipped": f"> --compare-max ({compare_max} B)"}
+            for buf in buffers:
+                r = _run_isolated(ctx, method, params, path, buf, fn=_measure_stream)
+                if "error" not in r and batch is not None and "error" not in batch:
+                    r["match"] = r["digest"] == batch["digest"]
+                per[str(buf)] = r
+                shown = r.get("error") or (
+                    f"{r['peak_rss_mb']:.0f} MB RSS, "
+                    + {True: "batch ile aynı", False: "BATCH İLE FARKLI", None: "karşılaştırılmadı"}[r.get("match")]
+                )
+                print(f"{key:<32} {size:>12} B  tampon {buf:>9}  {shown}")
+            entry[str(size)] = per
+    return out
+
+
+def check_stream_edges(runs: List[Tuple[str, Dict[str, object]]]) -> List[str]:
+    """STREAM_EDGE_CASES üzerinde iter_chunks() ile run() aynı mı (küçük metinler, süreç içinde)."""
+    from chunkers.streaming import iter_chunks
+
+    problems = []
+    for method, params in runs:
+        run = importlib.import_module(f"chunkers.{method}").run
+        for k, (text, buffers) in enumerate(STREAM_EDGE_CASES, 1):
+            expected = run(text, **params)
+            for buf in buffers:
+                if list(iter_chunks(io.StringIO(text), method, buf, **params)) != expected:
+                    problems.append(f"{_key(method, params)}: sınır durumu {k}, tampon {buf}: "
+                                    "streaming çıktısı batch run()'dan farklı")
+    return problems
+
+
+def check_streaming(report: Dict[str, object], rss_slack_mb: float) -> List[str]:
+    """Akış ihlalleri: batch'ten farklı chunk'lar ve boyutla büyüyen peak RSS."""
+    problems = []
+    for key, entry in report.items():
+        rss: Dict[str, List[Tuple[int, float]]] = {}
+        for size, per in entry.items():
+            for buf, r in per.items():
+                if buf == "batch":
+                    if "error" in r:
+                        problems.append(f"{key} @ {size} B: batch run() hata verdi: {r['error']}")
+                    continue
+                if "error" in r:
+                    problems.append(f"{key} @ {size} B, tampon {buf}: {r['error']}")
+                    continue
+                if r.get("match") is False:
+                    problems.append(f"{key} @ {size} B, tampon {buf}: streaming çıktısı batch run()'dan farklı")
+                rss.setdefault(buf, []).append((int(size), r["peak_rss_mb"]))
+        for buf, pts in rss.items():
+            lo, hi = min(p[1] for p in pts), max(p[1] for p in pts)
+            if len(pts) > 1 and hi - lo > rss_slack_mb:
+                problems.append(f"{key}, tampon {buf}: peak RSS boyutla {lo:.0f} -> {hi:.0f} MB (sabit değil)")
+    return problems
+
+# --- analiz --------------------------------------------------------------------
+
+def scaling_exponent(sizes: List[int], seconds: List[float]) -> Optional[float]:
+    """log(süre) = k*log(boyut) + c uydurmasındaki k; 1 doğrusal, 2 karesel."""
+    import numpy as np
+    pts = [(s, t) for s, t in zip(sizes, seconds) if t > 0]
+    if len(pts) < 2:
+        return None
+    x = np.log([p[0] for p in pts])
+    y = np.log([p[1] for p in pts])
+    return float(np.polyfit(x, y, 1)[0])
+
+
+def _key(method: str, params: Dict[str, object]) -> str:
+    if not params:
+        return method
+    return method + ":" + ",".join(f"{k}={json.dumps(v)}" for k, v in sorted(params.items()))
+
+
+def check_regressions(
+    report: Dict[str, object],
+    baseline: Optional[Dict[str, object]],
+    max_exponent: float,
+    tolerance: float,
+) -> List[str]:
+    """Eşik ihlalleri: süper-doğrusal ölçeklenme ve baseline'a göre hız düşüşü."""
+    problems = []
+    base = (baseline or {}).get("results", {})
+    for key, entry in report["results"].items():
+        k = entry.get("exponent")
+        if k is not None and k > max_exponent:
+            problems.append(f"{key}: ölçeklenme üssü {k:.2f} > {max_exponent}")
+        for size, run in entry["sizes"].items():
+            old = base.get(key, {}).get("sizes", {}).get(size)
+            if not old or "mb_per_s" not in old or "mb_per_s" not in run:
+                continue
+            if run["mb_per_s"] < old["mb_per_s"] * (1.0 - tolerance):
+                problems.append(
+                    f"{key} @ {size} B: {run['mb_per_s']:.2f} MB/s, baseline {old['mb_per_s']:.2f} MB/s"
+                )
+    return problems
+
+# --- ana akış ----------------------------------------------------------------
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Chunker'ların hız/bellek/ölçeklenme ölçümü.")
+    ap.add_argument("--sizes", nargs="+", type=parse_size, default=[parse_size(s) for s in ("100K", "1M", "10M")],
+                    help="korpus boyutları (ör. 100K 1M 10M 1G)")
+    ap.add_argument("--methods", nargs="+", default=METHODS, choices=METHODS)
+    ap.add_argument("--set", dest="sets", action="append", type=parse_set, default=[],
+                    metavar="METHOD:K=V,...", help="ek parametre seti (tekrarlanabilir)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=1, help="ölçüm tekrarı; en iyi süre alınır")
+    ap.add_argument("--no-alloc", action="store_true", help="tracemalloc ölçümünü atla")
+    ap.add_argument("--tokenizers", action="store_true",
+                    help="cümle bölücü backend'lerini (regex/punkt) hız ve uyum için de ölç")
+    ap.add_argument("--streaming", action="store_true",
+                    help="streaming kontrolü: iter_chunks() = batch run() ve sabit bellek (bkz. modül açıklaması)")
+    ap.add_argument("--buffer-chars", nargs="+", type=parse_size, default=[1 << 16, 1 << 20],
+                    help="--streaming: denenecek tampon boyutları")
+    ap.add_argument("--compare-max", type=parse_size, default=parse_size("4G"),
+                    help="--streaming: bundan büyük korpuslarda batch run() karşılaştırması atlanır")
+    ap.add_argument("--stream-rss-slack", type=float, default=32.0,
+                    help="--streaming: boyutlar arasında izin verilen peak RSS farkı (MB)")
+    ap.add_argument("--out", type=Path, help=f"rapor yolu (varsayılan {OUT_PATH}, --streaming ile {STREAM_OUT_PATH})")
+    ap.add_argument("--baseline", type=Path, help="karşılaştırılacak önceki benchmark.json")
+    ap.add_argument("--tolerance", type=float, default=0.3,
+                    help="baseline'a göre izin verilen göreli MB/s düşüşü")
+    ap.add_argument("--max-exponent", type=float, default=1.3,
+                    help="izin verilen en büyük ölçeklenme üssü (süre ~ boyut^k)")
+    args = ap.parse_args(argv)
+
+    runs: List[Tuple[str, Dict[str, object]]] = [(m, {}) for m in args.methods]
+    runs += [(m, p) for m, p in args.sets if m in args.methods]
+    sizes = sorted(set(args.sizes))
+    ctx = mp.get_context("spawn")
+    if args.streaming:
+        return _main_streaming(args, runs, sizes, ctx)
+    args.out = args.out or OUT_PATH
+
+    results: Dict[str, Dict[str, object]] = {}
+    for method, params in runs:
+        key = _key(method, params)
+        entry: Dict[str, object] = {"method": method, "params": params, "sizes": {}}
+        for size in sizes:
+            path = corpus_path(size, args.seed)
+            r = _run_isolated(ctx, method, params, str(path), args.repeat, not args.no_alloc)
+            if "error" not in r:
+                mb = path.stat().st_size / (1 << 20)
+                r["mb_per_s"] = mb / r["seconds"] if r["seconds"] > 0 else float("inf")
+                r["chunks_per_s"] = r["chunks"] / r["seconds"] if r["seconds"] > 0 else float("inf")
+            entry["sizes"][str(size)] = r
+            shown = r.get("error") or f"{r['mb_per_s']:.2f} MB/s, {r['peak_rss_mb']:.0f} MB RSS"
+            print(f"{key:<32} {size:>12} B  {shown}")
+            if "error" in r:
+                break
+        ok = [(int(s), r["seconds"]) for s, r in entry["sizes"].items() if "error" not in r]
+        entry["exponent"] = scaling_exponent([s for s, _ in ok], [t for _, t in ok])
+        results[key] = entry
+
+    report = {
+        "python": sys.version.split()[0],
+        "seed": args.seed,
+        "sizes": sizes,
+        "results": results,
+    }
+    if args.tokenizers:
+        report["tokenizers"] = {}
+        for size in sizes:
+            tok = report["tokenizers"][str(size)] = bench_tokenizers(corpus_path(size, args.seed), args.repeat)
+            shown = ", ".join(
+                f"{b}: {tok[b]['mb_per_s']:.2f} MB/s" if "error" not in tok[b] else f"{b}: yok"
+                for b in ("regex", "punkt")
+            )
+            if "agreement" in tok:
+                shown += f", F1 {tok['agreement']['f1']:.3f}"
+            print(f"{'tokenizers':<32} {size:>12} B  {shown}")
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline else None
+    problems = check_regressions(report, baseline, args.max_exponent, args.tolerance)
+    report["regressions"] = problems
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"✓ {args.out}")
+    for p in problems:
+        print(f"  ! {p}")
+    return 1 if problems else 0
+
+
+def _main_streaming(args, runs: List[Tuple[str, Dict[str, object]]], sizes: List[int], ctx) -> int:
+    from chunkers.streaming import _STREAMERS
+    runs = [(m, p) for m, p in runs if m in _STREAMERS]
+    if not runs:
+        print(f"streaming destekleyen yöntem seçilmedi ({', '.join(_STREAMERS)})")
+        return 1
+    results = bench_streaming(ctx, runs, sizes, sorted(set(args.buffer_chars)), args.seed, args.compare_max)
+    problems = check_stream_edges(runs) + check_streaming(results, args.stream_rss_slack)
+    report = {
+        "python": sys.version.split()[0],
+        "seed": args.seed,
+        "sizes": sizes,
+        "buffer_chars": sorted(set(args.buffer_chars)),
+        "streaming": results,
+        "problems": problems,
+    }
+    out = args.out or STREAM_OUT_PATH
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"✓ {out}")
+    for p in problems:
+        print(f"  ! {p}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
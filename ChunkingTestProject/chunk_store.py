@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+Chunk deposu: bir yöntemin chunk'ları tek bir UTF-8 metin blob'u + NumPy offset dizisi.
+
+    tests/<method>.chunks/
+      text.bin          chunk'ların art arda UTF-8 baytları (ayırıcı yok)
+      offsets.npy       (n+1,) int64 bayt offset'leri; chunk i = text.bin[off[i]:off[i+1]]
+      record_index.npy  (n,) int32, opsiyonel: chunk -> meta["records"] içindeki kayıt sırası
+      context.npy       (n, 4) int64, opsiyonel: bağlam referansları (sol_id, sol_başlangıç,
+                        sağ_id, sağ_bitiş); sol bağlam = chunk[sol_id][sol_başlangıç:], sağ bağlam =
+                        chunk[sağ_id][:sağ_bitiş], komşu yoksa id -1 (bkz. expand())
+      meta.json         format sürümü, method, params, num_chunks, records
+      manifest.json     opsiyonel: artımlı chunk'lama manifestosu (bkz. manifest.py)
+      chunk_ids.json    opsiyonel: manifestoyla yazılan, çalıştırmalar arası kararlı chunk kimlikleri
+      embeddings.*      opsiyonel: chunk başına nicemlenmiş embedding'ler (bkz. embedding_store.py)
+
+Bir kez yazılır, mmap ile okunur: chunk i'ye ayrıştırma yapmadan O(1) erişilir.
+"===== CHUNK n =====" metin biçimi export_txt() ile üretilebilir.
+"""
+
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import json
+import mmap
+import shutil
+
+import numpy as np
+
+FORMAT_VERSION = 1
+SUFFIX = ".chunks"
+TXT_HEADER = "===== CHUNK {} ====="
+CHUNK_IDS = "chunk_ids.json"
+
+# (sol_id, sol_başlangıç, sağ_id, sağ_bitiş); offset'ler komşu chunk metninde karakter olarak
+ContextRef = Tuple[int, int, int, int]
+
+
+def is_store(path: Union[str, Path]) -> bool:
+    return (Path(path) / "meta.json").is_file()
+
+
+class ChunkStoreWriter:
+    """
+    Chunk'ları sırayla depoya yazar. Yazım <path>.tmp altında yapılır ve close()'da
+    hedefe taşınır; yarım kalan yazım eski depoyu bozmaz.
+
+        with ChunkStoreWriter("tests/agentic.chunks", method="agentic") as w:
+            for ch in chunks:
+                w.add(ch)
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        method: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        context_sep: Optional[str] = None,
+    ):
+        """context_sep verilirse her chunk bağlam referansıyla eklenir (add(..., context=...))."""
+        self.path = Path(path)
+        self.meta: Dict[str, Any] = {
+            "format": FORMAT_VERSION,
+            "method": method,
+            "params": params or {},
+        }
+        if context_sep is not None:
+            self.meta["context_sep"] = context_sep
+        self._tmp = self.path.with_name(self.path.name + ".tmp")
+        if self._tmp.exists():
+            shutil.rmtree(self._tmp)
+        self._tmp.mkdir(parents=True)
+        self._blob = (self._tmp / "text.bin").open("wb")
+        self._offsets = array("q", [0])
+        self._record_index = array("i")
+        self._record_pos: Dict[str, int] = {}
+        self._context = array("q") if context_sep is not None else None
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def add(self, text: str, record_id: Optional[str] = None, context: Optional[ContextRef] = None) -> int:
+        """Chunk'ı ekler, sırasını döndürür. record_id ya hep verilmeli ya hiç."""
+        if (context is None) != (self._context is None):
+            raise ValueError("bağlam referansı yalnızca context_sep ile açılmış depoda (ve her chunk'ta) verilir")
+        if context is not None:
+            self._context.extend(context)
+        data = text.encode("utf-8")
+        self._blob.write(data)
+        self._offsets.append(self._offsets[-1] + len(data))
+        if record_id is not None:
+            if len(self._record_index) != len(self) - 1:
+                raise ValueError("record_id bazı chunk'larda verilip bazılarında verilmemiş")
+            self._record_index.append(self._record_pos.setdefault(record_id, len(self._record_pos)))
+        return len(self) - 1
+
+    def add_all(self, chunks: Iterable[str], record_id: Optional[str] = None) -> None:
+        for ch in chunks:
+            self.add(ch, record_id)
+
+    def add_range(self, store: "ChunkStore", start: int, stop: int, record_id: Optional[str] = None) -> None:
+        """Başka bir depodaki [start, stop) chunk'larını baytları çözmeden kopyalar."""
+        if stop <= start:
+            return
+        if self._context is not None:
+            raise ValueError("bağlam referanslı depoya aralık kopyalanamaz")
+        a, b = int(store.offsets[start]), int(store.offsets[stop])
+        self._blob.write(store._buf[a:b])
+        base = self._offsets[-1] - a
+        self._offsets.frombytes((store.offsets[start + 1:stop + 1] + base).astype(np.int64).tobytes())
+        if record_id is not None:
+            if len(self._record_index) != len(self) - (stop - start):
+                raise ValueError("record_id bazı chunk'larda verilip bazılarında verilmemiş")
+            pos = self._record_pos.setdefault(record_id, len(self._record_pos))
+            self._record_index.extend([pos] * (stop - start))
+
+    def write_json(self, name: str, obj: Any) -> None:
+        """Depoya ek bir JSON dosyası yazar; close()'da depoyla birlikte taşınır."""
+        (self._tmp / name).write_text(json.dumps(obj, ensure_ascii=False), encoding="utf-8")
+
+    def write_array(self, name: str, arr: np.ndarray) -> None:
+        """Depoya ek bir .npy dizisi yazar (ChunkStore tarafında np.load(..., mmap_mode="r"))."""
+        np.save(self._tmp / name, arr)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._blob.close()
+        n = len(self)
+        np.save(self._tmp / "offsets.npy", np.frombuffer(self._offsets, dtype=np.int64))
+        if self._record_pos:
+            if len(self._record_index) != n:
+                raise ValueError("record_id bazı chunk'larda verilip bazılarında verilmemiş")
+            np.save(self._tmp / "record_index.npy", np.frombuffer(self._record_index, dtype=np.int32))
+        if self._context is not None:
+            np.save(self._tmp / "context.npy", np.frombuffer(self._context, dtype=np.int64).reshape(n, 4))
+        self.meta["num_chunks"] = n
+        self.meta["records"] = list(self._record_pos) if self._record_pos else None
+        (self._tmp / "meta.json").write_text(json.dumps(self.meta, ensure_ascii=False), encoding="utf-8")
+
+        if self.path.exists():
+            shutil.rmtree(self.path)
+        self._tmp.rename(self.path)
+
+    def abort(self) -> None:
+        """Yazımı iptal eder; hedef depoya dokunulmaz."""
+        self._closed = True
+        self._blob.close()
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def __enter__(self) -> "ChunkStoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class ChunkStore:
+    """Salt okunur, mmap tabanlı chunk deposu; store[i] chunk metnini döndürür."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.meta: Dict[str, Any] = json.loads((self.path / "meta.json").read_text(encoding="utf-8"))
+        if self.meta.get("format") != FORMAT_VERSION:
+            raise ValueError(f"{self.path}: desteklenmeyen chunk deposu sürümü {self.meta.get('format')}")
+        self.offsets = np.load(self.path / "offsets.npy", mmap_mode="r")
+        with (self.path / "text.bin").open("rb") as f:
+            # boş dosya mmap'lenemez
+            self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.offsets[-1] else b""
+        rec_path = self.path / "record_index.npy"
+        self.record_index = np.load(rec_path, mmap_mode="r") if rec_path.exists() else None
+        ctx_path = self.path / "context.npy"
+        self.context = np.load(ctx_path, mmap_mode="r") if ctx_path.exists() else None
+        self._chunk_ids: Optional[List[str]] = None
+
+    @property
+    def method(self) -> Optional[str]:
+        return self.meta.get("method")
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        return self.meta.get("params") or {}
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def byte_range(self, i: int):
+        return int(self.offsets[i]), int(self.offsets[i + 1])
+
+    def __getitem__(self, i: int) -> str:
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError(i)
+        a, b = self.byte_range(i)
+        return self._buf[a:b].decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def record_id(self, i: int) -> Optional[str]:
+        if self.record_index is None:
+            return None
+        return self.meta["records"][int(self.record_index[i])]
+
+    def chunk_id(self, i: int) -> Optional[str]:
+        """Chunk'ın kararlı kimliği (artımlı modda yazılır, bkz. manifest.py); yoksa None."""
+        if self._chunk_ids is None:
+            self._chunk_ids = self.read_json(CHUNK_IDS) or []
+        return self._chunk_ids[i] if i < len(self._chunk_ids) else None
+
+    def context_texts(self, i: int) -> Tuple[str, str]:
+        """Chunk'ın (sol, sağ) bağlam metni; bağlam referansı yoksa ("", "")."""
+        if self.context is None:
+            return "", ""
+        left_id, left, right_id, right = (int(x) for x in self.context[i])
+        return (
+            self[left_id][left:] if left_id >= 0 else "",
+            self[right_id][:right] if right_id >= 0 else "",
+        )
+
+    def expand(self, i: int) -> str:
+        """Chunk'ı bağlamıyla birlikte döndürür (context_enriched.run() metni); referans yoksa store[i]."""
+        core = self[i]
+        if self.context is None:
+            return core
+        left, right = self.context_texts(i)
+        return self.meta.get("context_sep", " ").join(p for p in (left, core, right) if p)
+
+    def read_json(self, name: str) -> Optional[Any]:
+        """write_json() ile yazılmış ek dosya; yoksa None."""
+        p = self.path / name
+        return json.loads(p.read_text(encoding="utf-8")) if p.is_file() else None
+
+    def texts(self) -> List[str]:
+        return list(self)
+
+    def close(self) -> None:
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.close()
+
+    def __enter__(self) -> "ChunkStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def write_txt(out_file: Union[str, Path], chunks: Iterable[str]) -> int:
+    """Chunk'ları "===== CHUNK n =====" başlıklı metin biçiminde yazar; chunk sayısını döndürür."""
+    i = 0
+    with Path(out_file).open("w", encoding="utf-8") as f:
+        for ch in chunks:
+            i += 1
+            f.write(f"{TXT_HEADER.format(i)}\n{ch}\n\n")
+    return i
+
+
+def export_txt(store_path: Union[str, Path], out_file: Union[str, Path]) -> int:
+    """Depoyu eski .txt biçimine aktarır."""
+    with ChunkStore(store_path) as store:
+        return write_txt(out_file, store)
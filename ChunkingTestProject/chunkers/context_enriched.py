@@ -1,8 +1,94 @@
-from typing import List
-from .sentence_based import run as sentence_chunk
+from typing import List, Optional, Sequence, Tuple, Union
+from .document import Document
+from .profiling import stage
+from .sentence_based import run_spans as sentence_spans
+from .spans import ChunkSpans
+
+def run_spans(
+    text: Union[str, Document],
+    target_chars: int = 900,
+    overlap_sent: int = 1,
+    side_ctx: int = 1,
+) -> ChunkSpans:
+    """run() ile aynı chunk'lar; metin üretmeden span olarak."""
+    base = sentence_spans(text, target_chars=target_chars, overlap_sent=overlap_sent)
+    enriched = ChunkSpans(base.source, base.sep)
+    n = len(base)
+
+    # Komşu bağlamı, base chunk'ları oluşturan cümle span'lerinden seçilir (yeniden bölme yok)
+    with stage("enrich"):
+        for i in range(n):
+            left_tail = base.segments(i - 1)[-side_ctx:] if side_ctx > 0 and i > 0 else []
+            right_head = base.segments(i + 1)[:side_ctx] if side_ctx > 0 and i + 1 < n else []
+            enriched.add(left_tail + base.segments(i) + right_head)
+
+    return enriched
+
+# referanslı çıktıda chunk başına (çekirdek metin, sol_başlangıç, sağ_bitiş); bkz. run_refs()
+RefChunk = Tuple[str, int, int]
+
+def run_refs(
+    text: Union[str, Document],
+    target_chars: int = 900,
+    overlap_sent: int = 1,
+    side_ctx: int = 1,
+) -> List[RefChunk]:
+    """
+    Referanslı çıktı: komşu cümleler chunk'a kopyalanmaz. Her chunk için çekirdek metin
+    (sentence_based chunk'ı) ve bağlamın komşu chunk metinleri içindeki yeri döner:
+      - sol bağlam = önceki chunk metni[sol_başlangıç:]  (önceki chunk yoksa -1)
+      - sağ bağlam = sonraki chunk metni[:sağ_bitiş]     (sonraki chunk yoksa -1)
+    expand_refs() ile run() çıktısının aynısı elde edilir; indeksleyici çekirdeği gömüp
+    bağlamı ancak retrieval anında açabilir.
+    """
+    base = sentence_spans(text, target_chars=target_chars, overlap_sent=overlap_sent)
+    n = len(base)
+    sep_len = len(base.sep)
+    out: List[RefChunk] = []
+
+    with stage("enrich"):
+        lens = [base.char_len(i) for i in range(n)]
+        for i in range(n):
+            left = right = -1
+            if i > 0:
+                left = lens[i - 1]
+                if side_ctx > 0:
+                    tail = base.segments(i - 1)[-side_ctx:]
+                    left -= sum(e - s for s, e in tail) + (len(tail) - 1) * sep_len if tail else 0
+            if i + 1 < n:
+                head = base.segments(i + 1)[:side_ctx] if side_ctx > 0 else []
+                right = sum(e - s for s, e in head) + (len(head) - 1) * sep_len if head else 0
+            out.append((base.text(i), left, right))
+
+    return out
+
+def expand_ref(
+    core: str,
+    left_text: Optional[str],
+    right_text: Optional[str],
+    left: int,
+    right: int,
+    sep: str = " ",
+) -> str:
+    """Tek chunk'ı bağlamıyla açar: komşu metinlerinden sol/sağ parça alınıp çekirdeğe eklenir."""
+    parts = [
+        left_text[left:] if left >= 0 and left_text is not None else "",
+        core,
+        right_text[:right] if right >= 0 and right_text is not None else "",
+    ]
+    return sep.join(p for p in parts if p)
+
+def expand_refs(chunks: Sequence[RefChunk], sep: str = " ") -> List[str]:
+    """run_refs() çıktısını run() çıktısına çevirir."""
+    n = len(chunks)
+    return [
+        expand_ref(core, chunks[i - 1][0] if i > 0 else None, chunks[i + 1][0] if i + 1 < n else None,
+                   left, right, sep)
+        for i, (core, left, right) in enumerate(chunks)
+    ]
 
 def run(
-    text: str,
+    text: Union[str, Document],
     target_chars: int = 900,
     overlap_sent: int = 1,
     side_ctx: int = 1,
@@ -12,46 +98,11 @@ def run(
       1) Cümle bazlı chunkla (sentence_based).
       2) Her chunk'a bir önceki ve bir sonraki chunk'tan 'side_ctx' kadar cümle ekle.
          (bağlam kaybını azaltır; retrieval kalitesini iyileştirir)
+      Bağlamı kopyalamadan referans olarak saklamak için run_refs() kullanılır.
 
     Parametreler:
       - target_chars: ana chunk hedef boyutu (sentence_based için)
       - overlap_sent: sentence_based aşamasındaki cümle overlap sayısı
       - side_ctx: her chunk'a sol/sağdan eklenecek cümle sayısı
     """
-    base = sentence_chunk(text, target_chars=target_chars, overlap_sent=overlap_sent)
-    if not base:
-        return []
-
-    # Basit cümle kesici (nokta-temelli) — sadece komşu chunk'lardan ctx seçimi için
-    def _split_simple(x: str) -> List[str]:
-        parts = [t.strip() for t in x.replace("\r\n", "\n").replace("\r", "\n").split(". ") if t.strip()]
-        # Nokta kaybolmasın diye geri ekleme (opsiyonel, kısa tut)
-        return [p if p.endswith(".") else (p + ".") for p in parts]
-
-    enriched: List[str] = []
-    n = len(base)
-
-    for i, ch in enumerate(base):
-        left_tail = []
-        right_head = []
-
-        if side_ctx > 0 and i > 0:
-            left_sents = _split_simple(base[i - 1])
-            left_tail = left_sents[-side_ctx:]
-
-        if side_ctx > 0 and i + 1 < n:
-            right_sents = _split_simple(base[i + 1])
-            right_head = right_sents[:side_ctx]
-
-        # birleştir
-        pieces = []
-        if left_tail:
-            pieces.append(" ".join(left_tail))
-        pieces.append(ch)
-        if right_head:
-            pieces.append(" ".join(right_head))
-
-        enriched_text = " ".join(pieces).strip()
-        enriched.append(enriched_text)
-
-    return enriched
\ No newline at end of file
+    return run_spans(text, target_chars, overlap_sent, side_ctx).texts()
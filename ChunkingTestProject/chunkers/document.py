@@ -0,0 +1,180 @@
+from array import array
+from typing import List, Optional, Tuple, Union
+import re
+from .profiling import count, stage
+from .sections import SectionTree, parse_sections
+from .sentences import sent_spans, sent_spans_many, tokenize
+from .spans import strip_range as _strip_span
+
+# Paragraf ayırıcı: en az bir boş satır (sadece boşluk içeren satırlar da boş sayılır)
+_PARA_SEP = re.compile(r"\n\s*\n")
+
+
+def _sent_tokenize(text: str) -> List[str]:
+    """Cümlelere böl (bkz. sentences: punkt verisi varsa punkt, yoksa regex; ağa çıkmaz)."""
+    return tokenize(text)
+
+
+def normalize(text: str) -> str:
+    """Satır sonlarını tek tipe (\\n) indirger."""
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _piece_spans(text: str, pieces: List[str], base: int = 0) -> Tuple[array, array]:
+    """
+    Tokenizer'ın döndürdüğü parçaları metin üzerindeki (start, end) aralıklarına çevirir.
+    Parçalar strip'lenir, boş olanlar atılır (chunker'ların eski filtresiyle aynı).
+    """
+    starts, ends = array("q"), array("q")
+    pos = 0
+    for p in pieces:
+        s = p.strip()
+        if not s:
+            continue
+        # parçalar metnin ardışık alt dizgileri; aradaki boşluk atlanarak bulunur
+        k = text.find(s, pos)
+        starts.append(base + k)
+        ends.append(base + k + len(s))
+        pos = k + len(s)
+    return starts, ends
+
+
+def _split_spans(text: str, sep: "re.Pattern") -> Tuple[array, array]:
+    """re.split(sep, text) parçalarının strip'li ve boş olmayan aralıkları."""
+    starts, ends = array("q"), array("q")
+    prev = 0
+    for m in sep.finditer(text):
+        s, e = _strip_span(text, prev, m.start())
+        if s < e:
+            starts.append(s)
+            ends.append(e)
+        prev = m.end()
+    s, e = _strip_span(text, prev, len(text))
+    if s < e:
+        starts.append(s)
+        ends.append(e)
+    return starts, ends
+
+
+class Document:
+    """
+    Önceden tokenize edilmiş doküman:
+      - text: normalize edilmiş metin (\\r\\n -> \\n)
+      - cümle ve paragraf sınırları, text üzerinde (start, end) int dizileri olarak
+      - başlık bazlı bölümler: satırları strip'lenmiş görünüm (lines_text) üzerinde
+        bölüm aralıkları + bölüm içi cümle aralıkları
+
+    Her sınır ilk ihtiyaç anında bir kez hesaplanır ve saklanır; böylece aynı dokümanı
+    işleyen tüm chunker'lar tokenizasyon maliyetini paylaşır.
+    """
+
+    __slots__ = ("text", "_sents", "_paras", "_lines_text", "_tree", "_sec_sents")
+
+    def __init__(self, text: str):
+        with stage("normalize"):
+            self.text = normalize(text)
+        self._sents: Optional[Tuple[array, array]] = None
+        self._paras: Optional[Tuple[array, array]] = None
+        self._lines_text: Optional[str] = None
+        self._tree: Optional[SectionTree] = None
+        self._sec_sents: Optional[Tuple[array, array, array]] = None
+
+    # --- cümleler ---------------------------------------------------------------
+
+    @property
+    def sent_spans(self) -> Tuple[array, array]:
+        """Tüm metnin cümle aralıkları (starts, ends)."""
+        if self._sents is None:
+            with stage("sent_tokenize"):
+                self._sents = sent_spans(self.text)
+            count("sentences", len(self._sents[0]))
+        return self._sents
+
+    def sentences(self) -> List[str]:
+        starts, ends = self.sent_spans
+        t = self.text
+        return [t[s:e] for s, e in zip(starts, ends)]
+
+    # --- paragraflar ------------------------------------------------------------
+
+    @property
+    def para_spans(self) -> Tuple[array, array]:
+        """Boş satırlarla ayrılmış paragrafların aralıkları (starts, ends)."""
+        if self._paras is None:
+            with stage("paragraphs"):
+                self._paras = _split_spans(self.text, _PARA_SEP)
+            count("paragraphs", len(self._paras[0]))
+        return self._paras
+
+    def paragraphs(self) -> List[str]:
+        starts, ends = self.para_spans
+        t = self.text
+        return [t[s:e] for s, e in zip(starts, ends)]
+
+    # --- başlık bazlı bölümler --------------------------------------------------
+
+    @property
+    def lines_text(self) -> str:
+        """Boş olmayan, strip'lenmiş satırların '\\n' ile birleşimi (bölüm görünümü)."""
+        if self._lines_text is None:
+            with stage("lines"):
+                self._lines_text = "\n".join(ln.strip() for ln in self.text.split("\n") if ln.strip())
+        return self._lines_text
+
+    @property
+    def section_tree(self) -> SectionTree:
+        """lines_text üzerinde bölüm ağacı (numaralı başlık derinliği korunur); bir kez kurulur."""
+        if self._tree is None:
+            lt = self.lines_text
+            with stage("heading_detect"):
+                self._tree = parse_sections(lt)
+            count("sections", len(self._tree))
+        return self._tree
+
+    @property
+    def section_spans(self) -> Tuple[array, array]:
+        """lines_text üzerinde bölüm aralıkları; her başlık satırı yeni bölüm açar."""
+        tree = self.section_tree
+        return tree.starts, tree.ends
+
+    @property
+    def section_sent_spans(self) -> Tuple[array, array, array]:
+        """
+        Bölüm içi cümle aralıkları (CSR düzeni): bölüm k'nın cümleleri
+        ptr[k]..ptr[k+1] indeksleri arasındaki (starts, ends) çiftleridir.
+        """
+        if self._sec_sents is None:
+            lt = self.lines_text
+            ptr = array("q", [0])
+            starts, ends = array("q"), array("q")
+            sections = self.section_spans
+            with stage("sent_tokenize"):
+                sec_starts, sec_ends = sections
+                per_section = sent_spans_many(
+                    [lt[s:e] for s, e in zip(sec_starts, sec_ends)], bases=sec_starts
+                )
+                for ss, ee in per_section:
+                    starts.extend(ss)
+                    ends.extend(ee)
+                    ptr.append(len(starts))
+            self._sec_sents = (ptr, starts, ends)
+            count("sentences", len(starts))
+        return self._sec_sents
+
+    def sections(self) -> List[str]:
+        lt = self.lines_text
+        return [lt[s:e] for s, e in zip(*self.section_spans)]
+
+    def section_sentences(self) -> List[List[str]]:
+        """Her bölümün cümle listesi (bölüm sırasıyla)."""
+        lt = self.lines_text
+        ptr, starts, ends = self.section_sent_spans
+        return [
+            [lt[starts[j]:ends[j]] for j in range(ptr[k], ptr[k + 1])]
+            for k in range(len(ptr) - 1)
+        ]
+
+
+def as_document(text: Union[str, Document]) -> Document:
+    """Ham metin ya da hazır Document kabul eder; her zaman Document döndürür."""
+    return text if isinstance(text, Document) else Document(text)
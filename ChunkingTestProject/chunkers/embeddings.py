@@ -0,0 +1,287 @@
+"""
+Semantic chunker için süreç genelinde model kaydı ve kalıcı (disk) embedding cache'i.
+
+  - get_model(name): her model süreç başına bir kez yüklenir; sentence-transformers (ve torch)
+    modül import'unda değil ilk modelde import edilir.
+  - encode(sents, model_name): normalize cümle hash'i ile cache'e bakar, sadece
+    cache'te olmayan cümleleri encode eder.
+
+Cache düzeni (model başına bir klasör):
+  vectors.f32   (capacity, dim) float32 memmap — embedding'ler
+  keys.u8       (capacity, 16)  uint8 memmap   — normalize cümle hash'i (blake2b-128)
+  ticks.i64     (capacity,)     int64 memmap   — son kullanım sayacı (0: boş slot), LRU için
+  header.i64    [generation, clock]            — başka süreç yazdıysa indeksi yenilemek için
+  meta.json     dim, capacity
+
+Kapasite max_bytes / (dim * 4) slot'tur; dolunca en eski kullanılan slot'lar boşaltılır.
+Aynı cache'i kullanan süreçler (main.py --workers) dosya kilidiyle sıralanır.
+
+Chunk embedding'leri (main.py --embed) için ortak encoder kancası:
+  - ENCODERS: isim -> metinleri (n, dim) L2-normalize float32'ye çeviren fonksiyon
+    ("model": sentence-transformers + cache, "hashing": bağımlılıksız feature hashing);
+    register_encoder() ile yenisi eklenir
+  - embed_chunks(mod, doc, encoder): yöntem run_embedded() sağlıyorsa (semantic: centroid'ler)
+    onu, yoksa run() + encoder'ı kullanır
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import shutil
+import threading
+import unicodedata
+import zlib
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: süreçler arası kilit yok
+    fcntl = None
+
+
+DEFAULT_CACHE_DIR = os.environ.get("CHUNK_EMB_CACHE", ".cache/embeddings")
+DEFAULT_MAX_BYTES = 512 << 20
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+HASHING_DIM = 256
+
+Encoder = Callable[[Sequence[str]], np.ndarray]
+
+_MODELS: Dict[str, object] = {}
+_CACHES: Dict[Tuple[str, str], "EmbeddingCache"] = {}
+_LOCK = threading.Lock()
+
+
+def has_sentence_transformers() -> bool:
+    """sentence-transformers kurulu mu (paketi import etmeden bakar)."""
+    return importlib.util.find_spec("sentence_transformers") is not None
+
+
+def get_model(name: str):
+    """Modeli süreç başına bir kez yükler (sonraki çağrılar aynı nesneyi döndürür)."""
+    with _LOCK:
+        model = _MODELS.get(name)
+        if model is None:
+            try:
+                from sentence_transformers import SentenceTransformer  # pip install sentence-transformers
+            except Exception:
+                raise RuntimeError(
+                    "semantic için 'sentence-transformers' gerekli. Kur: pip install sentence-transformers"
+                )
+            model = _MODELS[name] = SentenceTransformer(name)
+        return model
+
+
+def sentence_key(s: str) -> bytes:
+    """Normalize cümlenin (NFC + boşluk sadeleştirme) 16 baytlık hash'i."""
+    norm = " ".join(unicodedata.normalize("NFC", s).split())
+    return hashlib.blake2b(norm.encode("utf-8"), digest_size=16).digest()
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a+b") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class EmbeddingCache:
+    """Tek bir modelin mmap tabanlı, LRU'lu embedding cache'i."""
+
+    def __init__(self, root: str, model_name: str, dim: int, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.dir = Path(root) / re.sub(r"[^\w.-]+", "__", model_name)
+        self.dim = dim
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._lock_path = self.dir / "lock"
+
+        with _file_lock(self._lock_path):
+            meta_path = self.dir / "meta.json"
+            meta = json.loads(meta_path.read_text()) if meta_path.exists() else None
+            if meta is not None and meta.get("dim") != dim:
+                # farklı boyutlu eski cache (model değişmiş): sıfırdan başla
+                for p in self.dir.iterdir():
+                    if p == self._lock_path:
+                        continue
+                    if p.is_dir():
+                        shutil.rmtree(p)
+                    else:
+                        p.unlink()
+                meta = None
+            if meta is None:
+                capacity = max(1, max_bytes // (dim * 4))
+                mode = "w+"
+            else:
+                capacity = int(meta["capacity"])
+                mode = "r+"
+            self.capacity = capacity
+            self.vectors = np.memmap(self.dir / "vectors.f32", np.float32, mode, shape=(capacity, dim))
+            self.keys = np.memmap(self.dir / "keys.u8", np.uint8, mode, shape=(capacity, 16))
+            self.ticks = np.memmap(self.dir / "ticks.i64", np.int64, mode, shape=(capacity,))
+            self.header = np.memmap(self.dir / "header.i64", np.int64, mode, shape=(2,))
+            if meta is None:
+                meta_path.write_text(json.dumps({"dim": dim, "capacity": capacity}))
+            self._gen = -1
+            self._index: Dict[bytes, int] = {}
+            self._refresh()
+
+    def _refresh(self) -> None:
+        """Başka bir süreç yazdıysa hash -> slot indeksini memmap'ten yeniden kur."""
+        gen = int(self.header[0])
+        if gen == self._gen:
+            return
+        used = np.flatnonzero(self.ticks)
+        raw = self.keys[used].tobytes()
+        self._index = {raw[16 * j:16 * (j + 1)]: int(slot) for j, slot in enumerate(used)}
+        self._gen = gen
+
+    def _touch(self, slots: Sequence[int]) -> None:
+        if not len(slots):
+            return
+        clock = int(self.header[1])
+        self.ticks[list(slots)] = np.arange(clock + 1, clock + 1 + len(slots))
+        self.header[1] = clock + len(slots)
+
+    def get(self, keys: Sequence[bytes]) -> Tuple[np.ndarray, List[int]]:
+        """(embedding'ler, cache'te olmayan indeksler); bulunamayan satırlar sıfırdır."""
+        out = np.zeros((len(keys), self.dim), dtype=np.float32)
+        misses: List[int] = []
+        with _file_lock(self._lock_path):
+            self._refresh()
+            hit_rows, hit_slots = [], []
+            for i, k in enumerate(keys):
+                slot = self._index.get(k)
+                if slot is None:
+                    misses.append(i)
+                else:
+                    hit_rows.append(i)
+                    hit_slots.append(slot)
+            if hit_rows:
+                out[hit_rows] = self.vectors[hit_slots]
+                self._touch(hit_slots)
+        return out, misses
+
+    def put(self, keys: Sequence[bytes], vecs: np.ndarray) -> None:
+        """Yeni embedding'leri yazar; yer yoksa en eski kullanılanları boşaltır."""
+        with _file_lock(self._lock_path):
+            self._refresh()
+            new = {}
+            for k, v in zip(keys, vecs):
+                if k not in self._index:
+                    new[k] = v
+            items = list(new.items())[-self.capacity:]
+            if not items:
+                return
+            free = np.flatnonzero(self.ticks == 0)[:len(items)]
+            need = len(items) - len(free)
+            if need > 0:
+                used = np.flatnonzero(self.ticks)
+                victims = used[np.argpartition(self.ticks[used], need - 1)[:need]]
+                inv = {slot: k for k, slot in self._index.items()}
+                for slot in victims:
+                    self._index.pop(inv[int(slot)], None)
+                free = np.concatenate([free, victims])
+            slots = [int(s) for s in free]
+            self.vectors[slots] = np.stack([v for _, v in items]).astype(np.float32)
+            self.keys[slots] = np.frombuffer(b"".join(k for k, _ in items), dtype=np.uint8).reshape(-1, 16)
+            for (k, _), slot in zip(items, slots):
+                self._index[k] = slot
+            self._touch(slots)
+            self.header[0] += 1
+            self._gen = int(self.header[0])
+
+    def flush(self) -> None:
+        for arr in (self.vectors, self.keys, self.ticks, self.header):
+            arr.flush()
+
+
+def _cache_for(model_name: str, cache_dir: str, dim: int, max_bytes: int) -> EmbeddingCache:
+    with _LOCK:
+        key = (model_name, str(Path(cache_dir).resolve()))
+        cache = _CACHES.get(key)
+        if cache is None or cache.dim != dim:
+            cache = _CACHES[key] = EmbeddingCache(cache_dir, model_name, dim, max_bytes)
+        return cache
+
+
+def encode(
+    sents: Sequence[str],
+    model_name: str,
+    cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> np.ndarray:
+    """L2-normalize cümle embedding'leri (n, dim); cache_dir=None ise cache kullanılmaz."""
+    model = get_model(model_name)
+    if cache_dir is None or not sents:
+        return model.encode(list(sents), convert_to_numpy=True, normalize_embeddings=True)
+
+    dim = int(model.get_sentence_embedding_dimension())
+    cache = _cache_for(model_name, cache_dir, dim, max_bytes)
+    keys = [sentence_key(s) for s in sents]
+    embs, misses = cache.get(keys)
+    if misses:
+        # aynı normalize cümle bir kez encode edilir
+        first: Dict[bytes, int] = {}
+        for i in misses:
+            first.setdefault(keys[i], i)
+        todo = list(first.values())
+        fresh = model.encode([sents[i] for i in todo], convert_to_numpy=True, normalize_embeddings=True)
+        by_key = {keys[i]: v for i, v in zip(todo, fresh)}
+        for i in misses:
+            embs[i] = by_key[keys[i]]
+        cache.put([keys[i] for i in todo], fresh)
+        cache.flush()
+    return embs
+
+
+# --- chunk encoder kancası -----------------------------------------------------------
+
+_WORD = re.compile(r"\w+")
+
+
+def hashing_encode(texts: Sequence[str], dim: int = HASHING_DIM) -> np.ndarray:
+    """
+    Model gerektirmeyen encoder: küçük harfli kelimeler crc32 ile dim kovaya işaretli
+    olarak dağıtılır (süreçten ve PYTHONHASHSEED'den bağımsız), satırlar L2-normalize.
+    """
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+    for i, t in enumerate(texts):
+        h = np.fromiter((zlib.crc32(w.encode("utf-8")) for w in _WORD.findall(t.lower())), np.uint64)
+        if not len(h):
+            continue
+        sign = np.where(h & np.uint64(1 << 31), -1.0, 1.0).astype(np.float32)
+        np.add.at(out[i], (h % np.uint64(dim)).astype(np.int64), sign)
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    return out / np.maximum(norms, 1e-9)
+
+
+ENCODERS: Dict[str, Encoder] = {
+    "model": lambda texts: encode(texts, DEFAULT_MODEL).astype(np.float32),
+    "hashing": hashing_encode,
+}
+
+
+def register_encoder(name: str, fn: Encoder) -> None:
+    """Yeni chunk encoder'ı kaydeder (worker'lar fork ile devralır)."""
+    ENCODERS[name] = fn
+
+
+def embed_chunks(mod, doc, encoder: str = "model") -> Tuple[List[str], np.ndarray]:
+    """Yöntemin chunk'ları ve chunk başına embedding'ler (satır i = chunk i)."""
+    if hasattr(mod, "run_embedded"):
+        return mod.run_embedded(doc)
+    chunks = list(mod.run(doc))
+    if not chunks:
+        return chunks, np.zeros((0, 0), np.float32)
+    return chunks, ENCODERS[encoder](chunks)
+
@@ -1,23 +1,40 @@
-from typing import List
+from typing import Iterator, List, Tuple, Union
+from .document import Document, as_document
+from .profiling import stage
+from .spans import ChunkSpans, strip_range
 
-def run(text: str, chunk_chars: int = 800, overlap_chars: int = 100) -> List[str]:
-    src = text.replace("\r\n", "\n").replace("\r", "\n")
-    chunks = []
+def _cut_end(src: str, i: int, chunk_chars: int) -> int:
+    """i'den başlayan pencerenin bitişi; kelime ortasında kesmemek için geri çekilir."""
+    n = len(src)
+    end = min(i + chunk_chars, n)
+    # kelime ortasında kesme
+    if end < n and src[end-1].isalnum() and src[end:end+1].isalnum():
+        sp = src.rfind(" ", max(i, end-25), end)
+        if sp != -1:
+            end = sp
+    return end
+
+def _ranges(src: str, chunk_chars: int, overlap_chars: int) -> Iterator[Tuple[int, int]]:
+    """Sabit uzunluklu pencerelerin (strip'li, boş olmayan) aralıkları."""
     n = len(src)
     i = 0
     while i < n:
-        end = min(i + chunk_chars, n)
-        # kelime ortasında kesme
-        if end < n and src[end-1].isalnum() and src[end:end+1].isalnum():
-            back = src[max(i, end-25):end]
-            sp = back.rfind(" ")
-            if sp != -1:
-                end = max(i, end-25) + sp
-        chunk = src[i:end].strip()
-        if chunk:
-            chunks.append(chunk)
+        end = _cut_end(src, i, chunk_chars)
+        a, b = strip_range(src, i, end)
+        if a < b:
+            yield a, b
         if end >= n:
             break
         i = max(end - overlap_chars, i + 1)
-    return chunks
 
+def run_spans(text: Union[str, Document], chunk_chars: int = 800, overlap_chars: int = 100) -> ChunkSpans:
+    """run() ile aynı chunk'lar; metin üretmeden span olarak."""
+    src = as_document(text).text
+    out = ChunkSpans(src)
+    with stage("cut"):
+        for a, b in _ranges(src, chunk_chars, overlap_chars):
+            out.add_span(a, b)
+    return out
+
+def run(text: Union[str, Document], chunk_chars: int = 800, overlap_chars: int = 100) -> List[str]:
+    return run_spans(text, chunk_chars, overlap_chars).texts()
@@ -0,0 +1,167 @@
+"""
+Ayırıcı merdiveniyle hiyerarşik (recursive) bölme.
+
+Merdiven, kabadan inceye seviyelerdir (varsayılan: bölüm → paragraf → cümle → kelime);
+son çare her zaman karakter kesimidir. Metin tek geçişte span ağacı olarak bölünür:
+  - max_chars'ı aşmayan span yaprak olur, içine inilmez
+  - aşan span bir alt seviyenin ayırıcısıyla çocuklarına bölünür (yalnızca o aralık taranır)
+  - kardeşler soldan sağa birleştirilir: min_chars'tan kısa parça, birleşik aralık
+    max_chars'ı aşmadığı sürece sonrakiyle birleşir; kısa kalan son parça öncekine eklenir
+
+Her seviye sadece taşan aralıkları bir kez tarar ve her seviyede parça listesi bir kez
+birleştirilir; toplam iş O(len(text) * seviye sayısı). Chunk'lar kaynak metnin ardışık
+aralıklarıdır (ayırıcılar olduğu gibi korunur).
+
+Seviye: LEVELS'taki bir ad, düz bir ayırıcı dizgisi (ör. ", ") ya da derlenmiş bir desen.
+"""
+
+from array import array
+from typing import Callable, Dict, List, Sequence, Tuple, Union
+import re
+
+from .document import _PARA_SEP
+from .profiling import count, stage
+from .sections import heading_offsets
+from .sentences import sent_spans
+from .spans import Segment, strip_range
+
+Spans = Tuple[array, array]
+Splitter = Callable[[str, int, int], Spans]
+Level = Union[str, "re.Pattern"]
+
+
+def _sep_splitter(sep: "re.Pattern") -> Splitter:
+    """
+    Ayırıcı desenin eşleşmelerinde böler (strip'li, boş olmayan aralıklar); ayırıcı solundaki
+    parçada kalır, böylece boşluk olmayan ayırıcılar (", ", ";") chunk'lardan düşmez.
+    """
+
+    def split(text: str, a: int, b: int) -> Spans:
+        starts, ends = array("q"), array("q")
+        prev = a
+        for m in sep.finditer(text, a, b):
+            if m.end() == m.start():
+                continue
+            s, e = strip_range(text, prev, m.end())
+            if s < e:
+                starts.append(s)
+                ends.append(e)
+            prev = m.end()
+        s, e = strip_range(text, prev, b)
+        if s < e:
+            starts.append(s)
+            ends.append(e)
+        return starts, ends
+
+    return split
+
+
+def _split_sections(text: str, a: int, b: int) -> Spans:
+    """Başlık satırlarında böler; her bölüm başlığıyla başlar."""
+    cuts = [a] + [h for h in heading_offsets(text, a, b) if h > a] + [b]
+    starts, ends = array("q"), array("q")
+    for s, e in zip(cuts, cuts[1:]):
+        s, e = strip_range(text, s, e)
+        if s < e:
+            starts.append(s)
+            ends.append(e)
+    return starts, ends
+
+
+def _split_sentences(text: str, a: int, b: int) -> Spans:
+    return sent_spans(text[a:b], base=a)
+
+
+LEVELS: Dict[str, Splitter] = {
+    "section": _split_sections,
+    "paragraph": _sep_splitter(_PARA_SEP),
+    "line": _sep_splitter(re.compile(r"\n")),
+    "sentence": _split_sentences,
+    "word": _sep_splitter(re.compile(r"\s+")),
+}
+DEFAULT_LADDER: Tuple[str, ...] = ("section", "paragraph", "sentence", "word")
+
+
+def resolve_ladder(ladder: Sequence[Level]) -> List[Splitter]:
+    """
+    Merdiveni bölücü fonksiyonlara çevirir. "char" ya da "" karakter kesimi demektir ve
+    zaten son çare olduğundan merdivenin oradan sonrası yok sayılır.
+    """
+    out: List[Splitter] = []
+    for level in ladder:
+        if isinstance(level, re.Pattern):
+            out.append(_sep_splitter(level))
+        elif level in ("char", ""):
+            break
+        elif level in LEVELS:
+            out.append(LEVELS[level])
+        elif isinstance(level, str):
+            out.append(_sep_splitter(re.compile(re.escape(level))))
+        else:
+            raise ValueError(f"geçersiz merdiven seviyesi: {level!r}")
+    return out
+
+
+def _char_cut(text: str, a: int, b: int, max_chars: int) -> List[Segment]:
+    out: List[Segment] = []
+    for i in range(a, b, max_chars):
+        s, e = strip_range(text, i, min(i + max_chars, b))
+        if s < e:
+            out.append((s, e))
+    return out
+
+
+def _merge(pieces: List[Segment], max_chars: int, min_chars: int) -> List[Segment]:
+    """Kısa kardeşleri (min_chars altı) birleşik aralık max_chars'ı aşmadıkça birleştirir."""
+    out: List[Segment] = []
+    cs, ce = pieces[0]
+    for s, e in pieces[1:]:
+        if ce - cs < min_chars and e - cs <= max_chars:
+            ce = e
+            continue
+        out.append((cs, ce))
+        cs, ce = s, e
+    if out and ce - cs < min_chars and ce - out[-1][0] <= max_chars:
+        cs = out.pop()[0]
+    out.append((cs, ce))
+    return out
+
+
+def split_spans(
+    text: str,
+    max_chars: int,
+    min_chars: int,
+    ladder: Sequence[Level] = DEFAULT_LADDER,
+) -> List[Segment]:
+    """text'in chunk aralıkları (kaynak sırasıyla, strip'li, her biri <= max_chars)."""
+    if max_chars <= 0:
+        raise ValueError("max_chars must be > 0")
+    if min_chars < 0 or min_chars > max_chars:
+        raise ValueError("min_chars must be >= 0 and <= max_chars")
+    splitters = resolve_ladder(ladder)
+
+    def descend(a: int, b: int, level: int) -> List[Segment]:
+        # ilerleme sağlamayan (tek çocuklu) seviyeler atlanır
+        while level < len(splitters):
+            starts, ends = splitters[level](text, a, b)
+            level += 1
+            if len(starts) > 1 or (len(starts) == 1 and (starts[0], ends[0]) != (a, b)):
+                break
+        else:
+            count("char_cut")
+            return _char_cut(text, a, b, max_chars)
+        pieces: List[Segment] = []
+        for s, e in zip(starts, ends):
+            if e - s > max_chars:
+                pieces.extend(descend(s, e, level))
+            else:
+                pieces.append((s, e))
+        return _merge(pieces, max_chars, min_chars) if pieces else pieces
+
+    a, b = strip_range(text, 0, len(text))
+    if a == b:
+        return []
+    with stage("split"):
+        if b - a <= max_chars:
+            return [(a, b)]
+        return descend(a, b, 0)
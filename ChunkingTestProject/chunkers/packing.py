@@ -0,0 +1,156 @@
+"""
+Birim (cümle/paragraf) uzunlukları üzerinde ortak paketleme motoru.
+
+Açgözlü kural (sentence_based, paragraph_based, recursive, agentic, subdocument aynıdır):
+  - target_chars'tan uzun birim, biriken chunk'ı bitirir ve (i, i+1) olarak tek başına döner
+  - birim, cur_len + n + sep <= target_chars ise açık chunk'a eklenir
+  - sığmazsa açık chunk biter (boş olsa bile); son `overlap` birim yeni chunk'a taşınır
+    ve birim ona eklenir (taşınan kuyrukla birlikte hedefi aşabilir)
+
+pack_ranges() bunu birim başına döngü yerine önek toplamları (P[i] = sum(len + sep))
+ve ikili aramayla yapar: açık chunk [cur0, i) iken sığmayan ilk birim
+bisect(P, P[cur0] + target) ile, sıradaki uzun birim de uzun birim indekslerinde
+bulunur; döngü birim başına değil chunk başına döner.
+pack_units() aynı kuralın tembel iterator sürümüdür (streaming).
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import deque
+from itertools import accumulate, compress
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .profiling import count, stage
+from .spans import ChunkSpans, Segment, strip_range
+
+Range = Tuple[int, int]
+
+
+def prefix_sums(lens: Sequence[int], sep_len: int = 1) -> List[int]:
+    """P[0] = 0, P[i] = sum(lens[:i]) + i * sep_len."""
+    return list(accumulate((n + sep_len for n in lens), initial=0))
+
+
+def pack_ranges(
+    lens: Sequence[int],
+    target_chars: int,
+    overlap: int,
+    sep_len: int = 1,
+) -> List[Range]:
+    """Her chunk için birim aralığı [i0, i1); pack_units() ile birebir aynı sonuç."""
+    n = len(lens)
+    P = prefix_sums(lens, sep_len)
+    longs = list(compress(range(n), (x > target_chars for x in lens)))
+    out: List[Range] = []
+    cur0 = i = 0
+    while i < n:
+        # sığmayan ilk birim (açık chunk overlap yüzünden zaten taşmışsa i'nin kendisi)
+        j = max(i, bisect_right(P, P[cur0] + target_chars) - 1)
+        k = bisect_left(longs, i)
+        if k < len(longs) and longs[k] <= j:
+            # çok uzun birim → önce biriken chunk'ı bitir, birimi tek başına ver
+            j = longs[k]
+            if cur0 < j:
+                out.append((cur0, j))
+            out.append((j, j + 1))
+            cur0 = i = j + 1
+            continue
+        if j >= n:
+            break
+        out.append((cur0, j))
+        # overlap: son birkaç birimi taşı
+        cur0 = j - (min(overlap, j - cur0) if overlap > 0 else 0)
+        i = j + 1
+    if cur0 < n:
+        out.append((cur0, n))
+    return out
+
+
+def pack_units(
+    lens: Iterable[int],
+    target_chars: int,
+    overlap: int,
+    sep_len: int = 1,
+) -> Iterator[Range]:
+    """
+    pack_ranges()'in tembel sürümü: lens bir iterator olabilir (streaming); sadece
+    açık chunk'ın uzunlukları tutulur.
+    """
+    cur: Deque[int] = deque()  # açık chunk'taki birimlerin uzunlukları
+    cur0 = 0                   # açık chunk'ın ilk birim indeksi
+    cur_len = 0
+    for i, n in enumerate(lens):
+        if n > target_chars:
+            if cur:
+                yield cur0, i
+            yield i, i + 1
+            cur.clear()
+            cur0 = i + 1
+            cur_len = 0
+            continue
+
+        if cur_len + n + sep_len <= target_chars:
+            cur.append(n)
+            cur_len += n + sep_len
+        else:
+            yield cur0, i
+            keep = min(overlap, len(cur)) if overlap > 0 else 0
+            while len(cur) > keep:
+                cur.popleft()
+            cur.append(n)
+            cur0 = i - keep
+            cur_len = sum(x + sep_len for x in cur)
+
+    if cur:
+        yield cur0, cur0 + len(cur)
+
+
+def hard_cut(out: ChunkSpans, s: int, e: int, target_chars: int) -> None:
+    """Tek bir uzun birimi target_chars'lık parçalara böler (parçalar strip'lenir)."""
+    src = out.source
+    for i in range(s, e, target_chars):
+        a, b = strip_range(src, i, min(i + target_chars, e))
+        if a < b:
+            out.add_span(a, b)
+
+
+def pack_spans(
+    out: ChunkSpans,
+    starts: Sequence[int],
+    ends: Sequence[int],
+    target_chars: int,
+    overlap: int,
+    max_chars: Optional[int] = None,
+    fallback_chars: Optional[int] = None,
+    fallback: Optional[Callable[[ChunkSpans, List[Segment]], None]] = None,
+) -> None:
+    """
+    Birim aralıklarını paketleyip out'a chunk olarak ekler.
+
+    max_chars verilirse (sert üst sınır) bunu aşan chunk'ın birimleri fallback_chars
+    hedefiyle yeniden paketlenir; hâlâ aşan parça fallback(out, segments)'e verilir.
+    Chunk uzunlukları önek toplamlarından okunur, metin yeniden bölünmez.
+    """
+    with stage("pack"):
+        sep_len = len(out.sep)
+        lens = [e - s for s, e in zip(starts, ends)]
+        P = prefix_sums(lens, sep_len)
+        for i0, i1 in pack_ranges(lens, target_chars, overlap, sep_len):
+            if i1 - i0 == 1 and lens[i0] > target_chars:
+                hard_cut(out, starts[i0], ends[i0], target_chars)
+            elif max_chars is None or P[i1] - P[i0] - sep_len <= max_chars:
+                out.add(zip(starts[i0:i1], ends[i0:i1]))
+            else:
+                count("resplit")
+                mid = fallback_chars or max_chars
+                for j0, j1 in pack_ranges(lens[i0:i1], mid, overlap, sep_len):
+                    j0 += i0
+                    j1 += i0
+                    if j1 - j0 == 1 and lens[j0] > mid:
+                        hard_cut(out, starts[j0], ends[j0], mid)
+                        continue
+                    segs = list(zip(starts[j0:j1], ends[j0:j1]))
+                    if P[j1] - P[j0] - sep_len <= max_chars or fallback is None:
+                        out.add(segs)
+                    else:
+                        with stage("hard_cut"):
+                            fallback(out, segs)
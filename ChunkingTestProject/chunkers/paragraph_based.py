@@ -1,47 +1,25 @@
-from typing import List
-import re
-from .sentence_based import run as sentence_chunk
+from typing import List, Union
+from .document import Document, as_document
+from .sentence_based import run_spans as sentence_spans
+from .packing import pack_spans
+from .spans import ChunkSpans
 
-def _paragraphs(text: str) -> List[str]:
+def _paragraphs(text: Union[str, Document]) -> List[str]:
     """Metni paragraflara ayırır (boş satıra göre)."""
-    text = text.replace("\r\n", "\n").replace("\r", "\n")
-    return [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+    return as_document(text).paragraphs()
 
-def run(text: str, target_chars: int = 900) -> List[str]:
-    paras = _paragraphs(text)
-    if not paras:
+def run_spans(text: Union[str, Document], target_chars: int = 900) -> ChunkSpans:
+    """run() ile aynı chunk'lar; metin üretmeden span olarak."""
+    doc = as_document(text)
+    starts, ends = doc.para_spans
+    if not starts:
         # paragraf yoksa fallback
-        return sentence_chunk(text, target_chars=target_chars, overlap_sent=0)
+        return sentence_spans(doc, target_chars=target_chars, overlap_sent=0)
 
-    chunks: List[str] = []
-    cur: List[str] = []
-    cur_len = 0
+    # paragraflar "\n\n" ile birleşir; çok uzun paragraf parçalara bölünür
+    out = ChunkSpans(doc.text, "\n\n")
+    pack_spans(out, starts, ends, target_chars, 0)
+    return out
 
-    for p in paras:
-        if len(p) > target_chars:
-            # çok uzun paragraf → parçalara böl
-            i = 0
-            while i < len(p):
-                end = min(i + target_chars, len(p))
-                part = p[i:end].strip()
-                if cur:
-                    chunks.append("\n\n".join(cur))
-                    cur = []
-                    cur_len = 0
-                if part:
-                    chunks.append(part)
-                i = end
-            continue
-
-        if cur_len + len(p) + 2 <= target_chars:
-            cur.append(p)
-            cur_len += len(p) + 2
-        else:
-            chunks.append("\n\n".join(cur))
-            cur = [p]
-            cur_len = len(p) + 2
-
-    if cur:
-        chunks.append("\n\n".join(cur))
-
-    return chunks
\ No newline at end of file
+def run(text: Union[str, Document], target_chars: int = 900) -> List[str]:
+    return run_spans(text, target_chars).texts()
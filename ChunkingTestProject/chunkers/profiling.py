@@ -0,0 +1,198 @@
+"""
+Hafif aşama (stage) zamanlayıcıları ve sayaçları.
+
+    from .profiling import count, stage
+    with stage("sent_tokenize"):
+        ...
+    count("sentences", n)
+
+Kapalıyken (varsayılan) stage() paylaşılan boş bir context manager döndürür ve count()
+hemen döner; maliyet bir fonksiyon çağrısıdır. enable() ya da CHUNK_PROFILE=1 ile açılır.
+
+Aşama süreleri kapsayıcıdır (iç içe aşamalar dahil). scope("agentic") içinde kaydedilen
+aşamalar "agentic/<aşama>" adını alır; by_scope() bunları kapsam başına ayırır.
+Süreçler arası: worker'daki snapshot(raw=True) ve events() ana süreçte merge() ile toplanır.
+write_trace() Chrome trace (chrome://tracing, Perfetto, speedscope) dosyası yazar.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import functools
+import json
+import os
+import threading
+import time
+
+# (ad, başlangıç_us, süre_us, pid, tid)
+Event = Tuple[str, float, float, int, int]
+
+_enabled = os.environ.get("CHUNK_PROFILE", "") not in ("", "0")
+_tracing = False
+_prefix = ""
+_stats: Dict[str, List[float]] = {}  # ad -> [çağrı, saniye]
+_counters: Dict[str, int] = {}
+_events: List[Event] = []
+
+
+class _Noop:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NOOP = _Noop()
+
+
+class _Stage:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name: str):
+        self.name = _prefix + name
+
+    def __enter__(self) -> None:
+        self.t0 = time.perf_counter()
+
+    def __exit__(self, *exc) -> bool:
+        dt = time.perf_counter() - self.t0
+        st = _stats.get(self.name)
+        if st is None:
+            st = _stats[self.name] = [0, 0.0]
+        st[0] += 1
+        st[1] += dt
+        if _tracing:
+            _events.append((self.name, self.t0 * 1e6, dt * 1e6, os.getpid(), threading.get_ident()))
+        return False
+
+
+def stage(name: str):
+    """Adlandırılmış aşama zamanlayıcısı (context manager)."""
+    return _Stage(name) if _enabled else _NOOP
+
+
+def count(name: str, n: int = 1) -> None:
+    """Adlandırılmış sayaca n ekler."""
+    if _enabled:
+        key = _prefix + name
+        _counters[key] = _counters.get(key, 0) + n
+
+
+def profiled(name: str) -> Callable:
+    """Fonksiyonun tamamını stage(name) içinde çalıştıran dekoratör."""
+    def deco(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+@contextmanager
+def scope(name: str) -> Iterator[None]:
+    """İçeride kaydedilen aşama/sayaç adlarının önüne 'name/' ekler."""
+    global _prefix
+    if not _enabled:
+        yield
+        return
+    old, _prefix = _prefix, f"{name}/"
+    try:
+        yield
+    finally:
+        _prefix = old
+
+
+def enable(trace: bool = False) -> None:
+    global _enabled, _tracing
+    _enabled = True
+    _tracing = trace
+
+
+def disable() -> None:
+    global _enabled, _tracing
+    _enabled = _tracing = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def is_tracing() -> bool:
+    return _enabled and _tracing
+
+
+def reset() -> None:
+    _stats.clear()
+    _counters.clear()
+    _events.clear()
+
+
+def snapshot(raw: bool = False) -> Dict[str, Any]:
+    """
+    Toplanan aşamalar ve sayaçlar. raw=True: merge()'e verilecek ham biçim; değilse
+    {"stages": {ad: {"calls", "seconds"}}, "counters": {...}}, süreye göre azalan sırada.
+    """
+    if raw:
+        return {"stages": {k: list(v) for k, v in _stats.items()}, "counters": dict(_counters)}
+    stages = sorted(_stats.items(), key=lambda kv: kv[1][1], reverse=True)
+    return {
+        "stages": {k: {"calls": int(c), "seconds": s} for k, (c, s) in stages},
+        "counters": dict(sorted(_counters.items())),
+    }
+
+
+def events() -> List[Event]:
+    return list(_events)
+
+
+def merge(raw: Dict[str, Any], evs: Optional[List[Event]] = None) -> None:
+    """Başka bir sürecin snapshot(raw=True) ve events() çıktısını buradakilere ekler."""
+    for k, (c, s) in raw.get("stages", {}).items():
+        st = _stats.setdefault(k, [0, 0.0])
+        st[0] += c
+        st[1] += s
+    for k, n in raw.get("counters", {}).items():
+        _counters[k] = _counters.get(k, 0) + n
+    if evs:
+        _events.extend(tuple(e) for e in evs)
+
+
+def by_scope(snap: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+    """snapshot()'ı kapsamlara ayırır: {"agentic": {"stages": ..., "counters": ...}, ...}."""
+    snap = snap or snapshot()
+    out: Dict[str, Dict[str, Any]] = {}
+    for kind in ("stages", "counters"):
+        for key, val in snap[kind].items():
+            sc, sep, name = key.partition("/")
+            if not sep:
+                sc, name = "", key
+            out.setdefault(sc, {"stages": {}, "counters": {}})[kind][name] = val
+    return out
+
+
+def run_profiled(trace: bool, fn: Callable, *args, **kwargs) -> Tuple[Any, Dict[str, Any], List[Event]]:
+    """
+    Worker sürecinde fn'i profil açık çalıştırır; (sonuç, ham snapshot, olaylar) döner.
+    Ana süreç sonucu merge(snapshot, olaylar) ile birleştirir.
+    """
+    enable(trace)
+    reset()
+    result = fn(*args, **kwargs)
+    return result, snapshot(raw=True), events()
+
+
+def write_trace(path: str, evs: Optional[List[Event]] = None) -> None:
+    """Olayları Chrome trace biçiminde (JSON, "X" olayları) yazar."""
+    evs = _events if evs is None else evs
+    t0 = min((e[1] for e in evs), default=0.0)
+    trace = [
+        {"name": name, "cat": "chunking", "ph": "X", "ts": ts - t0, "dur": dur, "pid": pid, "tid": tid}
+        for name, ts, dur, pid, tid in evs
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
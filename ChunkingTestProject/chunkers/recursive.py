@@ -1,46 +1,62 @@
-from typing import List
-from .sentence_based import run as sentence_chunk
-from .fixed_length import run as fixed_chunk
+from typing import List, Optional, Sequence, Union
+from .document import Document, as_document
+from .fixed_length import _ranges as fixed_ranges
+from .hierarchy import Level, split_spans
+from .packing import pack_spans
+from .spans import ChunkSpans, Segment, render, slice_segments
 
-def run(
-    text: str,
+def run_spans(
+    text: Union[str, Document],
     max_chars: int = 1200,   # bir chunk'ın üst sınırı
     min_chars: int = 400,    # ikinci pass için alt hedef
-    overlap_sent: int = 1    # cümle bazlı pass'lerde overlap
-) -> List[str]:
-    """
-    Recursive chunking:
-      1) Büyük hedefle sentence-based chunkla (max_chars).
-      2) max_chars'ı geçen her chunk'ı tekrar sentence-based ile orta hedefe böl (mid).
-      3) Hâlâ uzun olan varsa fixed-length ile kesin (son çare).
-
-    Not: Amaç önce anlamı korumak (cümle bazlı), en sonda zorunlu olursa karakter kesimi yapmak.
-    """
+    overlap_sent: int = 1,   # cümle bazlı pass'lerde overlap
+    ladder: Optional[Sequence[Level]] = None  # verilirse hiyerarşik bölme (bkz. hierarchy)
+) -> ChunkSpans:
+    """run() ile aynı chunk'lar; metin üretmeden span olarak."""
     if max_chars <= 0:
         raise ValueError("max_chars must be > 0")
     if min_chars <= 0 or min_chars > max_chars:
         raise ValueError("min_chars must be > 0 and <= max_chars")
 
-    # 1) İlk pass: geniş hedefle cümle bazlı
-    base_chunks = sentence_chunk(text, target_chars=max_chars, overlap_sent=overlap_sent)
-
-    out: List[str] = []
+    doc = as_document(text)
+    out = ChunkSpans(doc.text, " ")
+    if ladder is not None:
+        for a, b in split_spans(doc.text, max_chars, min_chars, ladder):
+            out.add_span(a, b)
+        return out
     mid = (max_chars + min_chars) // 2  # ikinci pass için orta hedef
 
-    for ch in base_chunks:
-        if len(ch) <= max_chars:
-            out.append(ch)
-            continue
+    def fixed_cut(out: ChunkSpans, segs: List[Segment]) -> None:
+        # 3) Son çare: fixed-length (overlap 0); kesim noktaları kaynak span'lerine geri eşlenir
+        joined = render(out.source, segs, out.sep)
+        for a, b in fixed_ranges(joined, max_chars, 0):
+            out.add(slice_segments(segs, len(out.sep), a, b))
 
-        # 2) İkinci pass: hâlâ uzunsa, daha küçük hedefle cümle bazlı
-        sub_chunks = sentence_chunk(ch, target_chars=mid, overlap_sent=overlap_sent)
-        for sub in sub_chunks:
-            if len(sub) <= max_chars:
-                out.append(sub)
-            else:
-                # 3) Son çare: fixed-length (overlap 0 ya da az olabilir)
-                out.extend(
-                    fixed_chunk(sub, chunk_chars=max_chars, overlap_chars=0)
-                )
+    # 1) geniş hedefle cümle bazlı, 2) max_chars'ı aşan chunk'ın cümleleri orta hedefle
+    pack_spans(out, *doc.sent_spans, max_chars, overlap_sent,
+               max_chars=max_chars, fallback_chars=mid, fallback=fixed_cut)
+    return out
 
-    return out
\ No newline at end of file
+def run(
+    text: Union[str, Document],
+    max_chars: int = 1200,
+    min_chars: int = 400,
+    overlap_sent: int = 1,
+    ladder: Optional[Sequence[Level]] = None
+) -> List[str]:
+    """
+    Recursive chunking:
+      1) Büyük hedefle sentence-based chunkla (max_chars).
+      2) max_chars'ı geçen her chunk'ı tekrar sentence-based ile orta hedefe böl (mid).
+      3) Hâlâ uzun olan varsa fixed-length ile kesin (son çare).
+
+    Not: Amaç önce anlamı korumak (cümle bazlı), en sonda zorunlu olursa karakter kesimi yapmak.
+    Üç adım da tek paketleme motorunda (packing.pack_spans) cümle uzunluklarının önek
+    toplamları üzerinden yürür; ikinci pass chunk'ı yeniden tokenize etmez.
+
+    ladder verilirse (ör. hierarchy.DEFAULT_LADDER ya da ["paragraph", "\n", ", ", "word"])
+    metin bu ayırıcı merdiveniyle tek geçişte hiyerarşik bölünür: yalnızca max_chars'ı aşan
+    span'lere inilir, min_chars altındaki kardeşler birleştirilir, son çare karakter kesimidir.
+    Bu modda overlap_sent kullanılmaz; chunk'lar kaynak metnin ardışık aralıklarıdır.
+    """
+    return run_spans(text, max_chars, min_chars, overlap_sent, ladder).texts()
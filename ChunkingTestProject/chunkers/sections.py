@@ -0,0 +1,153 @@
+"""
+Başlık sezgisi ve bölüm ağacı (agentic, subdocument ve hybrid ortak kullanır).
+
+Başlık kuralları (satır strip'lendikten sonra):
+  1) Numaralı başlık: 1, 1.2, 3.4.5 + boşluk + metin (derinlik = numara bileşen sayısı)
+  2) Tümü büyük harf, 1-12 kelime
+  3) Büyük harfle başlayan, cümle noktalaması içermeyen kısa/orta satır (3-121 karakter)
+
+parse_sections() lines_text'i (boş olmayan, strip'li satırlar) bu kuralları birleştiren
+tek bir derlenmiş desenle tek geçişte tarar; satır satır Python döngüsü yoktur.
+Her başlık yeni bir bölüm açar; ilk satır başlık değilse ilk bölüm başlıksız girişdir.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import List, Optional, Tuple
+import re
+
+_NUMBERED = re.compile(r"\d+(?:\.\d+)*\s+\S")
+_TITLE = re.compile(r"[A-ZÇĞİÖŞÜ][\w ,:;/\-()'’]{2,120}$")
+
+# üç kural tek desende; satır sonunu aşmaması için \s yerine [^\S\n] kullanılır.
+# "upper" sadece aday (küçük harf içermeyen satır); kesin karar str.isupper() ile verilir.
+_HEADING_LINE = re.compile(
+    r"^(?:(?P<num>\d+(?:\.\d+)*)[^\S\n]+\S[^\n]*"
+    r"|[A-ZÇĞİÖŞÜ][\w ,:;/\-()'’]{2,120}"
+    r"|(?P<upper>[^\na-zçğıöşüâîû]+))$",
+    re.MULTILINE,
+)
+
+
+def is_heading(s: str) -> bool:
+    """Tek satırın başlık olup olmadığı (bkz. modül açıklamasındaki kurallar)."""
+    s = s.strip()
+    if _NUMBERED.match(s):
+        return True
+    if s.isupper() and 1 <= len(s.split()) <= 12:
+        return True
+    # kural 3'ün karakter sınıfı . ! ? içermediğinden satır bunlarla bitemez
+    return _TITLE.match(s) is not None
+
+
+class SectionTree:
+    """
+    Bölümler lines_text üzerinde offset'ler olarak, belge sırasıyla:
+      - starts[k], ends[k]: bölüm k'nın kendi aralığı (başlık satırı + alt başlığa kadarki gövde)
+      - depth[k]: numaralı başlıkta bileşen sayısı (1 / 1.2 -> 2), başlıksız girişte 0;
+        numarasız başlık, içinde bulunduğu numaralı bölümün bir altıdır
+      - parent[k]: üst bölüm indeksi (-1: kök)
+      - subtree_end[k]: bölüm ve tüm alt bölümlerinin bittiği offset
+    """
+
+    __slots__ = ("starts", "ends", "depth", "parent", "subtree_end")
+
+    def __init__(self) -> None:
+        self.starts = array("q")
+        self.ends = array("q")
+        self.depth = array("i")
+        self.parent = array("q")
+        self.subtree_end = array("q")
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def children(self, k: int) -> List[int]:
+        return [j for j in range(k + 1, self._subtree_stop(k)) if self.parent[j] == k]
+
+    def roots(self) -> List[int]:
+        return [k for k in range(len(self)) if self.parent[k] == -1]
+
+    def subtree_span(self, k: int) -> Tuple[int, int]:
+        return self.starts[k], self.subtree_end[k]
+
+    def _subtree_stop(self, k: int) -> int:
+        # alt bölümler k'dan hemen sonra ardışık gelir
+        return bisect_left(self.starts, self.subtree_end[k], k + 1)
+
+
+def parse_sections(lines_text: str) -> SectionTree:
+    """lines_text'i tek geçişte bölümlere ayırıp bölüm ağacını kurar."""
+    tree = SectionTree()
+    if not lines_text:
+        return tree
+
+    starts, depth = tree.starts, tree.depth
+    numbered_depth = 0  # içinde bulunulan en yakın numaralı başlığın derinliği
+    for m in _HEADING_LINE.finditer(lines_text):
+        if m.group("upper") is not None:
+            ln = m.group("upper")
+            if not (ln.isupper() and len(ln.split()) <= 12):
+                continue
+        num = m.group("num")
+        if num is not None:
+            d = num.count(".") + 1
+            numbered_depth = d
+        else:
+            d = numbered_depth + 1
+        if m.start() == 0:
+            # ilk satır başlıksa giriş bölümü yoktur
+            starts.append(0)
+            depth.append(d)
+            continue
+        if not starts:
+            starts.append(0)
+            depth.append(0)
+        starts.append(m.start())
+        depth.append(d)
+    if not starts:
+        starts.append(0)
+        depth.append(0)
+
+    n = len(starts)
+    tree.ends.extend(s - 1 for s in starts[1:])
+    tree.ends.append(len(lines_text))
+
+    # üst bölümler: derinliği küçük olan en yakın önceki bölüm (yığınla tek geçiş);
+    # başlıksız giriş (derinlik 0) kök olur ama kimsenin üstü değildir
+    stack: List[int] = []
+    tree.parent.extend([-1] * n)
+    tree.subtree_end.extend(tree.ends)
+    for k in range(n):
+        if depth[k] == 0:
+            continue
+        while stack and depth[stack[-1]] >= depth[k]:
+            stack.pop()
+        tree.parent[k] = stack[-1] if stack else -1
+        stack.append(k)
+    # alt ağaç sonu: sondan başa, çocukların sonunu üst bölüme taşı
+    for k in range(n - 1, -1, -1):
+        p = tree.parent[k]
+        if p >= 0 and tree.subtree_end[k] > tree.subtree_end[p]:
+            tree.subtree_end[p] = tree.subtree_end[k]
+    return tree
+
+
+def heading_offsets(text: str, a: int = 0, b: Optional[int] = None) -> List[int]:
+    """
+    Ham metnin [a, b) aralığında başlık satırlarının başlangıç offset'leri; satırlar strip'lenip
+    is_heading ile sınanır (girintili başlıklar dahil). Bölüm sınırında shard'lama (main.py),
+    manifest birimleri ve hierarchy'nin bölüm seviyesi aynı kesimleri kullanır.
+    """
+    b = len(text) if b is None else b
+    out = []
+    pos = a
+    while pos < b:
+        end = text.find("\n", pos, b)
+        if end == -1:
+            end = b
+        ln = text[pos:end]
+        if ln.strip() and is_heading(ln):
+            out.append(pos)
+        pos = end + 1
+    return out
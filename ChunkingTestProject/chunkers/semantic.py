@@ -1,57 +1,37 @@
-from typing import List
-import re
-
-try:
-    from sentence_transformers import SentenceTransformer  # pip install sentence-transformers
-except Exception:
-    SentenceTransformer = None
-
-
-def _sent_tokenize(text: str) -> List[str]:
-    """Cümlelere böl (önce nltk, yoksa regex)."""
-    try:
-        import nltk
-        try:
-            nltk.data.find("tokenizers/punkt")
-        except LookupError:
-            nltk.download("punkt")
-        from nltk.tokenize import sent_tokenize
-        return [s.strip() for s in sent_tokenize(text)]
-    except Exception:
-        # basit regex fallback (TR/EN için iş görür)
-        return [s.strip() for s in re.split(r'(?<=[.!?])\s+(?=[A-ZİÖÜÇĞŞ])', text) if s.strip()]
+from typing import List, Optional, Tuple, Union
+from .document import Document, as_document
+from .embeddings import DEFAULT_CACHE_DIR, DEFAULT_MODEL, encode, has_sentence_transformers
+from .profiling import stage
+from .spans import ChunkSpans
 
 
-def run(
-    text: str,
-    target_chars: int = 900,
-    sim_th: float = 0.25,
-    model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
-) -> List[str]:
-    """
-    Semantic chunking:
-      - Metni cümlelere ayırır.
-      - cümle embedding'leri ile ilerler.
-      - Mevcut chunk'ın centroid'ine benzerlik >= sim_th ise aynı chunk'a ekler,
-        değilse yeni chunk başlatır.
-      - Chunk uzunluğu target_chars'i aşarsa yeni chunk'a geçer.
-    """
-    if SentenceTransformer is None:
+def _chunk(
+    text: Union[str, Document],
+    target_chars: int,
+    sim_th: float,
+    model_name: str,
+    cache_dir: Optional[str],
+) -> Tuple[ChunkSpans, list]:
+    """Chunk span'leri ve her chunk'ın L2-normalize centroid'i (chunk'ı oluşturan cümlelerden)."""
+    if not has_sentence_transformers():
         raise RuntimeError(
             "semantic için 'sentence-transformers' gerekli. Kur: pip install sentence-transformers"
         )
 
-    sents = _sent_tokenize(text)
-    sents = [s for s in sents if s]
+    doc = as_document(text)
+    starts, ends = doc.sent_spans
+    out = ChunkSpans(doc.text, " ")
+    centroids: list = []
+    sents = doc.sentences()
     if not sents:
-        return []
+        return out, centroids
 
     import numpy as np
 
-    model = SentenceTransformer(model_name)
-    embs = model.encode(sents, convert_to_numpy=True, normalize_embeddings=True)
+    # model süreç başına bir kez yüklenir; cache'te olan cümleler yeniden encode edilmez
+    with stage("embed"):
+        embs = encode(sents, model_name, cache_dir)
 
-    chunks: List[str] = []
     cur_idx: List[int] = []
     cur_len = 0
     centroid = None
@@ -81,12 +61,64 @@ def run(
             cur_len += len(sent) + 1
         else:
             # chunk'ı bitir, yenisine başla
-            chunks.append(" ".join(sents[j] for j in cur_idx))
+            out.add(zip(starts[cur_idx[0]:i], ends[cur_idx[0]:i]))
+            centroids.append(centroid)
             cur_idx = [i]
             centroid = emb.copy()
             cur_len = len(sent)
 
     if cur_idx:
-        chunks.append(" ".join(sents[j] for j in cur_idx))
+        out.add(zip(starts[cur_idx[0]:], ends[cur_idx[0]:]))
+        centroids.append(centroid)
+
+    return out, centroids
+
+
+def run_spans(
+    text: Union[str, Document],
+    target_chars: int = 900,
+    sim_th: float = 0.25,
+    model_name: str = DEFAULT_MODEL,
+    cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+) -> ChunkSpans:
+    """run() ile aynı chunk'lar; metin üretmeden span olarak."""
+    return _chunk(text, target_chars, sim_th, model_name, cache_dir)[0]
+
+
+def run_embedded(
+    text: Union[str, Document],
+    target_chars: int = 900,
+    sim_th: float = 0.25,
+    model_name: str = DEFAULT_MODEL,
+    cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+) -> Tuple[List[str], "np.ndarray"]:
+    """
+    run() ile aynı chunk'lar ve chunk başına embedding: chunk'lama sırasında zaten hesaplanan
+    centroid'ler (L2-normalize, float32). Chunk'ların yeniden encode edilmesine gerek kalmaz.
+    """
+    import numpy as np
 
-    return chunks
\ No newline at end of file
+    spans, centroids = _chunk(text, target_chars, sim_th, model_name, cache_dir)
+    dim = centroids[0].shape[0] if centroids else 0
+    vecs = np.stack(centroids).astype(np.float32) if centroids else np.zeros((0, dim), np.float32)
+    return spans.texts(), vecs
+
+
+def run(
+    text: Union[str, Document],
+    target_chars: int = 900,
+    sim_th: float = 0.25,
+    model_name: str = DEFAULT_MODEL,
+    cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+) -> List[str]:
+    """
+    Semantic chunking:
+      - Metni cümlelere ayırır.
+      - cümle embedding'leri ile ilerler.
+      - Mevcut chunk'ın centroid'ine benzerlik >= sim_th ise aynı chunk'a ekler,
+        değilse yeni chunk başlatır.
+      - Chunk uzunluğu target_chars'i aşarsa yeni chunk'a geçer.
+      - cache_dir: disk embedding cache'i (None: cache kullanma)
+    Centroid'ler de istenirse run_embedded() kullanılır.
+    """
+    return run_spans(text, target_chars, sim_th, model_name, cache_dir).texts()
\ No newline at end of file
@@ -0,0 +1,163 @@
+"""
+Cümle bölme motoru (ağa hiç çıkmaz).
+
+Backend'ler:
+  - punkt: nltk Punkt modeli; süreç başına bir kez yüklenir. Veri yoksa indirilmez
+    (kurulum: python -m nltk.downloader punkt_tab), backend kullanılamaz sayılır.
+  - regex: önceden derlenmiş, Türkçe'ye göre ayarlı kural tabanlı bölücü. Cümle sonu
+    [.!?…] + boşluk + büyük harf (İ/Ö/Ü/Ç/Ğ/Ş dahil), rakam ya da açılış tırnağı/parantezi;
+    kısaltmalar (Dr., Prof., vb., örn.), baş harfler (M. Kemal), sıra sayıları
+    (1. Dünya Savaşı) ve ondalıklar (3.239) cümleyi bitirmez.
+  - auto (varsayılan): punkt verisi yerelde varsa punkt, yoksa regex.
+
+Seçim: CHUNK_SENT_BACKEND=auto|punkt|regex, Punkt dili CHUNK_PUNKT_LANG (varsayılan english).
+"""
+
+from array import array
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence, Tuple
+import os
+import re
+
+from .spans import strip_range
+
+BACKENDS = ("auto", "punkt", "regex")
+DEFAULT_BACKEND = os.environ.get("CHUNK_SENT_BACKEND", "auto")
+DEFAULT_LANGUAGE = os.environ.get("CHUNK_PUNKT_LANG", "english")
+
+Spans = Tuple[array, array]
+
+# --- punkt -----------------------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def punkt_tokenizer(language: str = DEFAULT_LANGUAGE):
+    """Süreç genelinde tek Punkt örneği; nltk ya da model verisi yoksa None (indirme yapılmaz)."""
+    try:
+        import nltk
+    except Exception:
+        return None
+    try:
+        try:
+            from nltk.tokenize.punkt import PunktTokenizer  # nltk >= 3.8.2 (punkt_tab)
+        except ImportError:
+            return nltk.data.load(f"tokenizers/punkt/{language}.pickle")
+        return PunktTokenizer(language)
+    except (LookupError, OSError, ValueError):
+        return None
+
+# --- regex -----------------------------------------------------------------------
+
+_UPPER = "A-ZÇĞİÖŞÜÂÎÛ"
+# cümle başında büyük harften önce gelebilen açılış tırnağı/parantezi
+OPENERS = "\"'“‘«(["
+# aday sınır: noktalama (+ kapanış tırnağı/parantez) + boşluk + cümle başı olabilecek karakter
+_BOUNDARY = re.compile(
+    rf"[.!?…]+[\"'”’»)\]]*(\s+)(?=[{re.escape(OPENERS)}]?[{_UPPER}0-9])"
+)
+# nokta ile bitip cümleyi bitirmeyen kısaltmalar (küçük harfle karşılaştırılır)
+ABBREVIATIONS = frozenset("""
+    dr prof doç yrd öğr gör arş uzm op av müh hz sn mr mrs ms jr sr st
+    vb vs vd bkz krş örn yy çev haz ed yay s sf ss no nr tel faks cad sok
+    mah apt blv ltd şti inc co corp e.g i.e etc fig vol eq
+    şub nis tem ağu eyl jan feb apr jun jul aug sep oct nov dec
+""".split())
+# noktadan önce en fazla bu kadar karaktere bakılır; daha uzun token her zaman cümle sonudur
+# (streaming, tampon sınırında bu kadar bağlamı taşır)
+TOKEN_CONTEXT = 32
+
+
+def _is_boundary(text: str, punct_start: int, punct: str) -> bool:
+    """Aday sınırın gerçekten cümle sonu olup olmadığı (sadece tek '.' için kısıtlama var)."""
+    if punct[0] != "." or punct.startswith(".."):
+        return True
+    i = punct_start
+    lo = max(0, punct_start - TOKEN_CONTEXT - 1)
+    while i > lo and not text[i - 1].isspace():
+        i -= 1
+    if punct_start - i > TOKEN_CONTEXT:
+        return True
+    tok = text[i:punct_start].lstrip(OPENERS)
+    if not tok:
+        return True
+    if tok.lower() in ABBREVIATIONS:
+        return False
+    if len(tok) == 1 and tok.isalpha() and tok.isupper():
+        return False  # baş harf: "M. Kemal"
+    if tok.isdigit() and len(tok) <= 3:
+        return False  # sıra sayısı: "1. Dünya Savaşı", "19. Yüzyıl"
+    if "." in tok and all(len(p) == 1 and p.isalpha() for p in tok.split(".")):
+        return False  # "e.g.", "A.B.D."
+    return True
+
+
+def regex_spans(text: str, base: int = 0) -> Spans:
+    """Regex backend'i: cümlelerin strip'li, boş olmayan (start, end) aralıkları."""
+    starts, ends = array("q"), array("q")
+    prev = 0
+    for m in _BOUNDARY.finditer(text):
+        ws = m.start(1)
+        if not _is_boundary(text, m.start(), text[m.start():ws].rstrip("\"'”’»)]")):
+            continue
+        s, e = strip_range(text, prev, ws)
+        if s < e:
+            starts.append(base + s)
+            ends.append(base + e)
+        prev = m.end(1)
+    s, e = strip_range(text, prev, len(text))
+    if s < e:
+        starts.append(base + s)
+        ends.append(base + e)
+    return starts, ends
+
+# --- ortak API -------------------------------------------------------------------
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """'auto'yu çözer; 'punkt' ya da 'regex' döner."""
+    backend = backend or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"bilinmeyen cümle backend'i '{backend}'; seçenekler: {', '.join(BACKENDS)}")
+    if backend == "auto":
+        return "punkt" if punkt_tokenizer() is not None else "regex"
+    if backend == "punkt" and punkt_tokenizer() is None:
+        raise RuntimeError(
+            "punkt verisi bulunamadı (ağdan indirilmez). Kur: python -m nltk.downloader punkt_tab"
+        )
+    return backend
+
+
+def _punkt_spans(text: str, base: int) -> Spans:
+    from .document import _piece_spans  # döngüsel importu önlemek için geç import
+    return _piece_spans(text, punkt_tokenizer().tokenize(text), base)
+
+
+def sent_spans(text: str, backend: Optional[str] = None, base: int = 0) -> Spans:
+    """Cümle aralıkları (starts, ends); base her offset'e eklenir."""
+    if resolve_backend(backend) == "punkt":
+        return _punkt_spans(text, base)
+    return regex_spans(text, base)
+
+
+def tokenize(text: str, backend: Optional[str] = None) -> List[str]:
+    """Cümle listesi (strip'li, boş olmayan)."""
+    starts, ends = sent_spans(text, backend)
+    return [text[s:e] for s, e in zip(starts, ends)]
+
+
+def sent_spans_many(
+    texts: Sequence[str],
+    backend: Optional[str] = None,
+    bases: Optional[Sequence[int]] = None,
+) -> List[Spans]:
+    """Birden çok metnin cümle aralıkları; backend bir kez çözülür."""
+    split = _punkt_spans if resolve_backend(backend) == "punkt" else regex_spans
+    bases = bases if bases is not None else [0] * len(texts)
+    return [split(t, b) for t, b in zip(texts, bases)]
+
+
+def tokenize_many(texts: Iterable[str], backend: Optional[str] = None) -> List[List[str]]:
+    """Birden çok metni cümlelere böler (bölüm/kayıt listeleri için toplu API)."""
+    texts = list(texts)
+    return [
+        [t[s:e] for s, e in zip(starts, ends)]
+        for t, (starts, ends) in zip(texts, sent_spans_many(texts, backend))
+    ]
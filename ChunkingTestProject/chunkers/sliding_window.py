@@ -1,21 +1,69 @@
-from typing import List
-from .sentence_based import _sent_tokenize as _sents
+from typing import List, Optional, Sequence, Union
+from .document import Document, as_document
+from .profiling import stage
+from .spans import ChunkSpans, render, slice_segments
 
-def _trim_to_max(s: str, max_chars: int) -> str:
-    """Metni max_chars sınırına yumuşak kes (kelime ortasını bozma)."""
+def _trim_cut(s: str, max_chars: Optional[int]) -> int:
+    """_trim_to_max'ın kestiği uzunluk (metni kopyalamadan)."""
     if max_chars is None or len(s) <= max_chars:
-        return s
+        return len(s)
     cut = max_chars
     # kelime ortasında kesmeyi önle
     if s[cut-1:cut].isalnum() and s[cut:cut+1].isalnum():
-        back = s[max(0, cut-40):cut]
-        sp = back.rfind(" ")
+        sp = s.rfind(" ", max(0, cut-40), cut)
         if sp != -1:
-            cut = max(0, cut-40) + sp
-    return s[:cut].rstrip()
+            cut = sp
+    while cut > 0 and s[cut-1].isspace():
+        cut -= 1
+    return cut
+
+def _trim_to_max(s: str, max_chars: Optional[int]) -> str:
+    """Metni max_chars sınırına yumuşak kes (kelime ortasını bozma)."""
+    return s[:_trim_cut(s, max_chars)]
+
+def _window_spans(
+    out: ChunkSpans,
+    starts: Sequence[int],
+    ends: Sequence[int],
+    window: int,
+    stride: int,
+    max_chars: Optional[int],
+) -> None:
+    """Cümle aralıkları üzerinde pencereleri out'a ekler; uzun pencereler yumuşak kesilir."""
+    with stage("window"):
+        n = len(starts)
+        sep_len = len(out.sep)
+        i = 0
+        while i < n:
+            segs = list(zip(starts[i:i+window], ends[i:i+window]))
+            if not segs:
+                break
+            total = sum(e - s for s, e in segs) + (len(segs) - 1) * sep_len
+            if max_chars is not None and total > max_chars:
+                # sadece sınırı aşan pencere için metin üretilir
+                cut = _trim_cut(render(out.source, segs, out.sep), max_chars)
+                segs = slice_segments(segs, sep_len, 0, cut)
+            if segs:
+                out.add(segs)
+            # sona geldiysek çık
+            if i + window >= n:
+                break
+            i += stride
+
+def run_spans(
+    text: Union[str, Document],
+    window: int = 8,
+    stride: int = 4,
+    max_chars: int = 900
+) -> ChunkSpans:
+    """run() ile aynı chunk'lar; metin üretmeden span olarak."""
+    doc = as_document(text)
+    out = ChunkSpans(doc.text, " ")
+    _window_spans(out, *doc.sent_spans, window, stride, max_chars)
+    return out
 
 def run(
-    text: str,
+    text: Union[str, Document],
     window: int = 8,
     stride: int = 4,
     max_chars: int = 900
@@ -26,22 +74,4 @@ def run(
       - stride: bir sonraki pencereye geçişte kaç cümle kaydırılacağı
       - max_chars: chunk uzunluğu üst sınırı (yumuşak kesilir)
     """
-    sents = [s.strip() for s in _sents(text) if s and s.strip()]
-    chunks: List[str] = []
-    n = len(sents)
-    i = 0
-
-    while i < n:
-        win = sents[i:i+window]
-        if not win:
-            break
-        joined = " ".join(win).strip()
-        joined = _trim_to_max(joined, max_chars)
-        if joined:
-            chunks.append(joined)
-        # sona geldiysek çık
-        if i + window >= n:
-            break
-        i += stride
-
-    return chunks
\ No newline at end of file
+    return run_spans(text, window, stride, max_chars).texts()
@@ -0,0 +1,118 @@
+from array import array
+from typing import Iterable, Iterator, List, Sequence, Tuple
+from .profiling import stage
+
+Segment = Tuple[int, int]
+
+
+class ChunkSpans:
+    """
+    Chunk çıktısının kopyasız (span tabanlı) gösterimi.
+
+    Her chunk, kaynak metin üzerindeki bir veya daha fazla (start, end) parçasından
+    oluşur ve metni ancak istendiğinde üretilir:
+
+        chunk i = sep.join(source[starts[k]:ends[k]] for k in range(ptr[i], ptr[i + 1]))
+
+    Parçalar int64 dizilerinde (CSR düzeni) tutulur; overlap'li stratejilerde aynı cümlenin
+    birden fazla chunk'ta yer alması sadece iki tamsayıya mal olur.
+    """
+
+    __slots__ = ("source", "sep", "ptr", "starts", "ends")
+
+    def __init__(self, source: str, sep: str = " "):
+        self.source = source
+        self.sep = sep
+        self.ptr = array("q", [0])
+        self.starts = array("q")
+        self.ends = array("q")
+
+    # --- kurulum ----------------------------------------------------------------
+
+    def add(self, segs: Iterable[Segment]) -> None:
+        """Parçalardan oluşan yeni bir chunk ekler (boş parça listesi boş chunk demektir)."""
+        for s, e in segs:
+            self.starts.append(s)
+            self.ends.append(e)
+        self.ptr.append(len(self.starts))
+
+    def add_span(self, s: int, e: int) -> None:
+        """Tek parçalı chunk ekler."""
+        self.starts.append(s)
+        self.ends.append(e)
+        self.ptr.append(len(self.starts))
+
+    # --- erişim -----------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.ptr) - 1
+
+    def segments(self, i: int) -> List[Segment]:
+        lo, hi = self.ptr[i], self.ptr[i + 1]
+        return list(zip(self.starts[lo:hi], self.ends[lo:hi]))
+
+    def span(self, i: int) -> Segment:
+        """Chunk'ın kaynak metindeki dış aralığı (ilk parçanın başı, son parçanın sonu)."""
+        lo, hi = self.ptr[i], self.ptr[i + 1]
+        if lo == hi:
+            return (0, 0)
+        return (self.starts[lo], self.ends[hi - 1])
+
+    def char_len(self, i: int) -> int:
+        """Metni üretmeden chunk uzunluğu."""
+        lo, hi = self.ptr[i], self.ptr[i + 1]
+        if lo == hi:
+            return 0
+        return sum(self.ends[lo:hi]) - sum(self.starts[lo:hi]) + (hi - lo - 1) * len(self.sep)
+
+    def text(self, i: int) -> str:
+        lo, hi = self.ptr[i], self.ptr[i + 1]
+        src = self.source
+        if hi - lo == 1:
+            return src[self.starts[lo]:self.ends[lo]]
+        return self.sep.join(src[self.starts[k]:self.ends[k]] for k in range(lo, hi))
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.text(i)
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self.text(i)
+
+    def texts(self) -> List[str]:
+        with stage("join"):
+            return [self.text(i) for i in range(len(self))]
+
+
+def render(source: str, segs: Sequence[Segment], sep: str) -> str:
+    return sep.join(source[s:e] for s, e in segs)
+
+
+def slice_segments(segs: Sequence[Segment], sep_len: int, a: int, b: int) -> List[Segment]:
+    """
+    Birleştirilmiş metin üzerindeki [a, b) aralığını kaynak parçalarına geri eşler.
+    Aralık uçlarının ayırıcıya (boşluk) denk gelmediği varsayılır (strip'lenmiş aralıklar).
+    """
+    out: List[Segment] = []
+    pos = 0
+    for s, e in segs:
+        if pos >= b:
+            break
+        lo, hi = max(a, pos), min(b, pos + e - s)
+        if lo < hi:
+            out.append((s + lo - pos, s + hi - pos))
+        pos += e - s + sep_len
+    return out
+
+
+def strip_range(text: str, a: int, b: int) -> Tuple[int, int]:
+    """text[a:b].strip() sonucunun aralığı."""
+    while a < b and text[a].isspace():
+        a += 1
+    while b > a and text[b - 1].isspace():
+        b -= 1
+    return a, b
@@ -0,0 +1,315 @@
+"""
+Streaming chunking: RAM'e sığmayan girdiler için üretici (generator) API.
+
+    for ch in iter_chunks("data/buyuk.txt", "sentence_based", target_chars=900):
+        ...
+
+Metin buffer_chars'lık parçalar halinde okunur; tampon sınırında sadece tamamlanmamış
+son birim (cümle/paragraf) ve açık chunk'ın overlap kuyruğu taşınır. Çıktı, aynı metin
+üzerinde batch run() ile birebir aynıdır (regex cümle bölücüsüyle; nltk punkt bağlama
+baktığından tampon sınırlarında nadiren farklı bölebilir).
+
+Desteklenen yöntemler: fixed_length, sentence_based, paragraph_based, sliding_window.
+"""
+
+from collections import deque
+from itertools import islice
+from pathlib import Path
+from typing import IO, Callable, Deque, Iterator, List, Optional, Tuple, Union
+
+from .document import _PARA_SEP, _split_spans
+from .fixed_length import _cut_end
+from .packing import pack_units
+from .sentences import OPENERS, TOKEN_CONTEXT, sent_spans
+from .sliding_window import _trim_to_max
+from .spans import strip_range
+
+Source = Union[str, Path, IO[str]]
+Event = Tuple[str, str]
+Splitter = Callable[[str], List[Tuple[int, int]]]
+
+
+# --- girdi ----------------------------------------------------------------------
+
+def _read_normalized(src: Source, buffer_chars: int) -> Iterator[str]:
+    """Metni parça parça okur; \\r\\n ve \\r -> \\n (parça sınırına denk gelse bile)."""
+    if isinstance(src, (str, Path)):
+        with open(src, encoding="utf-8", newline="") as f:
+            yield from _read_normalized(f, buffer_chars)
+        return
+
+    pending = ""
+    while True:
+        piece = src.read(buffer_chars)
+        if not piece:
+            break
+        piece = pending + piece
+        # sondaki \r bir sonraki parçanın \n'i ile tek satır sonu olabilir; beklet
+        if piece.endswith("\r"):
+            piece, pending = piece[:-1], "\r"
+        else:
+            pending = ""
+        yield piece.replace("\r\n", "\n").replace("\r", "\n")
+    if pending:
+        yield "\n"
+
+
+# --- birim (cümle/paragraf) akışı -------------------------------------------------
+
+def _sentence_spans(buf: str) -> List[Tuple[int, int]]:
+    return list(zip(*sent_spans(buf)))
+
+
+def _paragraph_spans(buf: str) -> List[Tuple[int, int]]:
+    return list(zip(*_split_spans(buf, _PARA_SEP)))
+
+
+def _token_start(s: str, i: int) -> int:
+    """s[i]'yi içeren token'ın başı (en fazla TOKEN_CONTEXT + 1 karakter geri gidilir)."""
+    lo = max(0, i - TOKEN_CONTEXT - 1)
+    while i > lo and not s[i - 1].isspace():
+        i -= 1
+    return i
+
+
+def _unit_events(pieces: Iterator[str], split: Splitter, cap: int) -> Iterator[Event]:
+    """
+    Parça parça gelen metinden birimleri çıkarır. Olaylar:
+      ("unit", s)  tamamlanmış, strip'lenmiş birim
+      ("frag", s)  cap'i aşan (uzun) birimin bir parçası; birim strip'li başlar
+      ("end", s)   uzun birimin son parçası
+
+    Tampondaki son birim bir sonraki parçayla devam edebileceğinden taşınır; ondan önceki
+    sınırlar kesindir. Taşınan birim cap'i aşarsa kararlı kısmı "frag" olarak verilir,
+    böylece bellek tek bir dev birimde bile sınırlı kalır.
+    """
+    carry = ""
+    long_unit = False
+    for piece in pieces:
+        buf = carry + piece
+        spans = split(buf)
+        if not spans:
+            # sadece boşluk: uzun birimin içindeyse içeriğe aittir
+            carry = buf if long_unit else ""
+            continue
+        if long_unit:
+            # uzun birim tamponun başından devam eder (baştaki boşluk dahil)
+            spans[0] = (0, spans[0][1])
+
+        for s, e in spans[:-1]:
+            if long_unit:
+                yield "end", buf[s:e]
+                long_unit = False
+            else:
+                yield "unit", buf[s:e]
+
+        carry = buf[spans[-1][0]:]
+        # son boş olmayan karakter ve sonrası bekletilir: sınır ancak orada oluşabilir.
+        # Cümle sınırı kararı noktadan önceki token'a da baktığından son token (en fazla
+        # TOKEN_CONTEXT + 1 karakter) da bekletilir. Son token yalnızca açılış tırnağı/
+        # parantezi ise ('son. \n"') önceki token'ın sınırı ancak sonraki harfle belli
+        # olur; o token da bekletilir.
+        stable = _token_start(carry, len(carry.rstrip()) - 1)
+        if stable > 0 and not carry[stable:].rstrip().strip(OPENERS):
+            prev = len(carry[:stable].rstrip())
+            if prev > 0:
+                stable = _token_start(carry, prev - 1)
+        if stable >= cap:
+            yield "frag", carry[:stable]
+            carry = carry[stable:]
+            long_unit = True
+
+    last = carry.rstrip()
+    if long_unit:
+        yield "end", last
+    elif last:
+        yield "unit", last
+
+
+def _cut_text(s: str, target_chars: int) -> Iterator[str]:
+    for i in range(0, len(s), target_chars):
+        part = s[i:i + target_chars].strip()
+        if part:
+            yield part
+
+
+def _cut_long(first: str, events: Iterator[Event], target_chars: int) -> Iterator[str]:
+    """Uzun birimi parçaları geldikçe target_chars'lık dilimlere böler."""
+    buf = first
+    while True:
+        while len(buf) >= target_chars:
+            part = buf[:target_chars].strip()
+            if part:
+                yield part
+            buf = buf[target_chars:]
+        kind, s = next(events)
+        buf += s
+        if kind == "end":
+            break
+    yield from _cut_text(buf, target_chars)
+
+
+# --- yöntemler --------------------------------------------------------------------
+
+def _stream_pack(
+    events: Iterator[Event],
+    target_chars: int,
+    overlap: int,
+    sep: str,
+) -> Iterator[str]:
+    """sentence_based / paragraph_based paketlemesinin akış hâli (pack_units ortak)."""
+    units: Deque[Optional[str]] = deque()  # base indeksinden itibaren bekleyen birimler
+    base = 0
+    long_heads: List[str] = []
+
+    def lens() -> Iterator[int]:
+        for kind, s in events:
+            if kind == "unit":
+                units.append(s)
+                yield len(s)
+            else:
+                # uzun birim: metni tutulmaz, packer'a "çok uzun" olarak bildirilir
+                units.append(None)
+                long_heads.append(s)
+                yield target_chars + 1
+
+    for i0, i1 in pack_units(lens(), target_chars, overlap, len(sep)):
+        while base < i0:
+            units.popleft()
+            base += 1
+        first = units[0] if units else None
+        if i1 - i0 == 1 and (first is None or len(first) > target_chars):
+            if first is None:
+                yield from _cut_long(long_heads.pop(), events, target_chars)
+            else:
+                yield from _cut_text(first, target_chars)
+        else:
+            yield sep.join(islice(units, 0, i1 - i0))
+
+
+def _stream_sentence_based(
+    pieces: Iterator[str],
+    buffer_chars: int,
+    target_chars: int = 900,
+    overlap_sent: int = 1,
+) -> Iterator[str]:
+    cap = max(buffer_chars, target_chars + 1)
+    events = _unit_events(pieces, _sentence_spans, cap)
+    return _stream_pack(events, target_chars, overlap_sent, " ")
+
+
+def _stream_paragraph_based(
+    pieces: Iterator[str],
+    buffer_chars: int,
+    target_chars: int = 900,
+) -> Iterator[str]:
+    cap = max(buffer_chars, target_chars + 1)
+    events = _unit_events(pieces, _paragraph_spans, cap)
+    return _stream_pack(events, target_chars, 0, "\n\n")
+
+
+def _stream_sliding_window(
+    pieces: Iterator[str],
+    buffer_chars: int,
+    window: int = 8,
+    stride: int = 4,
+    max_chars: int = 900,
+) -> Iterator[str]:
+    # pencere en fazla max_chars'a kesildiğinden cümlenin ilk max_chars+1 karakteri yeterli
+    lim = None if max_chars is None else max_chars + 1
+    cap = buffer_chars if lim is None else max(buffer_chars, lim)
+    events = _unit_events(pieces, _sentence_spans, cap)
+
+    def sents() -> Iterator[str]:
+        for kind, s in events:
+            if kind == "frag":
+                head = s
+                for kind, s in events:
+                    if lim is None or len(head) < lim:
+                        head += s
+                    if kind == "end":
+                        break
+                s = head
+            yield s if lim is None else s[:lim]
+
+    it = sents()
+    buf: Deque[str] = deque()  # sents[i:] ilk window+1 cümle
+    done = False
+    while True:
+        while not done and len(buf) <= window:
+            nxt = next(it, None)
+            if nxt is None:
+                done = True
+            else:
+                buf.append(nxt)
+        win = list(islice(buf, 0, max(window, 0)))
+        if not win:
+            break
+        joined = _trim_to_max(" ".join(win).strip(), max_chars)
+        if joined:
+            yield joined
+        # sona geldiysek çık (i + window >= n)
+        if len(buf) <= window:
+            break
+        for _ in range(stride):
+            if buf:
+                buf.popleft()
+            elif next(it, None) is None:
+                break
+
+
+def _stream_fixed_length(
+    pieces: Iterator[str],
+    buffer_chars: int,
+    chunk_chars: int = 800,
+    overlap_chars: int = 100,
+) -> Iterator[str]:
+    buf = ""
+    i = 0
+    done = False
+    while True:
+        # pencere + kelime kontrolü için bir karakter fazlası gerekir
+        while not done and len(buf) - i <= chunk_chars:
+            piece = next(pieces, None)
+            if piece is None:
+                done = True
+            else:
+                buf = buf[i:] + piece
+                i = 0
+        n = len(buf)
+        if i >= n:
+            break
+        end = _cut_end(buf, i, chunk_chars)
+        a, b = strip_range(buf, i, end)
+        if a < b:
+            yield buf[a:b]
+        if end >= n:
+            break
+        i = max(end - overlap_chars, i + 1)
+
+
+_STREAMERS = {
+    "fixed_length": _stream_fixed_length,
+    "sentence_based": _stream_sentence_based,
+    "paragraph_based": _stream_paragraph_based,
+    "sliding_window": _stream_sliding_window,
+}
+
+
+def iter_chunks(
+    reader_or_path: Source,
+    method: str,
+    buffer_chars: int = 1 << 20,
+    **params,
+) -> Iterator[str]:
+    """
+    reader_or_path'i (dosya yolu ya da .read(n) destekleyen metin akışı) parça parça okuyup
+    method'un chunk'larını sırayla üretir. params, ilgili chunker'ın run() parametreleridir.
+    """
+    try:
+        streamer = _STREAMERS[method]
+    except KeyError:
+        raise ValueError(
+            f"'{method}' için streaming desteklenmiyor; desteklenenler: {', '.join(_STREAMERS)}"
+        ) from None
+    return streamer(_read_normalized(reader_or_path, buffer_chars), buffer_chars, **params)
@@ -1,9 +1,33 @@
-from typing import List
-from .sentence_based import run as sentence_chunk
-from .agentic import _is_heading  # başlık sezgimizi yeniden kullanıyoruz
+from typing import List, Union
+from .document import Document, as_document
+from .sentence_based import run_spans as sentence_spans
+from .packing import pack_spans
+from .spans import ChunkSpans
+
+def run_spans(
+    text: Union[str, Document],
+    target_chars: int = 900,
+    overlap_sent: int = 0,
+) -> ChunkSpans:
+    """run() ile aynı chunk'lar; doc.lines_text üzerinde span olarak."""
+    # Alt-dokümanlar (başlık sezgisi, bkz. sections) Document'ta bir kez çıkarılır
+    doc = as_document(text)
+    ptr, starts, ends = doc.section_sent_spans
+
+    # Başlık yoksa fallback
+    if len(ptr) == 1:
+        return sentence_spans(doc, target_chars=target_chars, overlap_sent=overlap_sent)
+
+    # Her alt-dokümanı bağımsız işle (başlık ilk cümle olarak içinde kalır)
+    out = ChunkSpans(doc.lines_text, " ")
+    for k in range(len(ptr) - 1):
+        lo, hi = ptr[k], ptr[k + 1]
+        # alt-doküman içinde overlap'ı düşük tutmak genelde iyi (0/1)
+        pack_spans(out, starts[lo:hi], ends[lo:hi], target_chars, overlap_sent)
+    return out
 
 def run(
-    text: str,
+    text: Union[str, Document],
     target_chars: int = 900,
     overlap_sent: int = 0,
 ) -> List[str]:
@@ -13,31 +37,4 @@ def run(
       2) Her alt-dokümanı bağımsız bir belge gibi ele alıp sentence-based chunkla.
       3) Başlık hiç yoksa tüm metni sentence-based chunkla (fallback).
     """
-    norm = text.replace("\r\n", "\n").replace("\r", "\n")
-    lines = [ln.strip() for ln in norm.split("\n") if ln.strip()]
-
-    # Alt-dokümanları ayır: heading gördükçe yeni subdoc başlat
-    subdocs: List[List[str]] = []
-    cur: List[str] = []
-    for ln in lines:
-        if _is_heading(ln):
-            if cur:
-                subdocs.append(cur)
-                cur = []
-        cur.append(ln)
-    if cur:
-        subdocs.append(cur)
-
-    # Başlık yoksa fallback
-    if not subdocs:
-        return sentence_chunk(text, target_chars=target_chars, overlap_sent=overlap_sent)
-
-    # Her alt-dokümanı bağımsız işle
-    chunks: List[str] = []
-    for sd in subdocs:
-        sd_text = "\n".join(sd).strip()  # başlığı da içinde tut
-        # alt-doküman içinde overlap'ı düşük tutmak genelde iyi (0/1)
-        sd_chunks = sentence_chunk(sd_text, target_chars=target_chars, overlap_sent=overlap_sent)
-        chunks.extend(sd_chunks)
-
-    return chunks
\ No newline at end of file
+    return run_spans(text, target_chars, overlap_sent).texts()
@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+"""
+Yakın-kopya (near-duplicate) chunk tespiti: MinHash imzaları + LSH bantlama.
+
+İmza: chunk küçük harfe çevrilip kelimelere ayrılır; ardışık SHINGLE kelimelik parçalar
+(shingle) hash'lenir. Tek permütasyonlu MinHash kullanılır: her shingle bir kez hash'lenip
+num_perm kutudan birine düşer, kutu başına en küçük değer tutulur; boş kutular rotasyonla
+doldurulur (densification). Maliyet shingle sayısıyla doğrusaldır (num_perm ile çarpılmaz)
+ve tüm adımlar NumPy üzerinde, metin gruplarıyla (batch) yapılır.
+
+Kümeleme: imza bands x rows banda bölünür; en az bir bandı aynı olan chunk'lar aday
+olur, adaylar imza uyumu (tahmini Jaccard) >= threshold ile doğrulanır ve bağlı
+bileşenler küme sayılır. n x n karşılaştırma yapılmaz; milyonlarca chunk'ta çalışır.
+Kümeler geçişlidir (A~B, B~C ise A, B, C aynı kümededir).
+
+    labels = duplicate_labels(chunks)      # her chunk'ın kümesindeki ilk chunk'ın sırası
+    duplicate_rate(labels)                 # ilk örnek dışındaki chunk'ların oranı
+    Deduper(0.9).filter(chunks)            # akış halinde tekilleştirme (main.py --dedup)
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+NUM_PERM = 128
+SHINGLE = 5
+THRESHOLD = 0.8
+# bir grupta işlenen en fazla metin baytı (UTF-8, küçük harfli; ara diziler bunun birkaç katı yer tutar)
+BATCH_BYTES = 1 << 23
+
+_U64 = np.uint64
+_EMPTY = np.uint64(1 << 32)  # boş kutu işareti (imza değerleri 32 bit)
+_B = 0x100000001B3  # token hash'i için taban (tek sayı: 2^64'te tersi var)
+_B_INV = pow(_B, -1, 1 << 64)
+_ROT = 0x9E3779B9  # densification'da kaydırılan kutuya eklenen sabit
+# shingle içindeki kelime konumlarının çarpanları
+_POS = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9,
+                 0xD6E8FEB86659FD93, 0xFF51AFD7ED558CCD, 0xC4CEB9FE1A85EC53,
+                 0x27D4EB2F165667C5, 0x85EBCA77C2B2AE63], dtype=_U64)
+
+# ASCII'de harf/rakam olmayan baytlar ayırıcıdır; UTF-8 çok baytlı karakterler kelimeye dahildir
+_SEP = np.array([b < 128 and not chr(b).isalnum() for b in range(256)])
+
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    """splitmix64 son adımı (uint64, taşma modüler)."""
+    x = x ^ (x >> _U64(30))
+    x = x * _U64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> _U64(27))
+    x = x * _U64(0x94D049BB133111EB)
+    return x ^ (x >> _U64(31))
+
+
+def _powers(n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    B^p ve B^-p (mod 2^64), p < n. Grubun kendi uzunluğunda kurulur ve tutulmaz:
+    maliyeti grubun hash'lenmesiyle aynı mertebede, bellekte kalıcı tablo yok.
+    """
+    with np.errstate(over="ignore"):
+        pw = np.cumprod(np.full(n, _B, dtype=_U64)) * _U64(_B_INV)
+        ipw = np.cumprod(np.full(n, _B_INV, dtype=_U64)) * _U64(_B)
+    return pw, ipw
+
+
+def _shingles(enc: Sequence[bytes], k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (shingle hash'leri, ait oldukları chunk sırası); enc küçük harfli UTF-8 metinlerdir.
+    Kelimesiz chunk tek sabit shingle alır.
+    """
+    n = len(enc)
+    lens = np.fromiter(map(len, enc), dtype=np.int64, count=n)
+    # chunk'lar arasına ayırıcı konur: kelimeler chunk sınırını aşmaz
+    buf = np.frombuffer(b" ".join(enc) + b" ", dtype=np.uint8)
+    off = np.concatenate(([0], np.cumsum(lens + 1)[:-1]))
+
+    word = ~_SEP[buf]
+    edge = np.diff(np.concatenate(([False], word, [False])).astype(np.int8))
+    tstart = np.flatnonzero(edge == 1)
+    tend = np.flatnonzero(edge == -1)
+
+    # kelime hash'i: bayt dizisinin polinom hash'i, önek toplamlarından (mod 2^64)
+    pw, ipw = _powers(len(buf))
+    with np.errstate(over="ignore"):
+        pre = np.concatenate(([_U64(0)], np.cumsum(buf.astype(_U64) * pw)))
+        tok = _mix((pre[tend] - pre[tstart]) * ipw[tstart])
+
+    owner = np.searchsorted(off, tstart, side="right") - 1
+    ntok = np.bincount(owner, minlength=n)
+    first = np.concatenate(([0], np.cumsum(ntok)[:-1]))
+
+    # k kelimelik pencereler (tek chunk içinde kalanlar)
+    m = len(tok)
+    vals, owns = [], []
+    if m >= k:
+        idx = np.arange(m - k + 1)
+        ok = owner[idx + k - 1] == owner[idx]
+        idx = idx[ok]
+        sh = np.zeros(len(idx), dtype=_U64)
+        with np.errstate(over="ignore"):
+            for j in range(k):
+                sh += tok[idx + j] * _POS[j % len(_POS)]
+        vals.append(sh)
+        owns.append(owner[idx])
+    # k'dan az kelimeli chunk'lar: tüm kelimeleri tek shingle
+    short = np.flatnonzero((ntok > 0) & (ntok < k))
+    if len(short):
+        sh = np.zeros(len(short), dtype=_U64)
+        with np.errstate(over="ignore"):
+            for j in range(k - 1):
+                has = ntok[short] > j
+                sh[has] += tok[first[short[has]] + j] * _POS[j % len(_POS)]
+        vals.append(sh)
+        owns.append(short)
+    empty = np.flatnonzero(ntok == 0)
+    if len(empty):
+        vals.append(np.zeros(len(empty), dtype=_U64))
+        owns.append(empty)
+    return _mix(np.concatenate(vals)), np.concatenate(owns)
+
+
+def _oph(values: np.ndarray, owner: np.ndarray, n: int, num_perm: int) -> np.ndarray:
+    """Tek permütasyonlu MinHash + rotasyonla doldurma; (n, num_perm) uint32."""
+    bits = num_perm.bit_length() - 1
+    sig = np.full((n, num_perm), _EMPTY, dtype=_U64)
+    bins = (values >> _U64(64 - bits)).astype(np.int64)
+    np.minimum.at(sig.reshape(-1), owner * num_perm + bins, values & _U64(0xFFFFFFFF))
+
+    todo = sig == _EMPTY
+    rows = np.flatnonzero(todo.any(axis=1))
+    if len(rows):
+        src = sig[rows]
+        out = src.copy()
+        left = todo[rows]
+        for t in range(1, num_perm):
+            cand = np.roll(src, -t, axis=1)  # kutu j için (j + t) % num_perm
+            ok = left & (cand != _EMPTY)
+            out[ok] = (cand[ok] + _U64(t * _ROT)) & _U64(0xFFFFFFFF)
+            left &= ~ok
+            if not left.any():
+                break
+        sig[rows] = out
+    return sig.astype(np.uint32)
+
+
+def signatures(
+    texts: Sequence[str],
+    num_perm: int = NUM_PERM,
+    shingle: int = SHINGLE,
+    batch_bytes: int = BATCH_BYTES,
+) -> np.ndarray:
+    """Chunk'ların MinHash imzaları, (n, num_perm) uint32. num_perm 2'nin kuvveti olmalı."""
+    if num_perm < 2 or num_perm & (num_perm - 1):
+        raise ValueError(f"num_perm 2'nin kuvveti olmalı: {num_perm}")
+    n = len(texts)
+    out = np.empty((n, num_perm), dtype=np.uint32)
+    i = 0
+    nxt: Optional[bytes] = None
+    while i < n:
+        # grup, hash tamponunun gerçek boyutuyla (UTF-8 bayt + ayırıcı) sınırlanır
+        batch: List[bytes] = []
+        size = 0
+        while i + len(batch) < n:
+            b = nxt if nxt is not None else texts[i + len(batch)].lower().encode("utf-8")
+            nxt = None
+            if batch and size + len(b) + 1 > batch_bytes:
+                nxt = b
+                break
+            batch.append(b)
+            size += len(b) + 1
+        vals, owner = _shingles(batch, shingle)
+        out[i:i + len(batch)] = _oph(vals, owner, len(batch), num_perm)
+        i += len(batch)
+    return out
+
+
+def lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    (bands, rows): bands * rows <= num_perm ve S-eğrisinin eşiği (1/bands)^(1/rows)
+    threshold'a en yakın olacak şekilde.
+    """
+    best = None
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        err = abs((1.0 / bands) ** (1.0 / rows) - threshold)
+        if best is None or err < best[0] - 1e-12:
+            best = (err, bands, rows)
+    return best[1], best[2]
+
+
+def band_keys(sig: np.ndarray, bands: int, rows: int) -> np.ndarray:
+    """Her bandın 64 bit anahtarı, (n, bands) uint64."""
+    keys = np.zeros((len(sig), bands), dtype=_U64)
+    with np.errstate(over="ignore"):
+        for b in range(bands):
+            h = np.zeros(len(sig), dtype=_U64)
+            for r in range(b * rows, (b + 1) * rows):
+                h = _mix(h ^ sig[:, r].astype(_U64))
+            keys[:, b] = h
+    return keys
+
+
+def _agreement(sig: np.ndarray, a: np.ndarray, b: np.ndarray, block: int = 1 << 16) -> np.ndarray:
+    """İmza uyumu (tahmini Jaccard) çiftler için."""
+    out = np.empty(len(a), dtype=np.float64)
+    for s in range(0, len(a), block):
+        out[s:s + block] = (sig[a[s:s + block]] == sig[b[s:s + block]]).mean(axis=1)
+    return out
+
+
+def duplicate_labels(
+    texts: Optional[Sequence[str]] = None,
+    threshold: float = THRESHOLD,
+    num_perm: int = NUM_PERM,
+    sig: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Her chunk için kümesindeki ilk chunk'ın sırası (kopyası yoksa kendi sırası).
+    texts ya da hazır imzalar (sig) verilir.
+    """
+    if sig is None:
+        sig = signatures(texts, num_perm)
+    n = len(sig)
+    if n < 2:
+        return np.arange(n)
+    bands, rows = lsh_params(threshold, sig.shape[1])
+    keys = band_keys(sig, bands, rows)
+
+    # her bantta aynı anahtarlı grubun her üyesi grubun ilk (en küçük sıralı) üyesine bağlanır
+    src, dst = [], []
+    for b in range(bands):
+        order = np.argsort(keys[:, b], kind="stable")
+        k = keys[order, b]
+        new = np.concatenate(([True], k[1:] != k[:-1]))
+        head = order[np.flatnonzero(new)[np.cumsum(new) - 1]]
+        dup = ~new
+        src.append(head[dup])
+        dst.append(order[dup])
+    a = np.concatenate(src)
+    b = np.concatenate(dst)
+    if len(a):
+        pair = np.unique(a.astype(np.int64) * n + b)
+        a, b = pair // n, pair % n
+        ok = _agreement(sig, a, b) >= threshold
+        a, b = a[ok], b[ok]
+    import scipy.sparse as sp  # yalnızca kümeleme için; modül import'u scipy yüklemez
+    from scipy.sparse.csgraph import connected_components
+    graph = sp.csr_matrix((np.ones(len(a), dtype=np.int8), (a, b)), shape=(n, n))
+    _, comp = connected_components(graph, directed=False)
+    first = np.full(comp.max() + 1, n, dtype=np.int64)
+    np.minimum.at(first, comp, np.arange(n))
+    return first[comp]
+
+
+def duplicate_rate(labels: np.ndarray) -> float:
+    """Bir kümenin ilk örneği olmayan (atılabilecek) chunk'ların oranı."""
+    n = len(labels)
+    return float(np.count_nonzero(labels != np.arange(n)) / n) if n else 0.0
+
+
+class Deduper:
+    """
+    Akış halinde tekilleştirme: daha önce tutulan bir chunk'la tahmini Jaccard'ı
+    threshold'u geçen chunk atılır. Chunk'lar gruplar halinde verilebilir; imzalar
+    grup başına toplu hesaplanır, yalnızca tutulan chunk'ların imzası saklanır.
+    """
+
+    def __init__(self, threshold: float = THRESHOLD, num_perm: int = NUM_PERM):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = lsh_params(threshold, num_perm)
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(self.bands)]
+        self._sigs = np.empty((0, num_perm), dtype=np.uint32)
+        self._n = 0
+        self.seen = 0
+        self.dropped = 0
+
+    def keep_mask(self, texts: Sequence[str]) -> List[bool]:
+        """Gruptaki her chunk için tutulup tutulmayacağı (grup içi kopyalar da atılır)."""
+        if not texts:
+            return []
+        sig = signatures(texts, self.num_perm)
+        keys = band_keys(sig, self.bands, self.rows).tolist()
+        if self._n + len(sig) > len(self._sigs):
+            grown = np.empty((max(2 * len(self._sigs), self._n + len(sig)), self.num_perm), dtype=np.uint32)
+            grown[:self._n] = self._sigs[:self._n]
+            self._sigs = grown
+        mask = []
+        for s, ks in zip(sig, keys):
+            cand = {c for bucket, key in zip(self._buckets, ks) for c in bucket.get(key, ())}
+            dup = bool(cand) and any(
+                np.count_nonzero(self._sigs[c] == s) >= self.threshold * self.num_perm for c in cand
+            )
+            if not dup:
+                idx = self._n
+                self._sigs[idx] = s
+                self._n += 1
+                for bucket, key in zip(self._buckets, ks):
+                    bucket.setdefault(key, []).append(idx)
+            mask.append(not dup)
+        self.seen += len(mask)
+        self.dropped += mask.count(False)
+        return mask
+
+    def filter(self, texts: Sequence[str]) -> List[str]:
+        return [t for t, keep in zip(texts, self.keep_mask(texts)) if keep]
+
+    def filter_iter(self, chunks: Iterable[str], batch: int = 4096) -> Iterable[str]:
+        buf: List[str] = []
+        for ch in chunks:
+            buf.append(ch)
+            if len(buf) >= batch:
+                yield from self.filter(buf)
+                buf = []
+        if buf:
+            yield from self.filter(buf)
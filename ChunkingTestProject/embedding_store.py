@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""
+Chunk embedding'lerinin nicemlenmiş (quantized) saklanması ve nicemlenmiş diziler üzerinde
+brute-force top-k arama.
+
+Embedding'ler chunk deposunun içinde, chunk sırasıyla hizalı durur (satır i = chunk i):
+
+    tests/<method>.chunks/
+      embeddings.npy         (n, dim) float16 ya da int8
+      embedding_scales.npy   (n,) float32, sadece int8: satır ölçeği (x ~= q * scale)
+      embeddings.json        dtype, dim, encoder, nicemleme hata raporu
+
+int8 simetrik satır başına ölçekle nicemlenir (scale = max|x| / 127); float32'ye göre
+float16 2x, int8 ~4x yer kazandırır. Dosyalar mmap ile açılır; arama satır blokları halinde
+float32'ye açılıp skorlanır, tüm matris bellekte float32 olarak hiç kurulmaz.
+
+    python embedding_store.py report tests/semantic.chunks
+    python embedding_store.py search tests/sentence_based.chunks "Dallas nüfusu" -k 5 --encoder hashing
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+import argparse
+import json
+
+import numpy as np
+
+from chunk_store import ChunkStore, ChunkStoreWriter
+
+EMBEDDINGS = "embeddings.npy"
+SCALES = "embedding_scales.npy"
+META = "embeddings.json"
+DTYPES = ("float16", "int8")
+# aramada float32'ye açılan satır bloğu
+SEARCH_BLOCK = 1 << 16
+# hata raporunda top-k uyumu için saklanan orijinal satır örneği
+REPORT_SAMPLE = 4096
+REPORT_QUERIES = 64
+REPORT_K = 10
+
+
+def quantize(X: np.ndarray, dtype: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """(nicemlenmiş matris, satır ölçekleri | None)."""
+    X = np.asarray(X, dtype=np.float32)
+    if dtype == "float16":
+        return X.astype(np.float16), None
+    if dtype != "int8":
+        raise ValueError(f"desteklenmeyen dtype: {dtype}")
+    scale = np.abs(X).max(axis=1) / 127.0 if len(X) else np.zeros(0, np.float32)
+    scale = np.where(scale > 0, scale, 1.0).astype(np.float32)
+    return np.clip(np.rint(X / scale[:, None]), -127, 127).astype(np.int8), scale
+
+
+def dequantize(Q: np.ndarray, scale: Optional[np.ndarray]) -> np.ndarray:
+    X = np.asarray(Q, dtype=np.float32)
+    return X if scale is None else X * np.asarray(scale, dtype=np.float32)[:, None]
+
+
+def _topk(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Satır başına en yüksek k skor: (id'ler, skorlar), azalan."""
+    k = min(k, scores.shape[1])
+    idx = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    part = np.take_along_axis(scores, idx, axis=1)
+    order = np.argsort(-part, axis=1, kind="stable")
+    return np.take_along_axis(idx, order, axis=1), np.take_along_axis(part, order, axis=1)
+
+
+class EmbeddingWriter:
+    """
+    Chunk embedding'lerini yazım sırasıyla toplar (hemen nicemlenir) ve depo kapanmadan önce
+    ChunkStoreWriter'a ekler. Hata istatistikleri akış halinde tutulur; top-k uyumu için
+    satırlardan sabit boyutlu rastgele bir örnek (reservoir) saklanır.
+    """
+
+    def __init__(self, dtype: str, encoder: Optional[str] = None, seed: int = 0):
+        if dtype not in DTYPES:
+            raise ValueError(f"desteklenmeyen dtype: {dtype}")
+        self.dtype = dtype
+        self.encoder = encoder
+        self.dim: Optional[int] = None
+        self._blocks: List[np.ndarray] = []
+        self._scales: List[np.ndarray] = []
+        self._rng = np.random.default_rng(seed)
+        self._sample: List[np.ndarray] = []
+        self.rows = 0
+        self._err_sq = 0.0
+        self._norm_sq = 0.0
+        self._rel_max = 0.0
+        self._abs_max = 0.0
+        self._cos_sum = 0.0
+        self._cos_min = 1.0
+
+    def add(self, vecs: np.ndarray) -> None:
+        vecs = np.asarray(vecs, dtype=np.float32)
+        if not len(vecs):
+            return
+        if self.dim is None:
+            self.dim = vecs.shape[1]
+        elif vecs.shape[1] != self.dim:
+            raise ValueError(f"embedding boyutu değişti: {self.dim} -> {vecs.shape[1]}")
+        Q, scale = quantize(vecs, self.dtype)
+        self._blocks.append(Q)
+        if scale is not None:
+            self._scales.append(scale)
+
+        err = dequantize(Q, scale) - vecs
+        norms = np.linalg.norm(vecs, axis=1)
+        err_norms = np.linalg.norm(err, axis=1)
+        self._err_sq += float((err_norms ** 2).sum())
+        self._norm_sq += float((norms ** 2).sum())
+        rel = err_norms / np.maximum(norms, 1e-12)
+        self._rel_max = max(self._rel_max, float(rel.max()))
+        self._abs_max = max(self._abs_max, float(np.abs(err).max()))
+        deq = vecs + err
+        cos = (deq * vecs).sum(axis=1) / np.maximum(norms * np.linalg.norm(deq, axis=1), 1e-12)
+        cos = np.where(norms > 0, cos, 1.0)
+        self._cos_sum += float(cos.sum())
+        self._cos_min = min(self._cos_min, float(cos.min()))
+
+        # reservoir: örnekteki her satır, görülen satırlar arasından eşit olasılıkla seçilmiş olur
+        pos = self.rows + np.arange(len(vecs))
+        fill = pos < REPORT_SAMPLE
+        self._sample.extend(vecs[fill])
+        slots = self._rng.integers(0, pos[~fill] + 1) if (~fill).any() else np.zeros(0, np.int64)
+        for j, r in zip(np.flatnonzero(~fill), slots):
+            if r < REPORT_SAMPLE:
+                self._sample[r] = vecs[j].copy()
+        self.rows += len(vecs)
+
+    def report(self) -> Dict[str, Any]:
+        """Nicemleme hata raporu; topk_recall örnek satırlar arasında ölçülür."""
+        n, dim = self.rows, self.dim or 0
+        itemsize = np.dtype(self.dtype).itemsize
+        nbytes = n * dim * itemsize + (4 * n if self.dtype == "int8" else 0)
+        rep: Dict[str, Any] = {
+            "rows": n,
+            "dim": dim,
+            "bytes": nbytes,
+            "float32_bytes": n * dim * 4,
+            "compression": (n * dim * 4) / nbytes if nbytes else 0.0,
+            "rel_l2": (self._err_sq / self._norm_sq) ** 0.5 if self._norm_sq else 0.0,
+            "rel_l2_max": self._rel_max,
+            "max_abs_err": self._abs_max,
+            "cos_mean": self._cos_sum / n if n else 1.0,
+            "cos_min": self._cos_min if n else 1.0,
+        }
+        if len(self._sample) > 1:
+            S = np.stack(self._sample)
+            Q, scale = quantize(S, self.dtype)
+            D = dequantize(Q, scale)
+            k = min(REPORT_K, len(S) - 1)
+            qs = S[:REPORT_QUERIES]
+            exact, _ = _topk(qs @ S.T, k + 1)
+            approx, _ = _topk(qs @ D.T, k + 1)
+            rep["topk_k"] = k
+            rep["topk_recall"] = float(np.mean([
+                len(set(a) & set(e)) / len(e) for a, e in zip(approx, exact)
+            ]))
+        return rep
+
+    def write(self, store: ChunkStoreWriter) -> Dict[str, Any]:
+        """Embedding dosyalarını deponun geçici klasörüne yazar; hata raporunu döndürür."""
+        if self.rows != len(store):
+            raise ValueError(f"embedding sayısı ({self.rows}) chunk sayısına ({len(store)}) eşit değil")
+        dim = self.dim or 0
+        Q = np.concatenate(self._blocks) if self._blocks else np.zeros((0, dim), self.dtype)
+        store.write_array(EMBEDDINGS, Q)
+        if self.dtype == "int8":
+            store.write_array(SCALES, np.concatenate(self._scales) if self._scales else np.zeros(0, np.float32))
+        rep = self.report()
+        store.write_json(META, {"dtype": self.dtype, "dim": dim, "encoder": self.encoder, "report": rep})
+        return rep
+
+
+class EmbeddingStore:
+    """Depodaki nicemlenmiş embedding'ler (mmap); search() nicemlenmiş matris üzerinde çalışır."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        meta_path = self.path / META
+        if not meta_path.is_file():
+            raise FileNotFoundError(f"{self.path}: embedding yok (main.py --embed ile üretilir)")
+        self.meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        self.Q = np.load(self.path / EMBEDDINGS, mmap_mode="r")
+        scale_path = self.path / SCALES
+        self.scale = np.load(scale_path, mmap_mode="r") if scale_path.exists() else None
+
+    def __len__(self) -> int:
+        return len(self.Q)
+
+    @property
+    def dim(self) -> int:
+        return int(self.meta["dim"])
+
+    def vectors(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """[start, stop) satırlarının float32'ye açılmış hâli."""
+        sl = slice(start, stop)
+        return dequantize(self.Q[sl], None if self.scale is None else self.scale[sl])
+
+    def search(self, queries: np.ndarray, k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Brute-force iç çarpım top-k. queries (dim,) ya da (m, dim); sonuç (m, k) id ve skor
+        (tek sorguda (k,)). Satır blokları float32'ye açılır; int8'de ölçek skora uygulanır.
+        """
+        q = np.asarray(queries, dtype=np.float32)
+        single = q.ndim == 1
+        q = q.reshape(-1, self.dim)
+        n = len(self)
+        k = min(k, n)
+        best_ids = np.zeros((len(q), 0), np.int64)
+        best = np.zeros((len(q), 0), np.float32)
+        for a in range(0, n, SEARCH_BLOCK):
+            b = min(a + SEARCH_BLOCK, n)
+            scores = q @ np.asarray(self.Q[a:b], dtype=np.float32).T
+            if self.scale is not None:
+                scores *= np.asarray(self.scale[a:b], dtype=np.float32)[None, :]
+            ids, vals = _topk(scores, k)
+            best_ids, best = _topk_merge(best_ids, best, ids + a, vals, k)
+        return (best_ids[0], best[0]) if single else (best_ids, best)
+
+
+def _topk_merge(ids_a, vals_a, ids_b, vals_b, k: int):
+    ids = np.concatenate([ids_a, ids_b], axis=1)
+    vals = np.concatenate([vals_a, vals_b], axis=1)
+    if vals.shape[1] <= k:
+        order = np.argsort(-vals, axis=1, kind="stable")
+        return np.take_along_axis(ids, order, axis=1), np.take_along_axis(vals, order, axis=1)
+    top, top_vals = _topk(vals, k)
+    return np.take_along_axis(ids, top, axis=1), top_vals
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Depodaki nicemlenmiş chunk embedding'leri.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("report", help="nicemleme hata raporu")
+    p.add_argument("store", type=Path)
+    p = sub.add_parser("search", help="sorgu metnini encode edip brute-force top-k")
+    p.add_argument("store", type=Path)
+    p.add_argument("query")
+    p.add_argument("-k", type=int, default=10)
+    p.add_argument("--encoder", help="sorgu encoder'ı (varsayılan: depoya yazan encoder)")
+    args = ap.parse_args(argv)
+
+    emb = EmbeddingStore(args.store)
+    if args.cmd == "report":
+        print(json.dumps({"dtype": emb.meta["dtype"], "encoder": emb.meta.get("encoder"),
+                          **emb.meta.get("report", {})}, ensure_ascii=False, indent=2))
+        return
+
+    from chunkers.embeddings import ENCODERS
+    encoder = args.encoder or emb.meta.get("encoder") or "model"
+    q = ENCODERS[encoder]([args.query])[0]
+    ids, scores = emb.search(q, args.k)
+    with ChunkStore(args.store) as store:
+        for i, s in zip(ids, scores):
+            print(f"{int(i):>8}  {s:7.4f}  {store[int(i)][:160]}".replace("\n", " "))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,51 @@
 # -*- coding: utf-8 -*-
 """
-tests/ klasöründeki chunk çıktılarını (TXT) okuyup puanlar.
+tests/ klasöründeki chunk çıktılarını okuyup puanlar: chunk depoları (<method>.chunks,
+bkz. chunk_store.py) ve eski "===== CHUNK n =====" biçimindeki .txt dosyaları.
+Aynı yöntemin hem deposu hem .txt'si varsa depo kullanılır.
 Her dosya için metrikler:
   - num_chunks, avg_chars, std_chars, min_chars, max_chars
   - cohesion (yüksek iyi): chunk içi cümle benzerliği
+    (tüm cümleler tek TF-IDF fit'iyle; --per-chunk-idf ile eski chunk başına IDF)
   - boundary_sharpness (yüksek iyi): komşu chunk'lar arası ayrışma = 1 - cosine
   - redundancy (düşük iyi): tüm chunklar arası ortalama benzerlik
+  - duplicate_rate (düşük iyi): MinHash/LSH ile bulunan yakın-kopya (tahmini Jaccard >=
+    dedup.THRESHOLD) kümelerinde ilk örnek dışında kalan chunk oranı (bkz. dedup.py)
 
 Çıktılar:
   - out/report_metrics.json   (ham metrikler)
   - out/report_summary.md     (özet tablo + sıralama)
+  - out/metrics_cache.json    (dosya içeriği hash'ine göre metrik cache'i; değişmeyen
+                               dosyalar yeniden puanlanmaz, --no-cache ile kapatılır)
+
+--profile: her dosyanın metrik aşama süreleri (ve main.py --profile ile yazılmış
+out/chunk_profile.json varsa yöntemin chunk'lama aşamaları) rapora "profile" olarak eklenir;
+--trace ile Chrome trace dosyası da yazılır.
+
+scipy ve sklearn metrik fonksiyonlarının içinde import edilir; modülü import etmek
+(main.py, retrieval.py, --help) onları yüklemez.
 """
 
 from pathlib import Path
+from typing import List, Optional
+import argparse
+import hashlib
 import re
 import json
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+from chunk_store import SUFFIX, ChunkStore, is_store
+from chunkers import profiling
+from dedup import duplicate_labels, duplicate_rate
 
 TESTS_DIR = Path("tests")
 OUT_DIR = Path("out")
 OUT_DIR.mkdir(exist_ok=True, parents=True)
 
+CACHE_PATH = OUT_DIR / "metrics_cache.json"
+CHUNK_PROFILE_PATH = OUT_DIR / "chunk_profile.json"
+# metrik hesaplarını değiştiren her düzenlemede artırın: eski cache kayıtları geçersiz olur
+METRICS_VERSION = 3
+
 CHUNK_SEP = re.compile(r"^=+\s*CHUNK\s+\d+\s*=+$", re.IGNORECASE | re.MULTILINE)
 
 # --- yardımcılar --------------------------------------------------------------
@@ -35,18 +59,46 @@ def read_chunks_from_txt(path: Path):
     chunks = [p.strip() for p in parts if p.strip()]
     return chunks
 
+def read_chunks(path: Path):
+    """Chunk deposu ya da .txt dosyasındaki chunk'lar (bağlam referanslı depoda bağlamıyla)."""
+    if is_store(path):
+        with ChunkStore(path) as store:
+            chunks = store if store.context is None else (store.expand(i) for i in range(len(store)))
+            return [ch.strip() for ch in chunks if ch.strip()]
+    return read_chunks_from_txt(path)
+
+def find_outputs(tests_dir: Path = TESTS_DIR):
+    """Puanlanacak çıktılar (isme göre sıralı); depo, aynı adlı .txt'nin yerine geçer."""
+    stores = {p.name[:-len(SUFFIX)]: p for p in tests_dir.glob(f"*{SUFFIX}") if is_store(p)}
+    txts = [p for p in tests_dir.glob("*.txt") if p.stem not in stores]
+    return sorted(list(stores.values()) + txts, key=lambda p: p.name)
+
 def sent_split(text: str):
     """Basit cümle bölücü (nltk yoksa iş görür)."""
     sents = re.split(r'(?<=[.!?])\s+(?=[A-ZİÖÜÇĞŞ])', text)
     sents = [s.strip() for s in sents if s.strip()]
     return sents if sents else [text.strip()]
 
-def tfidf_embeddings(texts):
-    """TF-IDF vektörleri (L2 normalize)."""
-    vec = TfidfVectorizer().fit_transform(texts)  # (n, d)
-    X = vec.toarray().astype("float32")
-    nrm = np.linalg.norm(X, axis=1, keepdims=True) + 1e-9
-    return X / nrm
+def fit_vectorizer(texts):
+    """
+    Ortak TF-IDF (ör. girdinin paragrafları üzerinde bir kez): metrik fonksiyonlarına
+    vectorizer= olarak verilince her yöntem aynı sözlük/IDF ile puanlanır ve skorlar
+    yöntemler arasında karşılaştırılabilir olur.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    return TfidfVectorizer().fit(texts)
+
+@profiling.profiled("tfidf")
+def tfidf_embeddings(texts, vectorizer=None):
+    """TF-IDF vektörleri (L2 normalize), seyrek CSR (n, d) float32 olarak."""
+    import scipy.sparse as sp
+    if vectorizer is None:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        X = TfidfVectorizer(dtype=np.float32).fit_transform(texts).tocsr()  # (n, d)
+    else:
+        X = vectorizer.transform(texts).astype(np.float32).tocsr()
+    nrm = np.sqrt(np.asarray(X.multiply(X).sum(axis=1), dtype=np.float64)).ravel() + 1e-9
+    return sp.diags((1.0 / nrm).astype(np.float32)) @ X
 
 def stats_lengths(chunks):
     if not chunks:
@@ -60,40 +112,93 @@ def stats_lengths(chunks):
         max=int(lens.max()),
     )
 
-def cohesion_score(chunks):
-    """Her chunk içindeki cümlelerin centroid'e cosine benzerliği ortalaması."""
+def _row_normalize(X):
+    import scipy.sparse as sp
+    nrm = np.sqrt(np.asarray(X.multiply(X).sum(axis=1))).ravel() + 1e-9
+    return sp.diags(1.0 / nrm) @ X
+
+def _per_chunk_tfidf(sents, owner, counts):
+    """
+    Her chunk'ın cümlelerine ayrı TfidfVectorizer fit'i ile aynı vektörler, tek
+    CountVectorizer fit'inden: IDF, terimin o chunk'taki cümle frekansından hesaplanır.
+    """
+    from sklearn.feature_extraction.text import CountVectorizer
+    C = CountVectorizer(dtype=np.float64).fit_transform(sents).tocsr()  # (S, d)
+    rows = np.repeat(np.arange(C.shape[0]), np.diff(C.indptr))
+    # her (chunk, terim) çifti için terimi içeren cümle sayısı (df)
+    keys = owner[rows].astype(np.int64) * C.shape[1] + C.indices
+    _, inv, df = np.unique(keys, return_inverse=True, return_counts=True)
+    m = counts[owner[rows]]
+    C.data = C.data * (np.log((1.0 + m) / (1.0 + df[inv.ravel()])) + 1.0)
+    return C
+
+@profiling.profiled("cohesion")
+def cohesion_score(chunks, per_chunk_idf: bool = False, vectorizer=None):
+    """
+    Her chunk içindeki cümlelerin centroid'e cosine benzerliği ortalaması.
+    Tüm cümleler bir kez bölünüp tek seferde vektörlenir; centroid ve benzerlikler
+    chunk kimliğine göre seyrek toplamalarla bulunur.
+    per_chunk_idf=True: her chunk'ın kendi IDF'i (eski, chunk başına fit semantiği).
+    vectorizer: fit_vectorizer() ile hazırlanmış ortak TF-IDF (cümleler sadece dönüştürülür).
+    """
     if not chunks:
         return 0.0
-    scores = []
-    for ch in chunks:
-        sents = sent_split(ch)
-        if len(sents) == 1:
-            scores.append(1.0)  # tek cümle -> tam uyum varsay
-            continue
-        E = tfidf_embeddings(sents)  # (m,d)
-        centroid = E.mean(0)
-        centroid = centroid / (np.linalg.norm(centroid) + 1e-9)
-        sims = E @ centroid
-        scores.append(float(np.mean(sims)))
-    return float(np.mean(scores)) if scores else 0.0
-
-def boundary_sharpness_score(chunks):
-    """Komşu chunk'lar arası 1 - cosine ortalaması (yüksekse sınırlar 'keskin')."""
+    with profiling.stage("sent_split"):
+        split = [sent_split(ch) for ch in chunks]
+    counts = np.array([len(ss) for ss in split], dtype=np.int64)
+    multi = np.flatnonzero(counts > 1)  # tek cümlelik chunk -> tam uyum (1.0) varsay
+    scores = np.ones(len(chunks), dtype=np.float64)
+    if len(multi):
+        import scipy.sparse as sp
+        sents = [s for i in multi for s in split[i]]
+        owner = np.repeat(np.arange(len(multi)), counts[multi])  # cümle -> chunk sırası
+        with profiling.stage("tfidf"):
+            if per_chunk_idf:
+                X = _per_chunk_tfidf(sents, owner, counts[multi])
+            elif vectorizer is not None:
+                X = vectorizer.transform(sents).tocsr()
+            else:
+                from sklearn.feature_extraction.text import TfidfVectorizer
+                X = TfidfVectorizer().fit_transform(sents).tocsr()
+        E = _row_normalize(X)  # (S, d)
+
+        # chunk başına ortalama (centroid) ve birim centroid'e cosine
+        P = sp.csr_matrix(
+            (1.0 / counts[owner], (owner, np.arange(len(sents)))),
+            shape=(len(multi), len(sents)),
+        )
+        centroids = _row_normalize(P @ E)
+        sims = np.asarray(E.multiply(centroids[owner]).sum(axis=1)).ravel()
+        scores[multi] = np.bincount(owner, weights=sims, minlength=len(multi)) / counts[multi]
+    return float(np.mean(scores))
+
+@profiling.profiled("boundary_sharpness")
+def boundary_sharpness_score(chunks, E=None):
+    """Komşu chunk'lar arası 1 - cosine ortalaması (yüksekse sınırlar 'keskin'). E: hazır tfidf_embeddings."""
     if len(chunks) < 2:
         return 0.0
-    E = tfidf_embeddings(chunks)  # (n,d)
-    sims = np.sum(E[:-1] * E[1:], axis=1)  # komşu cosine
+    E = tfidf_embeddings(chunks) if E is None else E  # (n,d) seyrek
+    sims = np.asarray(E[:-1].multiply(E[1:]).sum(axis=1)).ravel()  # komşu cosine, satır satır
     return float(np.mean(1.0 - sims))
 
-def redundancy_score(chunks):
-    """Tüm chunk'lar arası ortalama cosine (düşük daha iyi)."""
+@profiling.profiled("redundancy")
+def redundancy_score(chunks, E=None):
+    """
+    Tüm chunk'lar arası ortalama cosine (düşük daha iyi). E: hazır tfidf_embeddings.
+    n x n benzerlik matrisi kurulmaz: sum_{i!=j} e_i.e_j = |sum_i e_i|^2 - sum_i |e_i|^2
+    """
     n = len(chunks)
     if n < 2:
         return 0.0
-    E = tfidf_embeddings(chunks)  # (n,d)
-    S = E @ E.T                   # (n,n)
-    mask = ~np.eye(n, dtype=bool)
-    return float(np.mean(S[mask]))
+    E = (tfidf_embeddings(chunks) if E is None else E).astype(np.float64)  # (n,d) seyrek
+    total = np.asarray(E.sum(axis=0)).ravel()
+    diag = E.multiply(E).sum()
+    return float((total @ total - diag) / (n * (n - 1)))
+
+@profiling.profiled("duplicate_rate")
+def duplicate_rate_score(chunks):
+    """Yakın-kopya oranı (düşük daha iyi); n x n karşılaştırma yapılmaz (dedup.py)."""
+    return duplicate_rate(duplicate_labels(chunks)) if len(chunks) >= 2 else 0.0
 
 def score_aggregate(metrics, target_chars=900.0):
     """
@@ -107,31 +212,60 @@ def score_aggregate(metrics, target_chars=900.0):
     size_bonus = -abs(s["avg"] - target_chars) / target_chars
     return 0.45*cohesion + 0.30*boundary - 0.15*redundancy + 0.10*size_bonus
 
-# --- ana akış ----------------------------------------------------------------
+# --- metrik cache'i -----------------------------------------------------------
 
-def main():
-    results = {}
-    txt_files = sorted(TESTS_DIR.glob("*.txt"))
-    if not txt_files:
-        print("tests/ klasöründe .txt bulunamadı.")
-        return
+def _cache_key(path: Path, per_chunk_idf: bool) -> str:
+    """Dosya içeriği + metrik kodu sürümü + metrik ayarlarının hash'i."""
+    h = hashlib.sha256(f"v{METRICS_VERSION}|per_chunk_idf={int(per_chunk_idf)}|".encode())
+    files = [path / "text.bin", path / "offsets.npy"] if is_store(path) else [path]
+    if is_store(path) and (path / "context.npy").exists():
+        files.append(path / "context.npy")
+    for fp in files:
+        with fp.open("rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    return h.hexdigest()
 
-    for f in txt_files:
-        try:
-            chunks = read_chunks_from_txt(f)
-            m = {
-                "stats": stats_lengths(chunks),
-                "cohesion": cohesion_score(chunks),
-                "boundary_sharpness": boundary_sharpness_score(chunks),
-                "redundancy": redundancy_score(chunks),
-            }
-            m["score"] = score_aggregate(m)
-            results[f.name] = m
-        except Exception as e:
-            results[f.name] = {"error": str(e)}
+def load_cache(path: Path = CACHE_PATH) -> dict:
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def save_cache(cache: dict, path: Path = CACHE_PATH) -> None:
+    # yarım yazılmış cache kalmasın: önce geçici dosya, sonra yer değiştir
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(cache, ensure_ascii=False), encoding="utf-8")
+    tmp.replace(path)
 
+def file_metrics(path: Path, per_chunk_idf: bool = False) -> dict:
+    """Bir chunk dosyasının ham metrikleri (skor hariç)."""
+    with profiling.stage("read"):
+        chunks = read_chunks(path)
+    return chunk_metrics(chunks, per_chunk_idf=per_chunk_idf)
+
+def chunk_metrics(chunks: List[str], per_chunk_idf: bool = False, vectorizer=None) -> dict:
+    """
+    Bellekteki chunk listesinin ham metrikleri (skor hariç); dosya yazmadan puanlamak için.
+    vectorizer verilirse (fit_vectorizer) tüm metrikler o ortak TF-IDF ile hesaplanır.
+    """
+    # boundary ve redundancy aynı TF-IDF fit'ini paylaşır
+    E = tfidf_embeddings(chunks, vectorizer) if len(chunks) >= 2 else None
+    return {
+        "stats": stats_lengths(chunks),
+        "cohesion": cohesion_score(chunks, per_chunk_idf=per_chunk_idf, vectorizer=vectorizer),
+        "boundary_sharpness": boundary_sharpness_score(chunks, E),
+        "redundancy": redundancy_score(chunks, E),
+        "duplicate_rate": duplicate_rate_score(chunks),
+    }
+
+# --- rapor -------------------------------------------------------------------
+
+def write_reports(results: dict, out_dir: Path = OUT_DIR) -> None:
+    """out/report_metrics.json (ham metrikler) ve out/report_summary.md (skora göre sıralı tablo)."""
     # JSON kaydet
-    (OUT_DIR / "report_metrics.json").write_text(
+    (out_dir / "report_metrics.json").write_text(
         json.dumps(results, ensure_ascii=False, indent=2),
         encoding="utf-8"
     )
@@ -141,13 +275,14 @@ def main():
     ok_items.sort(key=lambda kv: kv[1]["score"], reverse=True)
 
     lines = ["# Chunking Değerlendirme Özeti\n"]
-    lines.append("| Dosya | Skor | #Chunks | AvgLen | Cohesion | Boundary | Redundancy |")
-    lines.append("|---|---:|---:|---:|---:|---:|---:|")
+    lines.append("| Dosya | Skor | #Chunks | AvgLen | Cohesion | Boundary | Redundancy | DupRate |")
+    lines.append("|---|---:|---:|---:|---:|---:|---:|---:|")
     for name, m in ok_items:
         s = m["stats"]
         lines.append(
             f"| {name} | {m['score']:.4f} | {s['num']} | {s['avg']:.0f} | "
-            f"{m['cohesion']:.3f} | {m['boundary_sharpness']:.3f} | {m['redundancy']:.3f} |"
+            f"{m['cohesion']:.3f} | {m['boundary_sharpness']:.3f} | {m['redundancy']:.3f} | "
+            f"{m.get('duplicate_rate', 0.0):.3f} |"
         )
     bad = [(k, v) for k, v in results.items() if "error" in v]
     if bad:
@@ -155,9 +290,73 @@ def main():
         for name, m in bad:
             lines.append(f"- **{name}** → {m['error']}")
 
-    (OUT_DIR / "report_summary.md").write_text("\n".join(lines), encoding="utf-8")
+    (out_dir / "report_summary.md").write_text("\n".join(lines), encoding="utf-8")
+
+# --- ana akış ----------------------------------------------------------------
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="tests/*.txt chunk çıktılarını puanlar.")
+    ap.add_argument("--per-chunk-idf", action="store_true",
+                    help="cohesion'da her chunk için ayrı IDF kullan (eski semantik, karşılaştırma için)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="metrik cache'ini kullanma; tüm dosyaları yeniden puanla")
+    ap.add_argument("--profile", action="store_true",
+                    help="aşama sürelerini rapora ekle (cache okunmaz, dosyalar yeniden puanlanır)")
+    ap.add_argument("--trace", type=Path, help="Chrome trace dosyası; --profile'ı da açar")
+    args = ap.parse_args(argv)
+    profile = args.profile or args.trace is not None
+    if profile:
+        profiling.enable(trace=args.trace is not None)
+        profiling.reset()
+
+    results = {}
+    outputs = find_outputs()
+    if not outputs:
+        print(f"tests/ klasöründe {SUFFIX} ya da .txt bulunamadı.")
+        return
+
+    cache = {} if args.no_cache or profile else load_cache()
+    new_cache = {}
+    reused = 0
+    for f in outputs:
+        try:
+            key = _cache_key(f, args.per_chunk_idf)
+            hit = cache.get(f.name)
+            if hit and hit.get("key") == key:
+                m = dict(hit["metrics"])
+                reused += 1
+            else:
+                with profiling.scope(f.name):
+                    m = file_metrics(f, per_chunk_idf=args.per_chunk_idf)
+            # hatalar cache'lenmez; bir sonraki çalıştırmada yeniden denenir
+            new_cache[f.name] = {"key": key, "metrics": dict(m)}
+            m["score"] = score_aggregate(m)
+            results[f.name] = m
+        except Exception as e:
+            results[f.name] = {"error": str(e)}
+
+    if not args.no_cache:
+        save_cache(new_cache)
+
+    if profile:
+        eval_prof = profiling.by_scope()
+        chunk_prof = {}
+        if CHUNK_PROFILE_PATH.exists():
+            chunk_prof = json.loads(CHUNK_PROFILE_PATH.read_text(encoding="utf-8"))
+        for f in outputs:
+            if "error" in results[f.name]:
+                continue
+            method = f.name[:-len(SUFFIX)] if f.name.endswith(SUFFIX) else f.stem
+            results[f.name]["profile"] = {
+                "evaluate": eval_prof.get(f.name),
+                "chunking": chunk_prof.get(method),
+            }
+        if args.trace is not None:
+            profiling.write_trace(str(args.trace))
+
+    write_reports(results)
 
-    print("✓ Bitti:")
+    print(f"✓ Bitti ({len(outputs) - reused} dosya puanlandı, {reused} cache'ten):")
     print(f"  - out/report_metrics.json")
     print(f"  - out/report_summary.md")
 
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+rag_dataset.json'u kayıt kayıt (streaming) okur.
+
+Dosya bir JSON dizisi: [ {"summary": ..., "qa_pairs": [{"question": ..., "answer": ...}, ...], ...}, ... ]
+Tüm dosyayı json.load ile belleğe almak yerine dizinin elemanları tek tek çözülür;
+her kayıttan metin alanları çıkarılır ve chunker'a JSON sözdizimi yerine düz metin verilir.
+"""
+
+from pathlib import Path
+from typing import Any, Iterator, Optional, Sequence, Tuple, Union
+import json
+import re
+
+# kayıtta doğrudan metin taşıyan alanlar (varsa bu sırayla alınır); rag_dataset.json'da pasaj "summary"dir
+TEXT_FIELDS = ("title", "summary", "context", "text", "content", "passage")
+
+_WS = " \t\r\n"
+_decoder = json.JSONDecoder()
+# değerden sonra tampon sonuna kadar yalnızca sayı karakterleri (boş dahil)
+_NUMBER_TAIL = re.compile(r"[0-9.eE+\-]*\Z")
+
+
+def iter_records(path: Union[str, Path], buffer_chars: int = 1 << 20) -> Iterator[Any]:
+    """
+    Üst düzey JSON dizisinin elemanlarını sırayla üretir; bellekte en fazla
+    bir kayıt + bir okuma tamponu tutulur. Elemanlar arasında tek ',' şarttır;
+    eksik/fazla virgül ValueError verir.
+    """
+    with open(path, encoding="utf-8") as f:
+        buf = f.read(buffer_chars)
+        eof = not buf
+        pos = 0
+
+        def more() -> bool:
+            nonlocal buf, pos, eof
+            if eof:
+                return False
+            piece = f.read(buffer_chars)
+            if not piece:
+                eof = True
+                return False
+            buf = buf[pos:] + piece
+            pos = 0
+            return True
+
+        def skip_ws() -> None:
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in _WS:
+                    pos += 1
+                if pos < len(buf) or not more():
+                    return
+
+        skip_ws()
+        if pos >= len(buf) or buf[pos] != "[":
+            raise ValueError(f"{path}: JSON dizisi bekleniyordu")
+        pos += 1
+        skip_ws()
+        if pos < len(buf) and buf[pos] == "]":
+            return
+
+        index = 0
+        while True:
+            skip_ws()
+            if pos >= len(buf):
+                raise ValueError(f"{path}: beklenmeyen dosya sonu")
+            if buf[pos] in ",]":
+                raise ValueError(f"{path}: {index}. elemanda değer bekleniyordu, {buf[pos]!r} bulundu")
+            while True:
+                try:
+                    rec, end = _decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    # kayıt tamponda bitmiyor: daha fazla okuyup yeniden dene
+                    if not more():
+                        raise
+                    continue
+                # tamponun sonuna kadar sürebilecek değer (sayı: "12", "12.", "1e") kesilmiş olabilir
+                if _NUMBER_TAIL.match(buf, end) and more():
+                    continue
+                break
+            pos = end
+            skip_ws()
+            if pos >= len(buf):
+                raise ValueError(f"{path}: beklenmeyen dosya sonu")
+            sep = buf[pos]
+            if sep not in ",]":
+                raise ValueError(f"{path}: {index}. elemandan sonra ',' ya da ']' bekleniyordu, {sep!r} bulundu")
+            pos += 1
+            yield rec
+            if sep == "]":
+                return
+            index += 1
+
+
+def record_id(rec: Any, index: int) -> str:
+    """Kaydın kimliği: 'id' alanı varsa o, yoksa dizideki sırası."""
+    if isinstance(rec, dict) and rec.get("id") is not None:
+        return str(rec["id"])
+    return str(index)
+
+
+def record_text(rec: Any, fields: Optional[Sequence[str]] = None) -> str:
+    """
+    Kayıttan chunk'lanacak düz metni çıkarır:
+      - fields (varsayılan TEXT_FIELDS) içindeki string alanlar, paragraf olarak
+      - ardından qa_pairs: her soru-cevap çifti ayrı bir paragraf (pasaj olsa da eklenir)
+    """
+    if isinstance(rec, str):
+        return rec
+    if not isinstance(rec, dict):
+        return ""
+
+    paras = [rec[k].strip() for k in (fields or TEXT_FIELDS) if isinstance(rec.get(k), str) and rec[k].strip()]
+    for qa in rec.get("qa_pairs") or []:
+        if not isinstance(qa, dict):
+            continue
+        q = str(qa.get("question") or "").strip()
+        a = str(qa.get("answer") or "").strip()
+        if q or a:
+            paras.append("\n".join(x for x in (q, a) if x))
+    return "\n\n".join(paras)
+
+
+def iter_record_texts(
+    path: Union[str, Path],
+    fields: Optional[Sequence[str]] = None,
+) -> Iterator[Tuple[str, str]]:
+    """(kayıt_id, metin) çiftleri; metni boş olan kayıtlar atlanır."""
+    for i, rec in enumerate(iter_records(path)):
+        text = record_text(rec, fields)
+        if text.strip():
+            yield record_id(rec, i), text
+
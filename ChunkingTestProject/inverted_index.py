@@ -0,0 +1,530 @@
+# -*- coding: utf-8 -*-
+"""
+Chunk çıktıları üzerinde diskte kalıcı, sıkıştırılmış ters indeks (BM25 top-k).
+
+    python inverted_index.py build tests/sentence_based.chunks          # -> tests/sentence_based.index
+    python inverted_index.py append tests/sentence_based.index yeni.chunks
+    python inverted_index.py query tests/sentence_based.index "Dallas nüfusu" -k 5
+    python inverted_index.py merge tests/sentence_based.index
+
+    tests/<method>.index/
+      meta.json           sürüm, BM25 parametreleri, chunk sayısı, toplam uzunluk, segmentler, kaynaklar
+      seg-00000/
+        terms.bin         sıralı terimlerin art arda UTF-8 baytları
+        term_offsets.npy  (V+1,) int64: terim t = terms.bin[off[t]:off[t+1]]
+        term_stats.npy    (V, 4) int64: df, ilk blok, max_tf, min_dl
+        block_last.npy    (B,) int64: bloğun son chunk id'si (segment içi)
+        block_off.npy     (B+1,) int64: bloğun postings.bin'deki bayt offset'i
+        postings.bin      terim başına BLOCK'luk bloklar; (id farkı, tf) çiftleri varint (LEB128)
+        doc_len.npy       (n,) int32: chunk başına terim sayısı
+
+Her şey mmap ile açılır; sorguda yalnızca sorgu terimlerinin blokları çözülür. Chunk id'leri
+indekse eklenme sırasıdır (build'de depodaki chunk sırası). append() yeni chunk'ları ayrı bir
+segment olarak ekler, merge() segmentleri tek segmentte birleştirir. idf ve ortalama uzunluk
+tüm segmentlerden hesaplanır; sonuçlar segment sayısından bağımsızdır.
+
+Top-k MaxScore tarzı erken sonlandırmayla bulunur: terimler üst sınırlarına göre (idf x en
+iyi tf/uzunluk) azalan sırada işlenir; kalan terimlerin üst sınır toplamı o ana kadarki k.
+skorun altına düşünce yeni aday alınmaz, kalan terimlerin sadece adayları içeren blokları
+çözülür ve k.'ya yetişemeyecek adaylar atılır. Sonuç tam BM25 top-k'dır.
+"""
+
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import argparse
+import json
+import math
+import mmap
+import os
+import re
+import shutil
+
+import numpy as np
+
+FORMAT_VERSION = 1
+SUFFIX = ".index"
+META = "meta.json"
+BLOCK = 128
+K1 = 1.2
+B = 0.75
+
+# Türkçe büyük/küçük harf: I -> ı, İ -> i (str.lower() İ'yi "i̇" yapar); şapkalı harfler sadeleşir.
+# str.translate yerine zincirli replace: C'de çalışır, büyük girdide belirgin şekilde hızlı
+_TR_UPPER = (("İ", "i"), ("I", "ı"))
+_TR_HAT = (("â", "a"), ("î", "i"), ("û", "u"))
+# kesme işaretinden sonraki ek terime katılmaz: İstanbul'da -> istanbul
+_TOKEN = re.compile(r"(\w+)(?:['’]\w+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """İndeks ve sorgu için ortak, Türkçe'ye duyarlı normalizasyon."""
+    for src, dst in _TR_UPPER:
+        text = text.replace(src, dst)
+    text = text.lower()
+    for src, dst in _TR_HAT:
+        text = text.replace(src, dst)
+    return _TOKEN.findall(text)
+
+
+# --- varint ---------------------------------------------------------------------
+
+def _encode_varints(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Negatif olmayan tamsayıları LEB128 ile kodlar; (bayt dizisi, değer başına bayt sayısı)."""
+    v = values.astype(np.uint64)
+    nbytes = np.ones(len(v), np.int64)
+    t = v >> np.uint64(7)
+    while t.any():
+        nbytes += t > 0
+        t >>= np.uint64(7)
+    pos = np.zeros(len(v), np.int64)
+    np.cumsum(nbytes[:-1], out=pos[1:])
+    out = np.empty(int(nbytes.sum()), np.uint8)
+    for j in range(int(nbytes.max()) if len(v) else 0):
+        m = nbytes > j
+        byte = (v[m] >> np.uint64(7 * j)) & np.uint64(0x7F)
+        cont = (nbytes[m] > j + 1).astype(np.uint64) << np.uint64(7)
+        out[pos[m] + j] = (byte | cont).astype(np.uint8)
+    return out, nbytes
+
+
+def _decode_varints(buf: np.ndarray) -> np.ndarray:
+    if not len(buf):
+        return np.zeros(0, np.int64)
+    ends = np.flatnonzero(buf < 0x80)
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    shift = (np.arange(len(buf)) - np.repeat(starts, ends - starts + 1)) * 7
+    vals = (buf & 0x7F).astype(np.int64) << shift
+    return np.add.reduceat(vals, starts)
+
+
+# --- segment --------------------------------------------------------------------
+
+def _write_segment(
+    path: Path,
+    terms: Sequence[str],
+    indptr: np.ndarray,
+    ids: np.ndarray,
+    tfs: np.ndarray,
+    doc_len: np.ndarray,
+) -> None:
+    """Terim-major postings'i (terimler sıralı, her terimde id'ler artan) segment olarak yazar."""
+    path.mkdir(parents=True)
+    encoded = [t.encode("utf-8") for t in terms]
+    (path / "terms.bin").write_bytes(b"".join(encoded))
+    term_off = np.zeros(len(encoded) + 1, np.int64)
+    np.cumsum([len(t) for t in encoded], out=term_off[1:])
+    np.save(path / "term_offsets.npy", term_off)
+
+    V = len(terms)
+    df = np.diff(indptr)
+    # terim içi id farkı; terimin ilk posting'i -1'e göre (fark >= 1)
+    prev = np.empty_like(ids)
+    prev[1:] = ids[:-1]
+    prev[indptr[:-1]] = -1
+    pairs = np.empty(2 * len(ids), np.int64)
+    pairs[0::2] = ids - prev
+    pairs[1::2] = tfs
+    data, nbytes = _encode_varints(pairs)
+    (path / "postings.bin").write_bytes(data.tobytes())
+
+    # bloklar: terim başına ceil(df / BLOCK)
+    nblocks = -(-df // BLOCK)
+    first_block = np.zeros(V, np.int64)
+    np.cumsum(nblocks[:-1], out=first_block[1:])
+    blk_term = np.repeat(np.arange(V), nblocks)
+    blk_start = indptr[blk_term] + (np.arange(len(blk_term)) - first_block[blk_term]) * BLOCK
+    blk_end = np.minimum(blk_start + BLOCK, indptr[blk_term + 1])
+    byte_pos = np.zeros(len(pairs) + 1, np.int64)
+    np.cumsum(nbytes, out=byte_pos[1:])
+    np.save(path / "block_last.npy", ids[blk_end - 1].astype(np.int64))
+    np.save(path / "block_off.npy", np.append(byte_pos[2 * blk_start], byte_pos[-1]))
+
+    stats = np.zeros((V, 4), np.int64)
+    stats[:, 0] = df
+    stats[:, 1] = first_block
+    if V:
+        # her terimin en az bir posting'i vardır
+        stats[:, 2] = np.maximum.reduceat(tfs, indptr[:-1])
+        stats[:, 3] = np.minimum.reduceat(doc_len[ids], indptr[:-1])
+    np.save(path / "term_stats.npy", stats)
+    np.save(path / "doc_len.npy", doc_len.astype(np.int32))
+
+
+def _count(chunks: Iterable[str]) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Chunk'ları sayar; (sıralı terimler, indptr, id'ler, tf'ler, chunk uzunlukları) terim-major."""
+    vocab: Dict[str, int] = {}
+    doc_of: List[int] = []
+    term_ids: List[int] = []
+    counts: List[int] = []
+    doc_len: List[int] = []
+    for i, ch in enumerate(chunks):
+        toks = tokenize(ch)
+        c = Counter(toks)
+        term_ids.extend(vocab.setdefault(t, len(vocab)) for t in c)
+        counts.extend(c.values())
+        doc_of.extend([i] * len(c))
+        doc_len.append(len(toks))
+    terms = sorted(vocab)
+    rank = np.empty(len(vocab), np.int64)
+    rank[[vocab[t] for t in terms]] = np.arange(len(terms))
+    t_arr = rank[np.asarray(term_ids, np.int64)]
+    d_arr = np.asarray(doc_of, np.int64)
+    order = np.lexsort((d_arr, t_arr))
+    indptr = np.zeros(len(terms) + 1, np.int64)
+    np.cumsum(np.bincount(t_arr, minlength=len(terms)), out=indptr[1:])
+    return terms, indptr, d_arr[order], np.asarray(counts, np.int64)[order], np.asarray(doc_len, np.int32)
+
+
+class _Segment:
+    def __init__(self, path: Path, base: int):
+        self.path = path
+        self.base = base
+        with (path / "terms.bin").open("rb") as f:
+            self._terms = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b""
+        with (path / "postings.bin").open("rb") as f:
+            self._post_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else None
+        self._post = np.frombuffer(self._post_map, np.uint8) if self._post_map is not None else np.zeros(0, np.uint8)
+        self.term_off = np.load(path / "term_offsets.npy", mmap_mode="r")
+        self.stats = np.load(path / "term_stats.npy", mmap_mode="r")
+        self.block_last = np.load(path / "block_last.npy", mmap_mode="r")
+        self.block_off = np.load(path / "block_off.npy", mmap_mode="r")
+        self.doc_len = np.load(path / "doc_len.npy", mmap_mode="r")
+
+    def __len__(self) -> int:
+        return len(self.doc_len)
+
+    def num_terms(self) -> int:
+        return len(self.term_off) - 1
+
+    def term(self, t: int) -> bytes:
+        return self._terms[int(self.term_off[t]):int(self.term_off[t + 1])]
+
+    def find(self, term: bytes) -> int:
+        """Terimin segmentteki sırası (sözlükte ikili arama); yoksa -1."""
+        lo, hi = 0, self.num_terms()
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.term(mid) < term:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < self.num_terms() and self.term(lo) == term else -1
+
+    def _blocks(self, t: int) -> Tuple[int, int, int]:
+        df, b0 = int(self.stats[t, 0]), int(self.stats[t, 1])
+        return df, b0, -(-df // BLOCK)
+
+    def postings(self, t: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Terimin tüm posting'leri: (segment içi id'ler, tf'ler)."""
+        df, b0, nb = self._blocks(t)
+        vals = _decode_varints(self._post[int(self.block_off[b0]):int(self.block_off[b0 + nb])])
+        return np.cumsum(vals[0::2]) - 1, vals[1::2]
+
+    def postings_for(self, t: int, cand: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Sadece cand (artan, segment içi id'ler) adaylarını içerebilecek blokların posting'leri."""
+        df, b0, nb = self._blocks(t)
+        js = np.unique(np.searchsorted(self.block_last[b0:b0 + nb], cand))
+        js = js[js < nb]
+        if not len(js):
+            return np.zeros(0, np.int64), np.zeros(0, np.int64)
+        if len(js) == nb:
+            return self.postings(t)
+        off = self.block_off
+        vals = _decode_varints(np.concatenate([self._post[int(off[b0 + j]):int(off[b0 + j + 1])] for j in js]))
+        d, tfs = vals[0::2], vals[1::2]
+        counts = np.minimum(BLOCK, df - js * BLOCK)
+        starts = np.zeros(len(js), np.int64)
+        np.cumsum(counts[:-1], out=starts[1:])
+        # blok başındaki fark önceki bloğun son id'sine göredir
+        prev = np.where(js > 0, np.asarray(self.block_last[b0:b0 + nb])[np.maximum(js - 1, 0)], -1)
+        cs = np.cumsum(d)
+        before = cs[starts] - d[starts]
+        return cs - np.repeat(before - prev, counts), tfs
+
+    def close(self) -> None:
+        if isinstance(self._terms, mmap.mmap):
+            self._terms.close()
+        self._post = None
+        if self._post_map is not None:
+            self._post_map.close()
+
+
+# --- indeks ---------------------------------------------------------------------
+
+class InvertedIndex:
+    """Segmentli, salt eklemeli BM25 indeksi; search() (id'ler, skorlar) döndürür."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.meta = json.loads((self.path / META).read_text(encoding="utf-8"))
+        if self.meta.get("format") != FORMAT_VERSION:
+            raise ValueError(f"{self.path}: desteklenmeyen indeks sürümü {self.meta.get('format')}")
+        self.k1 = float(self.meta["k1"])
+        self.b = float(self.meta["b"])
+        self.segments = [_Segment(self.path / s["name"], s["base"]) for s in self.meta["segments"]]
+
+    @classmethod
+    def build(
+        cls,
+        path: Union[str, Path],
+        chunks: Iterable[str],
+        source: Optional[str] = None,
+        k1: float = K1,
+        b: float = B,
+    ) -> "InvertedIndex":
+        """Yeni indeks kurar (varsa eskisinin yerine; yazım <path>.tmp altında yapılır)."""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        if tmp.exists():
+            shutil.rmtree(tmp)
+        tmp.mkdir(parents=True)
+        meta = {"format": FORMAT_VERSION, "k1": k1, "b": b, "num_chunks": 0, "total_len": 0,
+                "next_segment": 0, "segments": [], "sources": []}
+        _add_segment(tmp, meta, chunks, source)
+        if path.exists():
+            shutil.rmtree(path)
+        tmp.rename(path)
+        return cls(path)
+
+    def __len__(self) -> int:
+        return int(self.meta["num_chunks"])
+
+    @property
+    def nbytes(self) -> int:
+        return sum(p.stat().st_size for p in self.path.rglob("*") if p.is_file())
+
+    def append(self, chunks: Iterable[str], source: Optional[str] = None) -> int:
+        """Chunk'ları yeni bir segment olarak ekler; eklenen chunk sayısını döndürür."""
+        before = len(self)
+        meta = dict(self.meta)
+        meta["segments"] = list(meta["segments"])
+        meta["sources"] = list(meta["sources"])
+        _add_segment(self.path, meta, chunks, source)
+        _write_meta(self.path, meta)
+        self._reload()
+        return len(self) - before
+
+    def merge(self) -> None:
+        """Tüm segmentleri tek segmentte birleştirir (çok sayıda append sonrası sorgu hızı için)."""
+        if len(self.segments) <= 1:
+            return
+        index: Dict[bytes, int] = {}
+        parts = []
+        for seg in self.segments:
+            uids = np.array([index.setdefault(seg.term(t), len(index)) for t in range(seg.num_terms())], np.int64)
+            df = np.asarray(seg.stats[:, 0])
+            vals = _decode_varints(np.asarray(seg._post))
+            # terim içi farkları açmak için her terimin ilk farkından önceki toplam çıkarılır
+            d = vals[0::2]
+            cs = np.cumsum(d)
+            starts = np.zeros(len(df), np.int64)
+            np.cumsum(df[:-1], out=starts[1:])
+            before = np.repeat(cs[starts] - d[starts], df) if len(d) else cs
+            parts.append((np.repeat(uids, df), cs - before - 1 + seg.base, vals[1::2]))
+        terms_b = sorted(index)
+        rank = np.empty(len(index), np.int64)
+        rank[[index[t] for t in terms_b]] = np.arange(len(terms_b))
+        t_arr = rank[np.concatenate([p[0] for p in parts])]
+        ids = np.concatenate([p[1] for p in parts])
+        tfs = np.concatenate([p[2] for p in parts])
+        order = np.lexsort((ids, t_arr))
+        indptr = np.zeros(len(terms_b) + 1, np.int64)
+        np.cumsum(np.bincount(t_arr, minlength=len(terms_b)), out=indptr[1:])
+        doc_len = np.concatenate([np.asarray(s.doc_len) for s in self.segments])
+
+        meta = dict(self.meta)
+        name = f"seg-{meta['next_segment']:05d}"
+        _write_segment(self.path / name, [t.decode("utf-8") for t in terms_b], indptr,
+                       ids[order], tfs[order], doc_len)
+        old = [s["name"] for s in meta["segments"]]
+        meta["segments"] = [{"name": name, "base": 0, "num_chunks": len(doc_len)}]
+        meta["next_segment"] += 1
+        _write_meta(self.path, meta)
+        self._reload()
+        for o in old:
+            shutil.rmtree(self.path / o, ignore_errors=True)
+
+    def search(self, query: str, k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """BM25'e göre en iyi k chunk: (id'ler, skorlar), skora göre azalan; eşleşmeyenler dönmez."""
+        q = Counter(tokenize(query))
+        n = len(self)
+        if not q or not n or k <= 0:
+            return np.zeros(0, np.int64), np.zeros(0)
+        keys = [t.encode("utf-8") for t in q]
+        tids = [[seg.find(t) for t in keys] for seg in self.segments]
+        df = [sum(int(seg.stats[ts[j], 0]) for seg, ts in zip(self.segments, tids) if ts[j] >= 0)
+              for j in range(len(keys))]
+        weights = [qtf * math.log1p((n - d + 0.5) / (d + 0.5)) for qtf, d in zip(q.values(), df)]
+        avgdl = self.meta["total_len"] / n or 1.0
+
+        top_ids = np.zeros(0, np.int64)
+        top_scores = np.zeros(0)
+        theta = 0.0
+        for seg, ts in zip(self.segments, tids):
+            ids, scores = self._search_segment(seg, ts, weights, k, theta, avgdl)
+            top_ids = np.concatenate([top_ids, ids + seg.base])
+            top_scores = np.concatenate([top_scores, scores])
+            if len(top_scores) > k:
+                keep = np.argpartition(-top_scores, k - 1)[:k]
+                top_ids, top_scores = top_ids[keep], top_scores[keep]
+            if len(top_scores) >= k:
+                theta = float(top_scores.min())
+        order = np.lexsort((top_ids, -top_scores))
+        return top_ids[order], top_scores[order]
+
+    def _weight(self, seg: _Segment, ids: np.ndarray, tfs: np.ndarray, w: float, avgdl: float) -> np.ndarray:
+        k1, b = self.k1, self.b
+        tf = tfs.astype(np.float64)
+        return w * tf * (k1 + 1) / (tf + k1 * (1 - b + b * seg.doc_len[ids] / avgdl))
+
+    def _search_segment(self, seg: _Segment, tids: List[int], weights: List[float], k: int,
+                        theta: float, avgdl: float) -> Tuple[np.ndarray, np.ndarray]:
+        k1, b = self.k1, self.b
+        terms = []
+        for t, w in zip(tids, weights):
+            if t < 0:
+                continue
+            max_tf, min_dl = float(seg.stats[t, 2]), float(seg.stats[t, 3])
+            ub = w * max_tf * (k1 + 1) / (max_tf + k1 * (1 - b + b * min_dl / avgdl))
+            terms.append((ub, t, w))
+        terms.sort(reverse=True)
+        rest = [0.0] * (len(terms) + 1)
+        for i in range(len(terms) - 1, -1, -1):
+            rest[i] = rest[i + 1] + terms[i][0]
+
+        acc_ids = np.zeros(0, np.int64)
+        acc = np.zeros(0)
+        for i, (ub, t, w) in enumerate(terms):
+            if rest[i] < theta:
+                # yeni chunk'lar artık k.'ya yetişemez: yalnızca adaylar tamamlanır
+                alive = acc + rest[i] >= theta
+                acc_ids, acc = acc_ids[alive], acc[alive]
+                if not len(acc_ids):
+                    break
+                ids, tfs = seg.postings_for(t, acc_ids)
+                pos = np.searchsorted(ids, acc_ids)
+                pos_c = np.minimum(pos, max(len(ids) - 1, 0))
+                hit = (pos < len(ids)) & (ids[pos_c] == acc_ids) if len(ids) else np.zeros(len(acc_ids), bool)
+                acc[hit] += self._weight(seg, acc_ids[hit], tfs[pos_c[hit]], w, avgdl)
+            else:
+                ids, tfs = seg.postings(t)
+                all_ids = np.concatenate([acc_ids, ids])
+                all_w = np.concatenate([acc, self._weight(seg, ids, tfs, w, avgdl)])
+                acc_ids, inv = np.unique(all_ids, return_inverse=True)
+                acc = np.bincount(inv, weights=all_w, minlength=len(acc_ids))
+            if len(acc) >= k:
+                theta = max(theta, float(np.partition(acc, len(acc) - k)[len(acc) - k]))
+        if len(acc) > k:
+            keep = np.argpartition(-acc, k - 1)[:k]
+            acc_ids, acc = acc_ids[keep], acc[keep]
+        return acc_ids, acc
+
+    def source_of(self, i: int) -> Optional[Tuple[str, int]]:
+        """Chunk id'sinin (kaynak depo/dosya, kaynaktaki sırası); kaynak kaydedilmediyse None."""
+        for s in self.meta["sources"]:
+            if s["base"] <= i < s["base"] + s["num_chunks"]:
+                return (s["path"], i - s["base"]) if s["path"] else None
+        return None
+
+    def _reload(self) -> None:
+        self.close()
+        self.__init__(self.path)
+
+    def close(self) -> None:
+        for seg in self.segments:
+            seg.close()
+
+    def __enter__(self) -> "InvertedIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _add_segment(root: Path, meta: dict, chunks: Iterable[str], source: Optional[str]) -> None:
+    terms, indptr, ids, tfs, doc_len = _count(chunks)
+    base = meta["num_chunks"]
+    name = f"seg-{meta['next_segment']:05d}"
+    _write_segment(root / name, terms, indptr, ids, tfs, doc_len)
+    meta["segments"].append({"name": name, "base": base, "num_chunks": len(doc_len)})
+    meta["sources"].append({"path": source, "base": base, "num_chunks": len(doc_len)})
+    meta["next_segment"] += 1
+    meta["num_chunks"] = base + len(doc_len)
+    meta["total_len"] += int(doc_len.sum())
+    _write_meta(root, meta)
+
+
+def _write_meta(root: Path, meta: dict) -> None:
+    tmp = root / (META + ".tmp")
+    tmp.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, root / META)
+
+
+# --- komut satırı ---------------------------------------------------------------
+
+def source_chunks(path: Union[str, Path]) -> Iterator[str]:
+    """Depodaki chunk'lar depo sırasıyla (id = depodaki sıra; bağlam referanslı depoda çekirdek metin)."""
+    from chunk_store import ChunkStore, is_store
+    if is_store(path):
+        with ChunkStore(path) as store:
+            yield from store
+    else:
+        from evaluate_tests import read_chunks_from_txt
+        yield from read_chunks_from_txt(path)
+
+
+def index_path(source: Union[str, Path]) -> Path:
+    """tests/<method>.chunks ya da tests/<method>.txt -> tests/<method>.index"""
+    p = Path(source)
+    name = p.name[:-len(".chunks")] if p.name.endswith(".chunks") else p.stem
+    return p.with_name(name + SUFFIX)
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Chunk çıktıları için kalıcı BM25 ters indeksi.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("build", help="chunk deposundan (ya da .txt) indeks kur")
+    p.add_argument("source", type=Path)
+    p.add_argument("--out", type=Path, help=f"indeks klasörü (varsayılan: <method>{SUFFIX})")
+    p = sub.add_parser("append", help="indekse yeni chunk'ları ayrı segment olarak ekle")
+    p.add_argument("index", type=Path)
+    p.add_argument("source", type=Path)
+    p = sub.add_parser("merge", help="segmentleri birleştir")
+    p.add_argument("index", type=Path)
+    p = sub.add_parser("query", help="BM25 top-k sorgusu")
+    p.add_argument("index", type=Path)
+    p.add_argument("query")
+    p.add_argument("-k", type=int, default=10)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "build":
+        out = args.out or index_path(args.source)
+        with InvertedIndex.build(out, source_chunks(args.source), str(args.source)) as idx:
+            print(f"✓ {out}: {len(idx)} chunk, {len(idx.segments)} segment, {idx.nbytes / 1e6:.2f} MB")
+    elif args.cmd == "append":
+        with InvertedIndex(args.index) as idx:
+            n = idx.append(source_chunks(args.source), str(args.source))
+            print(f"✓ {n} chunk eklendi: toplam {len(idx)}, {len(idx.segments)} segment")
+    elif args.cmd == "merge":
+        with InvertedIndex(args.index) as idx:
+            idx.merge()
+            print(f"✓ {args.index}: {len(idx)} chunk, tek segment")
+    else:
+        from chunk_store import ChunkStore, is_store
+        with InvertedIndex(args.index) as idx:
+            ids, scores = idx.search(args.query, args.k)
+            for i, s in zip(ids, scores):
+                src = idx.source_of(int(i))
+                text, cid = "", None
+                if src is not None and is_store(src[0]):
+                    with ChunkStore(src[0]) as store:
+                        text = store[src[1]][:160].replace("\n", " ")
+                        cid = store.chunk_id(src[1])
+                print(f"{int(i):>8}  {s:8.3f}  {cid + '  ' if cid else ''}{text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,23 @@
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+import argparse
 import importlib
+import json
+import os
+from chunk_store import CHUNK_IDS, SUFFIX, TXT_HEADER, ChunkStore, ChunkStoreWriter, is_store
+from chunkers import profiling
+from chunkers.context_enriched import expand_refs
+from chunkers.document import Document
+from chunkers.sections import heading_offsets
+from dedup import Deduper
+from embedding_store import DTYPES as EMBED_DTYPES, EmbeddingWriter
+from ingest import iter_record_texts
+from inverted_index import InvertedIndex, index_path, source_chunks
+from manifest import MANIFEST, Manifest, Unit, chunker_fingerprint, file_units, record_units, section_units
 
 # hangi chunker dosyalarını çalıştıracağımız
 METHODS = [
@@ -15,24 +33,742 @@ METHODS = [
     "hybrid",
 ]
 
-def main():
-    # text oku
-    text = Path("data/rag_dataset.json").read_text(encoding="utf-8")
+# bölümleri birbirinden bağımsız chunk'layan yöntemler; bunlar başlık satırında shard'lanır
+SECTION_METHODS = {"agentic", "subdocument", "hybrid"}
+# --context-refs: komşu bağlamını kopyalamak yerine referans olarak yazabilen yöntemler (run_refs)
+REF_METHODS = {"context_enriched"}
+# --embed: chunk'lama sırasında kendi embedding'ini üreten yöntemler (run_embedded, model encoder'ıyla);
+# diğerlerinin chunk metinleri --encoder ile encode edilir (bkz. chunkers.embeddings.ENCODERS)
+EMBEDDED_METHODS = {"semantic"}
+ENCODER_NAMES = ["model", "hashing"]
 
-    tests_dir = Path("tests")
-    tests_dir.mkdir(exist_ok=True)
+# (dosya yolu, başlangıç, bitiş): bir dokümanın ya da onun bir parçasının (shard) adresi
+Shard = Tuple[str, int, int]
+TaskResult = Tuple[Optional[Iterable[str]], Optional[str]]
+# kayıt modu: (kayıt_id, metin) grupları
+RecordBatch = List[Tuple[str, str]]
+# artımlı mod: birim başına (metin, chunk'lanacak yöntemler)
+UnitItem = Tuple[str, List[str]]
+# artımlı modda bir grupta tutulan en fazla birim sayısı (chunk'lanacak metin batch_chars'ı da aşamaz)
+UNIT_BATCH = 4096
+# çıktı biçimleri: chunk deposu (tests/<method>.chunks), eski .txt, ikisi ya da hiçbiri (--evaluate ile)
+FORMATS = ["store", "txt", "both", "none"]
+# --profile: yöntem başına aşama süreleri
+PROFILE_PATH = Path("out/chunk_profile.json")
+
+@lru_cache(maxsize=2)
+def _read(path: str) -> str:
+    return Path(path).read_text(encoding="utf-8")
+
+@lru_cache(maxsize=8)
+def _load(path: str, start: int, end: int) -> Document:
+    """Shard'ın Document'ı; aynı süreçte aynı shard'ı işleyen yöntemler tokenizasyonu paylaşır."""
+    text = _read(path)
+    return Document(text if (start, end) == (0, len(text)) else text[start:end])
+
+def _shard_bounds(text: str, shard_chars: int, cuts: Optional[List[int]] = None) -> List[Tuple[int, int]]:
+    """
+    Metni ~shard_chars'lık, paragraf sınırında (boş satır) biten parçalara ayırır.
+    cuts verilirse (artan offset'ler, ör. başlık satırları) parçalar yalnızca bu offset'lerde kesilir.
+    """
+    n = len(text)
+    if shard_chars <= 0 or n <= shard_chars:
+        return [(0, n)]
+    bounds = []
+    start = 0
+    while start < n:
+        if cuts is None:
+            cut = text.find("\n\n", start + shard_chars)
+            nxt = cut + 2
+        else:
+            i = bisect_left(cuts, start + shard_chars)
+            cut = nxt = cuts[i] if i < len(cuts) else -1
+        if cut == -1:
+            bounds.append((start, n))
+            break
+        bounds.append((start, cut))
+        start = nxt
+    return bounds
+
+def _shards(paths: List[str], shard_chars: int, by_section: bool) -> List[Shard]:
+    """Girdilerin shard listesi; by_section=True iken bölümler shard'lar arasında bölünmez."""
+    out: List[Shard] = []
+    for path in paths:
+        text = _read(path)
+        cuts = heading_offsets(text) if by_section and shard_chars > 0 else None
+        out.extend((path, s, e) for s, e in _shard_bounds(text, shard_chars, cuts))
+    return out
+
+def _chunk_task(method: str, path: str, start: int, end: int, spans: bool = False,
+                refs: bool = False, encoder: Optional[str] = None) -> TaskResult:
+    """
+    Tek (yöntem, shard) işi; hata süreci düşürmez, mesaj olarak döner.
+    spans=True (tek süreç): ChunkSpans döner, chunk metinleri yazılırken üretilir.
+    refs=True: run_refs() çıktısı, (çekirdek, sol, sağ) üçlüleri döner.
+    encoder verilirse (--embed): (chunk'lar, chunk başına embedding'ler) döner.
+    """
+    try:
+        mod = importlib.import_module(f"chunkers.{method}")
+        with profiling.scope(method), profiling.stage("chunk"):
+            doc = _load(path, start, end)
+            if refs:
+                return mod.run_refs(doc), None
+            if encoder is not None:
+                from chunkers.embeddings import embed_chunks
+                return embed_chunks(mod, doc, encoder), None
+            return (mod.run_spans(doc) if spans else mod.run(doc)), None
+    except Exception as e:
+        return None, str(e)
 
-    for method in METHODS:
+def _record_batches(paths: List[str], batch_chars: int) -> Iterator[RecordBatch]:
+    """Kayıtları dosyalardan sırayla okuyup ~batch_chars'lık gruplar halinde verir."""
+    batch: RecordBatch = []
+    size = 0
+    for path in paths:
+        for rid, text in iter_record_texts(path):
+            batch.append((rid, text))
+            size += len(text)
+            if size >= batch_chars:
+                yield batch
+                batch, size = [], 0
+    if batch:
+        yield batch
+
+def _chunk_records_task(methods: List[str], batch: RecordBatch, refs: bool = False,
+                        encoder: Optional[str] = None) -> Dict[str, TaskResult]:
+    """
+    Bir kayıt grubunu tüm yöntemlerle chunk'lar; her kaydın Document'ı bir kez kurulur.
+    Sonuç yöntem başına [(kayıt_id, chunk'lar), ...] ya da hata mesajıdır.
+    refs=True iken REF_METHODS chunk'ları run_refs() üçlüleridir; encoder verilirse
+    chunk'lar yerine (chunk'lar, embedding'ler) çiftleri döner.
+    """
+    docs = [(rid, Document(text)) for rid, text in batch]
+    out: Dict[str, TaskResult] = {}
+    for method in methods:
+        rid = None
         try:
             mod = importlib.import_module(f"chunkers.{method}")
-            chunks = mod.run(text)
-            out_file = tests_dir / f"{method}.txt"
-            with out_file.open("w", encoding="utf-8") as f:
-                for i, ch in enumerate(chunks, 1):
-                    f.write(f"===== CHUNK {i} =====\n{ch}\n\n")
-            print(f"{method} → {len(chunks)} chunks kaydedildi: {out_file}")
+            run = mod.run_refs if refs and method in REF_METHODS else mod.run
+            if encoder is not None:
+                from chunkers.embeddings import embed_chunks
+                run = lambda doc: embed_chunks(mod, doc, encoder)  # noqa: E731
+            res = []
+            with profiling.scope(method), profiling.stage("chunk"):
+                for rid, doc in docs:
+                    res.append((rid, run(doc)))
+            out[method] = res, None
+        except Exception as e:
+            out[method] = None, (f"kayıt {rid}: {e}" if rid is not None else str(e))
+    return out
+
+def _chunk_units_task(items: List[UnitItem]) -> List[Dict[str, TaskResult]]:
+    """
+    Artımlı mod işi: her birim kendi Document'ıyla, istenen yöntemlerle chunk'lanır.
+    Sonuç birim başına {yöntem: (chunk'lar, hata)}.
+    """
+    out = []
+    for text, methods in items:
+        doc = Document(text)
+        res: Dict[str, TaskResult] = {}
+        for method in methods:
+            try:
+                mod = importlib.import_module(f"chunkers.{method}")
+                with profiling.scope(method), profiling.stage("chunk"):
+                    res[method] = list(mod.run(doc)), None
+            except Exception as e:
+                res[method] = None, str(e)
+        out.append(res)
+    return out
+
+class _ChunkOutput:
+    """Bir yöntemin çıktısı: chunk deposu ve/veya .txt (+ kayıt modunda .records.jsonl)."""
+
+    def __init__(self, tests_dir: Path, method: str, fmt: str, params: dict, records: bool = False,
+                 refs: bool = False, embed: Optional[str] = None, encoder: Optional[str] = None):
+        self.paths = []
+        self.store = None
+        self.txt = self.ids = None
+        self.emb = self.emb_report = None
+        if fmt in ("store", "both"):
+            self.store = ChunkStoreWriter(tests_dir / f"{method}{SUFFIX}", method, params,
+                                          context_sep=" " if refs else None)
+            if embed is not None:
+                self.emb = EmbeddingWriter(embed, "model" if method in EMBEDDED_METHODS else encoder)
+        if fmt in ("txt", "both"):
+            self.paths.append(tests_dir / f"{method}.txt")
+            self.txt = self.paths[-1].open("w", encoding="utf-8")
+            if records:
+                self.paths.append(tests_dir / f"{method}.records.jsonl")
+                self.ids = self.paths[-1].open("w", encoding="utf-8")
+        self.count = 0
+
+    @property
+    def target(self) -> Optional[Path]:
+        if self.store is not None:
+            return self.store.path
+        return self.paths[0] if self.paths else None
+
+    def summary(self) -> str:
+        if self.target is None:
+            return f"{self.count} chunks"
+        note = ""
+        if self.emb_report is not None:
+            r = self.emb_report
+            note = f" (embedding {self.emb.dtype}: {r['compression']:.1f}x, cos {r['cos_mean']:.4f})"
+        return f"{self.count} chunks kaydedildi: {self.target}{note}"
+
+    def add(self, chunk: str, rid: Optional[str] = None, context: Optional[tuple] = None) -> None:
+        self.count += 1
+        if self.store is not None:
+            self.store.add(chunk, rid, context)
+        if self.txt is not None:
+            self.txt.write(f"{TXT_HEADER.format(self.count)}\n{chunk}\n\n")
+        if self.ids is not None:
+            self.ids.write(json.dumps({"chunk": self.count, "record_id": rid}, ensure_ascii=False) + "\n")
+
+    def add_refs(self, chunks: Iterable[tuple], rid: Optional[str] = None) -> None:
+        """run_refs() çıktısı: komşu chunk'lar aynı doküman (shard/kayıt) içinde, ardışık sıradadır."""
+        base = self.count
+        for j, (core, left, right) in enumerate(chunks):
+            self.add(core, rid, (
+                base + j - 1 if left >= 0 else -1, left,
+                base + j + 1 if right >= 0 else -1, right,
+            ))
+
+    def add_embedded(self, chunks: List[str], vecs, rid: Optional[str] = None) -> None:
+        """--embed: chunk'lar ve satır satır hizalı embedding'leri."""
+        for ch in chunks:
+            self.add(ch, rid)
+        if self.emb is not None:
+            self.emb.add(vecs)
+
+    def add_range(self, store: ChunkStore, start: int, stop: int, rid: Optional[str] = None) -> None:
+        """Eski depodaki chunk'ları kopyalar (depo biçiminde baytlar çözülmez)."""
+        if self.txt is None and self.ids is None:
+            self.store.add_range(store, start, stop, rid)
+            self.count += stop - start
+            return
+        for i in range(start, stop):
+            self.add(store[i], rid)
+
+    def close(self, ok: bool = True) -> None:
+        for f in (self.txt, self.ids):
+            if f is not None:
+                f.close()
+        if self.store is not None:
+            if ok and self.emb is not None:
+                try:
+                    self.emb_report = self.emb.write(self.store)
+                except Exception:
+                    self.store.abort()
+                    raise
+            if ok:
+                self.store.close()
+            else:
+                self.store.abort()
+        if not ok:
+            for p in self.paths:
+                p.unlink(missing_ok=True)
+
+class _Evaluator:
+    """
+    --evaluate: her yöntemin chunk'ları tests/ üzerinden gidip gelmeden evaluate_tests
+    metrikleriyle puanlanır. Havuzla çalışırken bir yöntem puanlanırken worker'lar
+    sonraki yöntemleri chunk'lamaya devam eder.
+    """
+
+    def __init__(self, args):
+        import evaluate_tests  # sklearn yükü yalnızca --evaluate ile
+        self.et = evaluate_tests
+        self.paths = args.input
+        self.records = args.records
+        self.shared_idf = args.shared_idf
+        self._vectorizer = None
+        self.results: Dict[str, dict] = {}
+
+    def vectorizer(self):
+        """--shared-idf: girdinin paragraflarına bir kez fit edilen TF-IDF (ilk kullanımda)."""
+        if not self.shared_idf:
+            return None
+        if self._vectorizer is None:
+            with profiling.stage("fit_vectorizer"):
+                texts = (
+                    (t for path in self.paths for _, t in iter_record_texts(path)) if self.records
+                    else (_read(path) for path in self.paths)
+                )
+                self._vectorizer = self.et.fit_vectorizer(p for t in texts for p in Document(t).paragraphs())
+        return self._vectorizer
+
+    def add(self, method: str, chunks: List[str]) -> None:
+        try:
+            vec = self.vectorizer()
+            with profiling.scope(method), profiling.stage("evaluate"):
+                m = self.et.chunk_metrics(chunks, vectorizer=vec)
+            m["score"] = self.et.score_aggregate(m)
         except Exception as e:
-            print(f"{method} hata verdi: {e}")
+            m = {"error": str(e)}
+        self.results[method] = m
+
+    def error(self, method: str, msg: str) -> None:
+        self.results[method] = {"error": msg}
+
+    def write(self) -> None:
+        self.et.write_reports(self.results)
+        ranked = sorted(
+            (kv for kv in self.results.items() if "error" not in kv[1]),
+            key=lambda kv: kv[1]["score"], reverse=True,
+        )
+        for method, m in ranked:
+            print(f"  {method:<18} skor {m['score']:.4f}")
+        print("✓ out/report_metrics.json, out/report_summary.md")
+
+def _run_records(args, methods: List[str], workers: int, tests_dir: Path,
+                 evaluator: Optional[_Evaluator] = None) -> None:
+    """
+    Kayıt modu: girdiler JSON kayıt dizisidir; her kayıt ayrı doküman olarak chunk'lanır.
+    Her chunk'ın kayıt kimliği depoda (ya da .txt biçiminde aynı sırayla
+    tests/<method>.records.jsonl'da) tutulur.
+    """
+    params = {"input": args.input, "records": True, "dedup": args.dedup, "context_refs": args.context_refs,
+              "embed": args.embed}
+    refs = {m for m in methods if args.context_refs and m in REF_METHODS}
+    encoder = args.encoder if args.embed else None
+    outs = {
+        m: _ChunkOutput(tests_dir, m, args.format, params, records=True, refs=m in refs,
+                        embed=args.embed, encoder=args.encoder)
+        for m in methods
+    }
+    failed: Dict[str, str] = {}
+    kept: Dict[str, List[str]] = {m: [] for m in methods} if evaluator is not None else {}
+    dedupers = {m: Deduper(args.dedup) for m in methods} if args.dedup is not None else {}
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    def write(results: Dict[str, TaskResult]) -> None:
+        for m in methods:
+            if m in failed:
+                continue
+            per_record, err = results[m]
+            if err is not None:
+                failed[m] = err
+                continue
+            if m in refs:
+                for rid, chunks in per_record:
+                    outs[m].add_refs(chunks, rid)
+                    if evaluator is not None:
+                        kept[m].extend(expand_refs(chunks))
+                continue
+            if encoder is not None:
+                for rid, (chunks, vecs) in per_record:
+                    outs[m].add_embedded(chunks, vecs, rid)
+                    if evaluator is not None:
+                        kept[m].extend(chunks)
+                continue
+            flat = [(rid, ch) for rid, chunks in per_record for ch in chunks]
+            if m in dedupers:
+                mask = dedupers[m].keep_mask([ch for _, ch in flat])
+                flat = [rc for rc, keep in zip(flat, mask) if keep]
+            for rid, ch in flat:
+                outs[m].add(ch, rid)
+            if evaluator is not None:
+                kept[m].extend(ch for _, ch in flat)
+
+    try:
+        batches = _record_batches(args.input, args.batch_chars)
+        if pool is None:
+            for batch in batches:
+                write(_chunk_records_task(methods, batch, args.context_refs, encoder))
+        else:
+            # sıralı yazım için en eski grup beklenir; bellekte sınırlı sayıda grup tutulur
+            inflight: Deque[Future] = deque()
+            limit = 2 * workers
+            for batch in batches:
+                inflight.append(_submit(pool, _chunk_records_task, methods, batch, args.context_refs, encoder))
+                if len(inflight) >= limit:
+                    write(_records_result(inflight.popleft(), methods))
+            while inflight:
+                write(_records_result(inflight.popleft(), methods))
+    except Exception as e:
+        for m in methods:
+            failed.setdefault(m, str(e))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        for m in methods:
+            outs[m].close(ok=m not in failed)
+
+    for m in methods:
+        if m in failed:
+            print(f"{m} hata verdi: {failed[m]}")
+        else:
+            print(f"{m} → {outs[m].summary()}{_dedup_note(dedupers.get(m))}")
+        if evaluator is not None:
+            if m in failed:
+                evaluator.error(m, failed[m])
+            else:
+                evaluator.add(m, kept.pop(m))
+
+def _unit_stream(layout: str, paths: List[str]) -> Iterator[Tuple[Unit, str]]:
+    for path in paths:
+        if layout == "record":
+            yield from record_units(path)
+        elif layout == "section":
+            yield from section_units(path, _read(path))
+        else:
+            yield from file_units(path, _read(path))
+
+def _run_incremental(args, methods: List[str], workers: int, tests_dir: Path) -> None:
+    """
+    Artımlı mod (bkz. manifest.py): metni önceki çalıştırmadakiyle aynı olan birimlerin
+    chunk'ları eski depodan kopyalanır, yalnızca yeni ya da değişen birimler chunk'lanır.
+    Chunk sırası birimlerin girdi sırasıdır.
+    """
+    # birim düzeni: kayıt modunda kayıt; dosya modunda bölüm yöntemleri için bölüm, diğerleri için dosya
+    layouts: Dict[str, List[str]] = {}
+    for m in methods:
+        layout = "record" if args.records else ("section" if m in SECTION_METHODS else "file")
+        layouts.setdefault(layout, []).append(m)
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for layout, group in layouts.items():
+            _run_layout(args, layout, group, pool, 2 * workers, tests_dir)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+def _run_layout(args, layout: str, methods: List[str], pool: Optional[ProcessPoolExecutor],
+                limit: int, tests_dir: Path) -> None:
+    params = {"input": args.input, "records": args.records, "incremental": True}
+    olds: Dict[str, Tuple[ChunkStore, Manifest]] = {}
+    outs: Dict[str, _ChunkOutput] = {}
+    news: Dict[str, Manifest] = {}
+    for m in methods:
+        fp = chunker_fingerprint(m)
+        path = tests_dir / f"{m}{SUFFIX}"
+        if is_store(path):
+            store = ChunkStore(path)
+            old = Manifest.from_json(store.read_json(MANIFEST), m, fp)
+            if old is not None:
+                olds[m] = store, old
+            else:
+                store.close()
+        news[m] = Manifest(m, fp)
+    for m in methods:
+        outs[m] = _ChunkOutput(tests_dir, m, args.format, params, records=args.records)
+    failed: Dict[str, str] = {}
+    reused = dict.fromkeys(methods, 0)
+    total = 0
+    # birimler sırayla gruplanır; grup yazılırken kopyalanan ve yeni chunk'lanan birimler
+    # girdi sırasıyla çıktıya eklenir
+    Batch = List[Tuple[Unit, List[str]]]
+    pending: Deque[Tuple[Batch, List[Tuple[List[str], object]]]] = deque()
+
+    def write(batch: Batch, jobs: List[Tuple[List[str], object]]) -> None:
+        results: List[Dict[str, TaskResult]] = [{} for _ in batch]
+        need_idx = [i for i, (_, need) in enumerate(batch) if need]
+        for job_methods, job in jobs:
+            try:
+                res = _collect(job) if isinstance(job, Future) else job
+            except Exception as e:
+                res = [{m: (None, str(e)) for m in job_methods} for _ in need_idx]
+            for i, r in zip(need_idx, res):
+                results[i].update(r)
+        for (unit, need), res in zip(batch, results):
+            rid = unit.key if args.records else None
+            for m in methods:
+                if m in failed:
+                    continue
+                out = outs[m]
+                first = out.count
+                if m in need:
+                    chunks, err = res[m]
+                    if err is not None:
+                        failed[m] = f"{unit.key}: {err}"
+                        continue
+                    for ch in chunks:
+                        out.add(ch, rid)
+                else:
+                    store, old = olds[m]
+                    a, n = old.lookup(unit.hash)
+                    out.add_range(store, a, a + n, rid)
+                    reused[m] += 1
+                news[m].add(unit, first, out.count - first)
+
+    def flush(batch: Batch, texts: List[str]) -> None:
+        items = [(text, need) for (_, need), text in zip(batch, texts) if need]
+        jobs: List[Tuple[List[str], object]] = []
+        if items:
+            # tek büyük birim (dosya düzeni) yöntemlere bölünerek paralel çalıştırılır
+            split = pool is not None and layout == "file"
+            groups = [[m] for m in methods] if split else [methods]
+            for g in groups:
+                sub = [(text, [m for m in need if m in g]) for text, need in items]
+                if pool is not None:
+                    jobs.append((g, _submit(pool, _chunk_units_task, sub)))
+                else:
+                    jobs.append((g, _chunk_units_task(sub)))
+        pending.append((batch, jobs))
+        while len(pending) > limit:
+            write(*pending.popleft())
+
+    try:
+        batch: Batch = []
+        texts: List[str] = []
+        size = 0
+        for unit, text in _unit_stream(layout, args.input):
+            total += 1
+            need = [m for m in methods if m not in olds or olds[m][1].lookup(unit.hash) is None]
+            batch.append((unit, need))
+            texts.append(text if need else "")
+            size += len(text) if need else 0
+            if size >= args.batch_chars or len(batch) >= UNIT_BATCH:
+                flush(batch, texts)
+                batch, texts, size = [], [], 0
+        if batch:
+            flush(batch, texts)
+        while pending:
+            write(*pending.popleft())
+    except Exception as e:
+        for m in methods:
+            failed.setdefault(m, str(e))
+    finally:
+        for m in methods:
+            ok = m not in failed
+            if ok and outs[m].store is not None:
+                outs[m].store.write_json(MANIFEST, news[m].to_json())
+                outs[m].store.write_json(CHUNK_IDS, news[m].chunk_ids())
+            if m in olds:
+                olds[m][0].close()
+            outs[m].close(ok=ok)
+
+    for m in methods:
+        if m in failed:
+            print(f"{m} hata verdi: {failed[m]}")
+        else:
+            print(f"{m} → {outs[m].summary()} ({reused[m]}/{total} birim yeniden kullanıldı)")
+
+def _dedup_note(deduper: Optional[Deduper]) -> str:
+    if deduper is None:
+        return ""
+    return f" ({deduper.dropped}/{deduper.seen} yakın-kopya atıldı)"
+
+def _submit(pool: ProcessPoolExecutor, fn, *args) -> Future:
+    """Profil açıksa iş worker'da profilleyerek çalıştırılır (bkz. _collect)."""
+    if profiling.is_enabled():
+        return pool.submit(profiling.run_profiled, profiling.is_tracing(), fn, *args)
+    return pool.submit(fn, *args)
+
+def _collect(fut: Future):
+    """İşin sonucu; profil açıksa worker'ın aşama süreleri bu sürece eklenir."""
+    value = fut.result()
+    if not profiling.is_enabled():
+        return value
+    result, raw, events = value
+    profiling.merge(raw, events)
+    return result
+
+def _records_result(fut: Future, methods: List[str]) -> Dict[str, TaskResult]:
+    try:
+        return _collect(fut)
+    except Exception as e:
+        return {m: (None, str(e)) for m in methods}
+
+def _result(fut: Future) -> TaskResult:
+    # worker süreci çökerse (ör. BrokenProcessPool) de sadece o iş hatalı sayılır
+    try:
+        return _collect(fut)
+    except Exception as e:
+        return None, str(e)
+
+def _write_chunks(out: _ChunkOutput, parts: List[Iterable[str]], refs: bool = False,
+                  embedded: bool = False) -> int:
+    ok = False
+    try:
+        for chunks in parts:
+            if refs:
+                out.add_refs(chunks)
+                continue
+            if embedded:
+                out.add_embedded(*chunks)
+                continue
+            for ch in chunks:
+                out.add(ch)
+        ok = True
+    finally:
+        out.close(ok)
+    return out.count
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Chunker'ları çalıştırıp tests/ altına chunk çıktılarını yazar.")
+    ap.add_argument("--input", nargs="+", default=["data/rag_dataset.json"],
+                    help="girdi dosyaları (chunk'lar bu sırayla birleştirilir)")
+    ap.add_argument("--methods", nargs="+", default=METHODS, choices=METHODS)
+    ap.add_argument("--workers", type=int, default=1,
+                    help="süreç sayısı (1: tek süreç, 0: CPU sayısı kadar)")
+    ap.add_argument("--shard-chars", type=int, default=0,
+                    help="her dokümanı ~bu uzunlukta, paragraf sınırında biten parçalara böl (0: bölme)")
+    ap.add_argument("--records", action="store_true",
+                    help="girdileri JSON kayıt dizisi olarak oku; her kayıt ayrı chunk'lanır ve etiketlenir")
+    ap.add_argument("--batch-chars", type=int, default=1 << 20,
+                    help="kayıt modunda bir işe verilen toplam metin uzunluğu")
+    ap.add_argument("--format", choices=FORMATS, default="store",
+                    help="store: tests/<method>.chunks deposu, txt: '===== CHUNK n =====' metni, both: ikisi, "
+                         "none: diske yazma (--evaluate ile)")
+    ap.add_argument("--evaluate", action="store_true",
+                    help="chunk'ları diske gidip gelmeden bellekte puanla (evaluate_tests metrikleri, out/report_*)")
+    ap.add_argument("--shared-idf", action="store_true",
+                    help="--evaluate: TF-IDF'i girdinin paragraflarına bir kez fit et; skorlar yöntemler arası karşılaştırılabilir")
+    ap.add_argument("--profile", action="store_true",
+                    help=f"yöntem başına aşama sürelerini {PROFILE_PATH} dosyasına yaz")
+    ap.add_argument("--trace", type=Path,
+                    help="Chrome trace (chrome://tracing, Perfetto, speedscope) dosyası; --profile'ı da açar")
+    ap.add_argument("--incremental", action="store_true",
+                    help="önceki depodaki manifestoya göre yalnızca yeni/değişen kayıt ve bölümleri chunk'la "
+                         "(--shard-chars kullanılmaz)")
+    ap.add_argument("--dedup", type=float, metavar="JACCARD",
+                    help="tahmini Jaccard'ı bu eşiği geçen yakın-kopya chunk'ları at (MinHash/LSH, ör. 0.9)")
+    ap.add_argument("--index", action="store_true",
+                    help="her yöntemin deposu için tests/<method>.index BM25 ters indeksini kur (bkz. inverted_index.py)")
+    ap.add_argument("--embed", choices=EMBED_DTYPES,
+                    help="chunk başına embedding'leri bu biçimde nicemleyip depoya yaz (semantic: centroid'ler, "
+                         "diğerleri: --encoder; bkz. embedding_store.py)")
+    ap.add_argument("--encoder", choices=ENCODER_NAMES, default="model",
+                    help="--embed: chunk metinlerinin encoder'ı (model: sentence-transformers, hashing: bağımlılıksız)")
+    ap.add_argument("--context-refs", action="store_true",
+                    help="context_enriched: komşu cümleleri chunk'a kopyalama; depoya çekirdek chunk ve "
+                         "bağlam referansı yaz (ChunkStore.expand ile açılır; --format store)")
+    args = ap.parse_args(argv)
+    if args.dedup is not None and not 0.0 < args.dedup <= 1.0:
+        ap.error("--dedup eşiği (0, 1] aralığında olmalı")
+    if args.dedup is not None and args.incremental:
+        ap.error("--dedup --incremental ile kullanılamaz")
+    if args.incremental and args.format in ("txt", "none"):
+        ap.error("--incremental chunk deposu gerektirir (--format store ya da both)")
+    if args.index and args.format not in ("store", "both"):
+        ap.error("--index chunk deposu gerektirir (--format store ya da both)")
+    if args.format == "none" and not args.evaluate:
+        ap.error("--format none yalnızca --evaluate ile kullanılabilir")
+    if args.evaluate and args.incremental:
+        ap.error("--evaluate --incremental ile kullanılamaz; ardından evaluate_tests.py çalıştırın")
+    if args.shared_idf and not args.evaluate:
+        ap.error("--shared-idf yalnızca --evaluate ile kullanılabilir")
+    if args.context_refs and (args.format != "store" or args.dedup is not None or args.incremental):
+        ap.error("--context-refs yalnızca --format store ile, --dedup ve --incremental olmadan kullanılabilir")
+    if args.embed and (args.format not in ("store", "both") or args.dedup is not None or args.incremental
+                       or args.context_refs):
+        ap.error("--embed chunk deposu gerektirir; --dedup, --incremental ve --context-refs ile kullanılamaz")
+
+    tests_dir = Path("tests")
+    tests_dir.mkdir(exist_ok=True)
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+
+    if args.profile or args.trace:
+        profiling.enable(trace=args.trace is not None)
+        profiling.reset()
+    evaluator = _Evaluator(args) if args.evaluate else None
+    try:
+        if args.incremental:
+            _run_incremental(args, args.methods, workers, tests_dir)
+        elif args.records:
+            _run_records(args, args.methods, workers, tests_dir, evaluator)
+        else:
+            _run_files(args, args.methods, workers, tests_dir, evaluator)
+        if args.index:
+            _build_indexes(args.methods, tests_dir)
+        if evaluator is not None:
+            evaluator.write()
+    finally:
+        if profiling.is_enabled():
+            _write_profile(args.trace)
+
+def _build_indexes(methods: List[str], tests_dir: Path) -> None:
+    for m in methods:
+        store = tests_dir / f"{m}{SUFFIX}"
+        if not is_store(store):
+            continue
+        with profiling.scope(m), profiling.stage("index"):
+            idx = InvertedIndex.build(index_path(store), source_chunks(store), str(store))
+        print(f"{m} → indeks: {idx.path} ({len(idx)} chunk, {idx.nbytes / 1e6:.2f} MB)")
+        idx.close()
+
+def _write_profile(trace: Optional[Path]) -> None:
+    PROFILE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    PROFILE_PATH.write_text(json.dumps(profiling.by_scope(), ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"profil kaydedildi: {PROFILE_PATH}")
+    if trace is not None:
+        profiling.write_trace(str(trace))
+        print(f"trace kaydedildi: {trace}")
+
+def _run_files(args, methods: List[str], workers: int, tests_dir: Path,
+               evaluator: Optional[_Evaluator] = None) -> None:
+    """Girdi dosyalarını (gerekirse shard'lara bölerek) her yöntemle chunk'lar."""
+    # iş listesi: yöntem x shard; çıktı sırası her zaman (yöntem, girdi, shard) sırasıdır
+    # bölüm yöntemleri başlıkta kesilen shard'larla çalışır: bağımsız bölümler paralel
+    # chunk'lanır ve çıktı shard'sız çalıştırmayla aynı kalır
+    shards: Dict[bool, List[Shard]] = {}
+    for method in methods:
+        by_section = method in SECTION_METHODS
+        if by_section not in shards:
+            shards[by_section] = _shards(args.input, args.shard_chars, by_section)
+
+    encoder = args.encoder if args.embed else None
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    futures: Dict[str, List[Future]] = {}
+    if pool is not None:
+        for method in methods:
+            refs = args.context_refs and method in REF_METHODS
+            futures[method] = [
+                _submit(pool, _chunk_task, method, *sh, False, refs, encoder)
+                for sh in shards[method in SECTION_METHODS]
+            ]
+
+    try:
+        for method in methods:
+            refs = args.context_refs and method in REF_METHODS
+            if pool is not None:
+                results = [_result(fut) for fut in futures[method]]
+            else:
+                results = [
+                    _chunk_task(method, *sh, spans=encoder is None, refs=refs, encoder=encoder)
+                    for sh in shards[method in SECTION_METHODS]
+                ]
+
+            errors = [err for _, err in results if err is not None]
+            if errors:
+                print(f"{method} hata verdi: {errors[0]}")
+                if evaluator is not None:
+                    evaluator.error(method, errors[0])
+                continue
+            parts = [chunks for chunks, _ in results]
+            deduper = None
+            if args.dedup is not None:
+                deduper = Deduper(args.dedup)
+                parts = [deduper.filter_iter(ch for part in parts for ch in part)]
+            if evaluator is not None and not refs and encoder is None:
+                # ChunkSpans metinleri bir kez üretilir; hem yazım hem puanlama kullanır
+                parts = [[ch for part in parts for ch in part]]
+            try:
+                params = {"input": args.input, "shard_chars": args.shard_chars, "dedup": args.dedup,
+                          "context_refs": refs, "embed": args.embed}
+                out = _ChunkOutput(tests_dir, method, args.format, params, refs=refs,
+                                   embed=args.embed, encoder=encoder)
+                with profiling.scope(method), profiling.stage("write"):
+                    _write_chunks(out, parts, refs, embedded=encoder is not None)
+                print(f"{method} → {out.summary()}{_dedup_note(deduper)}")
+            except Exception as e:
+                print(f"{method} hata verdi: {e}")
+            if evaluator is not None:
+                # referanslı çıktı, puanlamada bağlamıyla açılır (metrikler run() çıktısıyla aynı)
+                if refs:
+                    texts = [ch for part in parts for ch in expand_refs(part)]
+                elif encoder is not None:
+                    texts = [ch for chunks, _ in parts for ch in chunks]
+                else:
+                    texts = parts[0]
+                evaluator.add(method, texts)
+    finally:
+        if pool is not None:
+            pool.shutdown()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
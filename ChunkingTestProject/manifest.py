@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Artımlı chunk'lama manifestosu.
+
+Girdi birimlere (unit) ayrılır ve her birimin metni parmak iziyle (hash) tutulur:
+  - kayıt modu: her kayıt bir birimdir (start/end = dosyadaki kayıt sırası)
+  - dosya modu, bölüm yöntemleri (agentic, subdocument, hybrid): her bölüm bir birimdir;
+    bölümler başlık satırında kesilir ve birbirinden bağımsız chunk'lanır
+  - dosya modu, diğer yöntemler: dosyanın tamamı tek birimdir
+
+Manifesto chunk deposunun içinde (tests/<method>.chunks/manifest.json) durur ve her birim
+için girdi aralığını, hash'ini ve depodaki chunk aralığını (first, count) saklar. Yöntemin
+kodu ya da cümle backend'i değişirse (fingerprint) manifesto geçersiz sayılır. Sonraki
+çalıştırmada hash'i manifestoda bulunan birimlerin chunk'ları eski depodan kopyalanır,
+yalnızca yeni ya da değişen birimler yeniden chunk'lanır.
+
+Chunk kimliği: "<birim hash'inin ilk 16 hanesi>-<birim içindeki sıra>"; metni değişmeyen
+birimin chunk'ları aynı kimliği korur. Kimlikler depo sırasıyla manifestonun yanına
+(chunk_ids.json) yazılır ve ChunkStore.chunk_id(i) ile okunur.
+"""
+
+from hashlib import blake2b, sha256
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from chunkers.sections import heading_offsets
+from chunkers.sentences import resolve_backend
+from ingest import iter_record_texts
+
+MANIFEST = "manifest.json"
+VERSION = 1
+
+CHUNKERS_DIR = Path(__file__).resolve().parent / "chunkers"
+
+
+class Unit(NamedTuple):
+    key: str   # kayıt kimliği ya da "<dosya>:<offset>"
+    path: str
+    start: int
+    end: int
+    hash: str
+
+
+def fingerprint(text: str) -> str:
+    return blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def chunker_fingerprint(method: str) -> str:
+    """Yöntemin çıktısını belirleyen her şey: chunkers/ kaynakları ve cümle backend'i."""
+    h = sha256(f"{VERSION}:{method}:{resolve_backend()}".encode())
+    for p in sorted(CHUNKERS_DIR.glob("*.py")):
+        h.update(p.name.encode())
+        h.update(p.read_bytes())
+    return h.hexdigest()
+
+
+def record_units(path: str) -> Iterator[Tuple[Unit, str]]:
+    """Kayıt modu birimleri: (birim, metin)."""
+    for i, (rid, text) in enumerate(iter_record_texts(path)):
+        yield Unit(rid, path, i, i + 1, fingerprint(text)), text
+
+
+def section_units(path: str, text: str) -> Iterator[Tuple[Unit, str]]:
+    """Dosyanın başlık satırlarında kesilen bölümleri; boş bölümler atlanır."""
+    bounds = [0] + [c for c in heading_offsets(text) if c > 0] + [len(text)]
+    for s, e in zip(bounds, bounds[1:]):
+        piece = text[s:e]
+        if piece.strip():
+            yield Unit(f"{path}:{s}", path, s, e, fingerprint(piece)), piece
+
+
+def file_units(path: str, text: str) -> Iterator[Tuple[Unit, str]]:
+    yield Unit(f"{path}:0", path, 0, len(text), fingerprint(text)), text
+
+
+class Manifest:
+    """Bir yöntemin birim -> chunk aralığı eşlemesi."""
+
+    def __init__(self, method: str, fingerprint: str, units: Optional[List[Dict[str, Any]]] = None):
+        self.method = method
+        self.fingerprint = fingerprint
+        self.units: List[Dict[str, Any]] = units or []
+        self._by_hash: Dict[str, Tuple[int, int]] = {}
+        for u in self.units:
+            self._by_hash.setdefault(u["hash"], (u["first"], u["count"]))
+
+    @classmethod
+    def from_json(cls, obj: Optional[Dict[str, Any]], method: str, fingerprint: str) -> Optional["Manifest"]:
+        """Depodan okunan manifesto; sürüm, yöntem ya da fingerprint tutmuyorsa None."""
+        if not obj or obj.get("version") != VERSION:
+            return None
+        if obj.get("method") != method or obj.get("fingerprint") != fingerprint:
+            return None
+        return cls(method, fingerprint, obj.get("units"))
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"version": VERSION, "method": self.method, "fingerprint": self.fingerprint, "units": self.units}
+
+    def lookup(self, unit_hash: str) -> Optional[Tuple[int, int]]:
+        """Aynı metinli birimin eski depodaki (first, count) chunk aralığı."""
+        return self._by_hash.get(unit_hash)
+
+    def add(self, unit: Unit, first: int, count: int) -> None:
+        self.units.append({
+            "key": unit.key, "path": unit.path, "start": unit.start, "end": unit.end,
+            "hash": unit.hash, "first": first, "count": count,
+        })
+
+    def chunk_ids(self) -> List[str]:
+        """Depo sırasıyla chunk kimlikleri; aynı metinli birimler tekrarlanırsa "~k" eki alır."""
+        seen: Dict[str, int] = {}
+        ids = []
+        for u in self.units:
+            h = u["hash"][:16]
+            k = seen.get(h, 0)
+            seen[h] = k + 1
+            base = h if k == 0 else f"{h}~{k}"
+            ids.extend(f"{base}-{j}" for j in range(u["count"]))
+        return ids
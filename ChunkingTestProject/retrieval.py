@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+Retrieval benchmark'ı: her chunker'ın çıktısını çevrimdışı bir sparse indekse (bellekte BM25
+ya da TF-IDF, ya da inverted_index.py'nin diskteki BM25 indeksi) koyar, veri setindeki
+qa_pairs sorularını çalıştırır ve gerçek retrieval kalitesini sunum maliyetiyle birlikte raporlar.
+
+    python retrieval.py
+    python retrieval.py --qa data/rag_dataset.json --backend bm25 tfidf inverted --k 1 5 10
+    python retrieval.py --max-questions 500
+
+bm25 ve inverted aynı BM25'tir: inverted_index.tokenize (Türkçe'ye duyarlı) ve aynı k1/b;
+satırları yalnızca sunum maliyetinde (bellek / disk, mmap) ayrılır.
+
+Bir soru için getirilen chunk, cevap metnini içeriyorsa (küçük harf, boşluklar tek) isabettir.
+Ölçülenler (çıktı x backend):
+  - recall@k: ilk k sonuçta isabet olan soruların oranı; mrr: ilk isabetin sırasının tersi (k_max'a kadar)
+  - answerable: cevabı herhangi bir chunk'ta geçen soruların oranı (recall'ın tavanı)
+  - build_s: indeks kurma süresi, index_mb: postings + sözlük boyutu
+  - p50_ms / p99_ms: tek sorgu gecikmesi (sorgu vektörleştirme dahil), qps
+
+Chunk'lar evaluate_tests gibi tests/ altındaki depo ve .txt çıktılarından okunur.
+Çıktı: out/retrieval.json ve out/retrieval_summary.md (recall@k_max'a göre sıralı).
+"""
+
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+import argparse
+import json
+import tempfile
+import time
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+
+from evaluate_tests import TESTS_DIR, find_outputs, read_chunks
+from ingest import iter_records
+from inverted_index import B, K1, InvertedIndex, tokenize
+
+OUT_DIR = Path("out")
+DEFAULT_QA = ["data/rag_dataset.json"]
+DEFAULT_K = [1, 5, 10]
+
+QA = Tuple[str, str]
+
+
+def load_qa(paths: Sequence[str]) -> List[QA]:
+    """Kayıtların qa_pairs alanındaki (soru, cevap) çiftleri; boş olanlar atlanır."""
+    out: List[QA] = []
+    for path in paths:
+        for rec in iter_records(path):
+            if not isinstance(rec, dict):
+                continue
+            for qa in rec.get("qa_pairs") or []:
+                if not isinstance(qa, dict):
+                    continue
+                q = str(qa.get("question") or "").strip()
+                a = str(qa.get("answer") or "").strip()
+                if q and a:
+                    out.append((q, a))
+    return out
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+# --- indeksler ------------------------------------------------------------------
+
+class SparseIndex:
+    """
+    Terim-major (ters) indeks: postings satır t = t teriminin geçtiği chunk'lar ve ağırlıkları.
+    Sorgu skoru = sorgu vektörü @ postings; yalnızca sorgu terimlerinin listeleri gezilir.
+    """
+
+    def __init__(self, vectorizer, postings: sparse.csr_matrix):
+        self.vectorizer = vectorizer
+        self.postings = postings
+
+    def __len__(self) -> int:
+        return self.postings.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        p = self.postings
+        vocab = sum(len(t.encode("utf-8")) for t in self.vectorizer.vocabulary_)
+        return p.data.nbytes + p.indices.nbytes + p.indptr.nbytes + vocab
+
+    def search(self, query: str, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """En yüksek skorlu k chunk (idler, skorlar), skora göre azalan; skoru 0 olanlar dönmez."""
+        scores = self.vectorizer.transform([query]) @ self.postings
+        ids, vals = scores.indices, scores.data
+        if len(vals) > k:
+            top = np.argpartition(-vals, k - 1)[:k]
+            ids, vals = ids[top], vals[top]
+        order = np.argsort(-vals, kind="stable")
+        return ids[order], vals[order]
+
+    def close(self) -> None:
+        pass
+
+
+def build_bm25(chunks: Sequence[str], k1: float = K1, b: float = B) -> SparseIndex:
+    """
+    Okapi BM25; terim ağırlıkları kurulumda hesaplanır, sorguda sadece toplanır.
+    Tokenizer ve k1/b inverted_index ile aynıdır (skorlar "inverted" backend'iyle aynı).
+    """
+    vec = CountVectorizer(tokenizer=tokenize, lowercase=False, token_pattern=None)
+    X = vec.fit_transform(chunks).tocsr().astype(np.float32)
+    n = X.shape[0]
+    dl = np.asarray(X.sum(axis=1)).ravel()
+    avgdl = float(dl.mean()) if n else 0.0
+    df = np.bincount(X.indices, minlength=X.shape[1])
+    idf = np.log1p((n - df + 0.5) / (df + 0.5)).astype(np.float32)
+    rows = np.repeat(np.arange(n), np.diff(X.indptr))
+    tf = X.data
+    norm = k1 * (1 - b + b * dl[rows] / avgdl) if avgdl else k1
+    X.data = idf[X.indices] * tf * (k1 + 1) / (tf + norm)
+    return SparseIndex(vec, X.T.tocsr())
+
+
+def build_tfidf(chunks: Sequence[str]) -> SparseIndex:
+    """TF-IDF + kosinüs (satırlar L2 normlu, sorgu da aynı vektörleştiriciyle)."""
+    vec = TfidfVectorizer(dtype=np.float32)
+    X = vec.fit_transform(chunks)
+    return SparseIndex(vec, X.T.tocsr())
+
+
+def build_inverted(chunks: Sequence[str], workdir: Path) -> InvertedIndex:
+    """Diskteki ters indeks (inverted_index.py) workdir altında; index_mb disk boyutudur."""
+    return InvertedIndex.build(workdir / "index", chunks)
+
+
+Index = Union[SparseIndex, InvertedIndex]
+
+# backend -> kurucu(chunk'lar, workdir); workdir evaluate()'in geçici klasörüdür,
+# yalnızca diskteki indeks kullanır
+BACKENDS: Dict[str, Callable[[Sequence[str], Path], Index]] = {
+    "bm25": lambda chunks, workdir: build_bm25(chunks),
+    "tfidf": lambda chunks, workdir: build_tfidf(chunks),
+    "inverted": build_inverted,
+}
+
+
+# --- ölçüm ----------------------------------------------------------------------
+
+def evaluate(chunks: List[str], qa: List[QA], backend: str, ks: Sequence[int]) -> dict:
+    """Tek çıktı x backend: indeksi geçici klasörde kurar, tüm soruları tek tek çalıştırır."""
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        index = BACKENDS[backend](chunks, Path(tmp))
+        build_s = time.perf_counter() - t0
+        try:
+            m = _score(index, chunks, qa, ks)
+            index_mb = index.nbytes / 1e6
+        finally:
+            # mmap'li dosyalar kapanmadan klasör silinemez (dosya kilitleyen platformlar)
+            index.close()
+    m.update({"build_s": build_s, "index_mb": index_mb})
+    return m
+
+
+def _score(index: Index, chunks: List[str], qa: List[QA], ks: Sequence[int]) -> dict:
+    """Soruları tek tek çalıştırır: recall@k, mrr, answerable ve gecikme."""
+    norm_chunks = [normalize(c) for c in chunks]
+    blob = "\x00".join(norm_chunks)
+    k_max = max(ks)
+    hits = np.zeros(len(ks))
+    rr = 0.0
+    answerable = 0
+    lat = np.empty(len(qa))
+    for qi, (question, answer) in enumerate(qa):
+        t0 = time.perf_counter()
+        ids, _ = index.search(question, k_max)
+        lat[qi] = time.perf_counter() - t0
+
+        ans = normalize(answer)
+        answerable += ans in blob
+        rank = next((r for r, i in enumerate(ids) if ans in norm_chunks[i]), None)
+        if rank is not None:
+            rr += 1.0 / (rank + 1)
+            hits += [rank < k for k in ks]
+
+    nq = max(len(qa), 1)
+    m = {f"recall@{k}": float(h) / nq for k, h in zip(ks, hits)}
+    m.update({
+        "mrr": rr / nq,
+        "answerable": answerable / nq,
+        "num_chunks": len(chunks),
+        "num_questions": len(qa),
+        "p50_ms": float(np.percentile(lat, 50) * 1e3) if len(qa) else 0.0,
+        "p99_ms": float(np.percentile(lat, 99) * 1e3) if len(qa) else 0.0,
+        "qps": len(qa) / float(lat.sum()) if len(qa) and lat.sum() > 0 else 0.0,
+    })
+    return m
+
+
+def write_reports(results: Dict[str, Dict[str, dict]], ks: Sequence[int], out_dir: Path = OUT_DIR) -> None:
+    """out/retrieval.json ve out/retrieval_summary.md (backend başına recall@k_max'a göre sıralı)."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / "retrieval.json").write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    k_max = max(ks)
+    rows = [(name, be, m) for name, per in results.items() for be, m in per.items() if "error" not in m]
+    rows.sort(key=lambda r: (r[1], -r[2][f"recall@{k_max}"], -r[2]["mrr"]))
+    lines = ["# Retrieval Benchmark Özeti\n"]
+    lines.append("| Dosya | Backend | " + " | ".join(f"R@{k}" for k in ks)
+                 + " | MRR | Answerable | #Chunks | Build s | Index MB | p50 ms | p99 ms | QPS |")
+    lines.append("|---|---|" + "---:|" * (len(ks) + 8))
+    for name, be, m in rows:
+        lines.append(
+            f"| {name} | {be} | " + " | ".join(f"{m[f'recall@{k}']:.3f}" for k in ks)
+            + f" | {m['mrr']:.3f} | {m['answerable']:.3f} | {m['num_chunks']} | {m['build_s']:.2f} | "
+              f"{m['index_mb']:.2f} | {m['p50_ms']:.2f} | {m['p99_ms']:.2f} | {m['qps']:.0f} |"
+        )
+    bad = [(name, be, m) for name, per in results.items() for be, m in per.items() if "error" in m]
+    if bad:
+        lines.append("\n## Hata Verenler")
+        for name, be, m in bad:
+            lines.append(f"- **{name}** ({be}) → {m['error']}")
+    (out_dir / "retrieval_summary.md").write_text("\n".join(lines), encoding="utf-8")
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Chunk çıktılarını qa_pairs soruları üzerinde retrieval ile ölçer.")
+    ap.add_argument("--qa", nargs="+", default=DEFAULT_QA, help="qa_pairs içeren JSON kayıt dizileri")
+    ap.add_argument("--tests-dir", type=Path, default=TESTS_DIR)
+    ap.add_argument("--backend", nargs="+", choices=list(BACKENDS), default=["bm25"])
+    ap.add_argument("--k", nargs="+", type=int, default=DEFAULT_K, help="recall@k için k değerleri")
+    ap.add_argument("--max-questions", type=int, default=0, help="yalnızca ilk N soruyu kullan (0: hepsi)")
+    args = ap.parse_args(argv)
+    if min(args.k) < 1:
+        ap.error("--k değerleri >= 1 olmalı")
+
+    qa = load_qa(args.qa)
+    if args.max_questions > 0:
+        qa = qa[:args.max_questions]
+    if not qa:
+        print(f"{', '.join(args.qa)} içinde qa_pairs bulunamadı.")
+        return
+    outputs = find_outputs(args.tests_dir)
+    if not outputs:
+        print(f"{args.tests_dir}/ klasöründe chunk çıktısı bulunamadı.")
+        return
+
+    ks = sorted(set(args.k))
+    results: Dict[str, Dict[str, dict]] = {}
+    for f in outputs:
+        per = results.setdefault(f.name, {})
+        try:
+            chunks = read_chunks(f)
+        except Exception as e:
+            per.update({be: {"error": str(e)} for be in args.backend})
+            continue
+        for be in args.backend:
+            try:
+                m = evaluate(chunks, qa, be, ks)
+                print(f"{f.name:<28} {be:<6} R@{ks[-1]} {m[f'recall@{ks[-1]}']:.3f}  MRR {m['mrr']:.3f}  "
+                      f"p50 {m['p50_ms']:.2f} ms")
+            except Exception as e:
+                m = {"error": str(e)}
+                print(f"{f.name} ({be}) hata verdi: {e}")
+            per[be] = m
+
+    write_reports(results, ks)
+    print(f"✓ {OUT_DIR / 'retrieval.json'}, {OUT_DIR / 'retrieval_summary.md'}")
+
+
+if __name__ == "__main__":
+    main()
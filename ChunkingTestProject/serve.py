@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+Sürekli çalışan chunk servisi: tokenizer'lar, chunker modülleri ve semantic modeli süreç
+boyunca sıcak kalır; her istek import/model yükleme maliyetini yeniden ödemez.
+
+    python serve.py --stdio                          # stdin'den JSONL istek, stdout'a JSONL cevap
+    python serve.py --http 127.0.0.1:8765 --workers 4
+    python serve.py --stdio --preload recursive semantic --batch 64 --batch-ms 2
+
+İstek:  {"id": 1, "method": "recursive", "params": {"max_chars": 800}, "text": "..."}
+Cevap:  {"id": 1, "chunks": ["...", ...], "ms": 1.8}   ya da   {"id": 1, "error": "..."}
+
+HTTP: POST /chunk gövdesi tek istek ya da istek listesi (cevap aynı biçimde), GET /health.
+stdio modunda cevaplar istek sırasıyla yazılır.
+
+Batching: kuyrukta bekleyen istekler (en fazla --batch, --batch-ms kadar beklenerek)
+tek iş olarak chunk'lanır; aynı metni farklı yöntemlerle isteyenler tek Document'ı
+(cümle/paragraf/bölüm bölmesini) paylaşır. --workers > 1 iken batch'ler süreç havuzuna
+dağıtılır; her worker başlarken --preload yöntemlerini kısa bir metinle ısıtır.
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import importlib
+import json
+import multiprocessing as mp
+import queue
+import sys
+import threading
+import time
+
+from chunkers.document import Document
+from main import METHODS
+
+Request = Dict[str, Any]
+Response = Dict[str, Any]
+
+# ısıtma metni: cümle, paragraf ve başlık yollarının hepsi bir kez çalışır
+WARM_TEXT = (
+    "1 Giriş\n\nBu kısa bir örnek metindir. Dr. Yılmaz 3.5 saat çalıştı! Sonuç iyi mi?\n\n"
+    "2 Yöntem\n\nİkinci paragraf da birkaç cümle içerir. Servis bu metinle ısınır."
+)
+
+
+def warm(methods: List[str]) -> None:
+    """Yöntem modüllerini import edip kısa bir metinle bir kez çalıştırır (tokenizer, model yüklenir)."""
+    for method in methods:
+        try:
+            importlib.import_module(f"chunkers.{method}").run(Document(WARM_TEXT))
+        except Exception as e:
+            print(f"{method} ısıtılamadı: {e}", file=sys.stderr)
+
+
+def _error(req: Any, msg: str) -> Response:
+    return {"id": req.get("id") if isinstance(req, dict) else None, "error": msg}
+
+
+def chunk_batch(reqs: List[Request]) -> List[Response]:
+    """İstekleri sırayla chunk'lar; hata yalnızca ilgili isteğin cevabına yazılır."""
+    docs: Dict[str, Document] = {}
+    out: List[Response] = []
+    for req in reqs:
+        if not isinstance(req, dict):
+            out.append(_error(req, "istek bir JSON nesnesi olmalı"))
+            continue
+        method, text, params = req.get("method"), req.get("text"), req.get("params") or {}
+        if method not in METHODS:
+            out.append(_error(req, f"bilinmeyen yöntem: {method!r} (seçenekler: {', '.join(METHODS)})"))
+            continue
+        if not isinstance(text, str):
+            out.append(_error(req, "'text' alanı metin olmalı"))
+            continue
+        if not isinstance(params, dict):
+            out.append(_error(req, "'params' alanı nesne olmalı"))
+            continue
+        t0 = time.perf_counter()
+        try:
+            doc = docs.get(text)
+            if doc is None:
+                doc = docs[text] = Document(text)
+            chunks = importlib.import_module(f"chunkers.{method}").run(doc, **params)
+        except Exception as e:
+            out.append(_error(req, f"{type(e).__name__}: {e}"))
+            continue
+        out.append({"id": req.get("id"), "chunks": list(chunks), "ms": (time.perf_counter() - t0) * 1e3})
+    return out
+
+
+class Batcher:
+    """
+    İstek kuyruğu: arka plan iş parçacığı bekleyen istekleri batch'ler ve havuz yoksa kendisi,
+    varsa havuz üzerinden chunk'lar. submit() cevabın Future'ını döndürür.
+    """
+
+    def __init__(self, pool: Optional[ProcessPoolExecutor], batch_size: int, batch_ms: float):
+        self.pool = pool
+        self.batch_size = max(1, batch_size)
+        self.batch_s = max(0.0, batch_ms) / 1e3
+        self.q: "queue.Queue[Optional[Tuple[Request, Future]]]" = queue.Queue()
+        self.thread = threading.Thread(target=self._loop, name="batcher", daemon=True)
+        self.thread.start()
+
+    def submit(self, req: Request) -> Future:
+        fut: Future = Future()
+        self.q.put((req, fut))
+        return fut
+
+    def close(self) -> None:
+        self.q.put(None)
+        self.thread.join()
+
+    def _loop(self) -> None:
+        stop = False
+        while not stop:
+            item = self.q.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.batch_s
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.q.get(timeout=max(0.0, deadline - time.monotonic())) \
+                        if self.batch_s else self.q.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Tuple[Request, Future]]) -> None:
+        reqs = [r for r, _ in batch]
+        futs = [f for _, f in batch]
+
+        def deliver(results: List[Response]) -> None:
+            for f, r in zip(futs, results):
+                f.set_result(r)
+
+        if self.pool is None:
+            deliver(chunk_batch(reqs))
+            return
+
+        def done(pf: Future) -> None:
+            # worker çökerse (ör. BrokenProcessPool) batch'teki her istek hata cevabı alır
+            try:
+                deliver(pf.result())
+            except Exception as e:
+                deliver([_error(r, f"{type(e).__name__}: {e}") for r in reqs])
+
+        try:
+            self.pool.submit(chunk_batch, reqs).add_done_callback(done)
+        except Exception as e:
+            deliver([_error(r, f"{type(e).__name__}: {e}") for r in reqs])
+
+
+def _decode(line: str) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return e
+
+
+def serve_stdio(batcher: Batcher, inp=None, out=None) -> None:
+    """Satır başına bir istek; cevaplar istek sırasıyla, her biri hemen flush edilerek yazılır."""
+    inp = inp or sys.stdin
+    out = out or sys.stdout
+    pending: "queue.Queue[Optional[Future]]" = queue.Queue()
+
+    def writer() -> None:
+        while True:
+            fut = pending.get()
+            if fut is None:
+                return
+            out.write(json.dumps(fut.result(), ensure_ascii=False) + "\n")
+            out.flush()
+
+    w = threading.Thread(target=writer, name="writer", daemon=True)
+    w.start()
+    for line in inp:
+        if not line.strip():
+            continue
+        req = _decode(line)
+        if isinstance(req, Exception):
+            fut: Future = Future()
+            fut.set_result(_error(None, f"geçersiz JSON: {req}"))
+        else:
+            fut = batcher.submit(req)
+        pending.put(fut)
+    pending.put(None)
+    w.join()
+
+
+def make_http_server(batcher: Batcher, host: str, port: int) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, code: int, body: Any) -> None:
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:
+            if self.path == "/health":
+                self._send(200, {"ok": True, "methods": METHODS})
+            else:
+                self._send(404, {"error": "bulunamadı"})
+
+        def do_POST(self) -> None:
+            if self.path != "/chunk":
+                self._send(404, {"error": "bulunamadı"})
+                return
+            body = _decode(self.rfile.read(int(self.headers.get("Content-Length") or 0)).decode("utf-8"))
+            if isinstance(body, Exception):
+                self._send(400, {"error": f"geçersiz JSON: {body}"})
+                return
+            futs = [batcher.submit(r) for r in (body if isinstance(body, list) else [body])]
+            results = [f.result() for f in futs]
+            self._send(200, results if isinstance(body, list) else results[0])
+
+        def log_message(self, format: str, *args) -> None:  # erişim kaydı stdout'u kirletmesin
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Sıcak tutulan chunker'larla JSONL/HTTP chunk servisi.")
+    mode = ap.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--stdio", action="store_true", help="stdin/stdout üzerinden JSONL")
+    mode.add_argument("--http", metavar="HOST:PORT", help="yerel HTTP sunucusu (POST /chunk, GET /health)")
+    ap.add_argument("--workers", type=int, default=1, help="süreç havuzu boyutu (1: servis sürecinde)")
+    ap.add_argument("--batch", type=int, default=32, help="bir işte chunk'lanan en fazla istek")
+    ap.add_argument("--batch-ms", type=float, default=0.0,
+                    help="batch'i doldurmak için beklenecek en fazla süre (0: yalnızca bekleyenler)")
+    ap.add_argument("--preload", nargs="*", choices=METHODS, default=[m for m in METHODS if m != "semantic"],
+                    help="başlangıçta ısıtılacak yöntemler (semantic model yükler; varsayılanda yok)")
+    args = ap.parse_args(argv)
+    if args.http:
+        host, _, port = args.http.rpartition(":")
+        if not port.isdigit():
+            ap.error("--http HOST:PORT biçiminde olmalı")
+
+    t0 = time.perf_counter()
+    warm(args.preload)
+    pool = None
+    if args.workers > 1:
+        # spawn: worker'lar iş parçacıkları (batcher, HTTP) çalışırken fork edilmesin
+        pool = ProcessPoolExecutor(max_workers=args.workers, mp_context=mp.get_context("spawn"),
+                                   initializer=warm, initargs=(args.preload,))
+        # worker'lar ilk istekte değil şimdi başlayıp ısınsın
+        for f in [pool.submit(time.sleep, 0) for _ in range(args.workers)]:
+            f.result()
+    batcher = Batcher(pool, args.batch, args.batch_ms)
+    print(f"hazır ({(time.perf_counter() - t0) * 1e3:.0f} ms, {args.workers} worker)", file=sys.stderr)
+    try:
+        if args.stdio:
+            serve_stdio(batcher)
+        else:
+            server = make_http_server(batcher, host or "127.0.0.1", int(port))
+            print(f"dinleniyor: http://{host or '127.0.0.1'}:{port}", file=sys.stderr)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                server.server_close()
+    finally:
+        batcher.close()
+        if pool is not None:
+            pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
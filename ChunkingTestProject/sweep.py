@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+Parametre taraması: chunker parametrelerini grid ya da rastgele aramayla dener ve her
+konfigürasyonun chunk'larını diske yazmadan evaluate_tests metrikleriyle puanlar.
+
+    python sweep.py --methods sentence_based agentic
+    python sweep.py --methods sliding_window --param window=4,6,8,10 --param stride=2:6:2
+    python sweep.py --methods recursive --samples 200 --param max_chars=800:2000 --seed 1
+
+--param K=V1,V2,...  değer listesi; K=LO:HI[:STEP] aralık (grid'de STEP gerekir, rastgele
+aramada STEP yoksa aralıktan düzgün örneklenir). Verilmeyen parametreler SPACES'teki
+varsayılan listelerden gelir. Her yöntemin varsayılan ayarı da her zaman denenir.
+
+Girdi dokümanları bir kez okunup tokenize edilir; fork ile başlayan worker'lar ana
+süreçteki Document'ları devralır (spawn'da her worker bir kez kurar), tüm konfigürasyonlar
+aynı Document'ı kullanır. Konfigürasyonlar süreç havuzunda çalışır.
+
+Çıktı: out/sweep.json (skora göre sıralı sonuçlar) ve out/sweep_summary.md (leaderboard).
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+import argparse
+import importlib
+import inspect
+import json
+import os
+import random
+import time
+
+from chunkers.document import Document
+from evaluate_tests import chunk_metrics, score_aggregate
+from main import METHODS
+
+OUT_PATH = Path("out/sweep.json")
+SUMMARY_PATH = Path("out/sweep_summary.md")
+
+# yöntem başına varsayılan arama uzayı
+SPACES: Dict[str, Dict[str, List[Any]]] = {
+    "fixed_length": {"chunk_chars": [400, 600, 800, 1000, 1200], "overlap_chars": [0, 50, 100, 200]},
+    "sentence_based": {"target_chars": [500, 700, 900, 1100, 1300], "overlap_sent": [0, 1, 2]},
+    "paragraph_based": {"target_chars": [500, 700, 900, 1100, 1300]},
+    "sliding_window": {"window": [4, 6, 8, 10], "stride": [2, 3, 4], "max_chars": [700, 900, 1200]},
+    "semantic": {"target_chars": [700, 900, 1100], "sim_th": [0.15, 0.25, 0.35]},
+    "recursive": {"max_chars": [900, 1200, 1500], "min_chars": [200, 400, 600], "overlap_sent": [0, 1]},
+    "context_enriched": {"target_chars": [700, 900, 1100], "overlap_sent": [0, 1], "side_ctx": [0, 1, 2]},
+    "agentic": {"target_chars": [500, 700, 900, 1100, 1300], "overlap_sent": [0, 1]},
+    "subdocument": {"target_chars": [500, 700, 900, 1100, 1300], "overlap_sent": [0, 1]},
+    "hybrid": {"target_chars": [700, 900, 1100], "window": [4, 6, 8], "stride": [2, 3, 4]},
+}
+
+
+class Range(NamedTuple):
+    lo: Union[int, float]
+    hi: Union[int, float]
+    step: Optional[Union[int, float]] = None
+
+    def values(self) -> List[Union[int, float]]:
+        if self.step is None:
+            raise ValueError(f"grid için aralıkta adım gerekli: {self.lo}:{self.hi}:ADIM")
+        out, v = [], self.lo
+        while v <= self.hi + 1e-9:
+            out.append(round(v, 6) if isinstance(v, float) else v)
+            v += self.step
+        return out
+
+    def sample(self, rng: random.Random) -> Union[int, float]:
+        if self.step is not None:
+            return rng.choice(self.values())
+        if isinstance(self.lo, int) and isinstance(self.hi, int):
+            return rng.randint(self.lo, self.hi)
+        return round(rng.uniform(self.lo, self.hi), 4)
+
+
+Spec = Union[List[Any], Range]
+
+
+def _value(s: str) -> Any:
+    try:
+        return json.loads(s)
+    except ValueError:
+        return s
+
+
+def parse_param(s: str) -> Tuple[str, Spec]:
+    """'k=v1,v2' -> (k, [v1, v2]); 'k=lo:hi[:step]' -> (k, Range)."""
+    k, sep, v = s.partition("=")
+    if not sep or not k.strip() or not v.strip():
+        raise argparse.ArgumentTypeError(f"geçersiz parametre: {s} (K=V1,V2 ya da K=LO:HI[:ADIM])")
+    if ":" in v:
+        parts = [_value(p) for p in v.split(":")]
+        if len(parts) not in (2, 3) or not all(isinstance(p, (int, float)) for p in parts):
+            raise argparse.ArgumentTypeError(f"geçersiz aralık: {v}")
+        return k.strip(), Range(*parts)
+    return k.strip(), [_value(p) for p in v.split(",")]
+
+
+def run_params(method: str) -> Dict[str, Any]:
+    """run()'ın metin dışındaki (taranabilir) parametreleri ve varsayılanları."""
+    mod = importlib.import_module(f"chunkers.{method}")
+    params = list(inspect.signature(mod.run).parameters.values())[1:]
+    return {p.name: p.default for p in params if isinstance(p.default, (int, float))}
+
+
+def valid(method: str, params: Dict[str, Any]) -> bool:
+    """Anlamsız kombinasyonları eler (örtüşme >= pencere, min >= max)."""
+    if params.get("overlap_chars", 0) >= params.get("chunk_chars", float("inf")):
+        return False
+    if params.get("stride", 0) > params.get("window", float("inf")):
+        return False
+    if params.get("min_chars", 0) >= params.get("max_chars", float("inf")):
+        return False
+    return True
+
+
+def configs(
+    method: str,
+    overrides: Dict[str, Spec],
+    samples: int = 0,
+    rng: Optional[random.Random] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Yöntemin konfigürasyonları (tam parametre sözlükleri, tekrarsız): önce varsayılan ayar,
+    sonra grid (samples=0) ya da samples adet rastgele örnek.
+    """
+    defaults = run_params(method)
+    space: Dict[str, Spec] = {k: v for k, v in SPACES.get(method, {}).items() if k in defaults}
+    space.update({k: v for k, v in overrides.items() if k in defaults})
+    keys = sorted(space)
+
+    if samples > 0:
+        rng = rng or random.Random(0)
+        combos = [
+            [space[k].sample(rng) if isinstance(space[k], Range) else rng.choice(space[k]) for k in keys]
+            for _ in range(samples)
+        ]
+    else:
+        combos = product(*(space[k].values() if isinstance(space[k], Range) else space[k] for k in keys))
+
+    out, seen = [], set()
+    for combo in [[defaults[k] for k in keys], *combos]:
+        params = {**defaults, **dict(zip(keys, combo))}
+        key = json.dumps(params, sort_keys=True)
+        if key not in seen and valid(method, params):
+            seen.add(key)
+            out.append(params)
+    return out
+
+# --- worker ----------------------------------------------------------------------
+
+_DOCS: Optional[List[Document]] = None
+
+
+def load_docs(paths: List[str]) -> List[Document]:
+    """Girdi dokümanları; ortak aşamalar (cümle, paragraf, bölüm) önceden hesaplanır."""
+    docs = [Document(Path(p).read_text(encoding="utf-8")) for p in paths]
+    for doc in docs:
+        doc.sent_spans
+        doc.para_spans
+        doc.section_sent_spans
+    return docs
+
+
+def _init(paths: List[str]) -> None:
+    global _DOCS
+    if _DOCS is None:  # fork'ta ana süreçten gelir
+        _DOCS = load_docs(paths)
+
+
+def evaluate(method: str, params: Dict[str, Any], target_chars: float, per_chunk_idf: bool) -> Dict[str, Any]:
+    """Tek konfigürasyon: chunk'la, bellekte puanla. Hata süreci düşürmez, sonuç olarak döner."""
+    try:
+        mod = importlib.import_module(f"chunkers.{method}")
+        t0 = time.perf_counter()
+        chunks = [ch for doc in _DOCS for ch in mod.run(doc, **params)]
+        t1 = time.perf_counter()
+        m = chunk_metrics(chunks, per_chunk_idf=per_chunk_idf)
+        t2 = time.perf_counter()
+        m["score"] = score_aggregate(m, target_chars)
+        return {"metrics": m, "chunk_seconds": t1 - t0, "eval_seconds": t2 - t1}
+    except Exception as e:
+        return {"error": str(e)}
+
+# --- rapor -----------------------------------------------------------------------
+
+def _params_str(params: Dict[str, Any]) -> str:
+    return ", ".join(f"{k}={v}" for k, v in sorted(params.items()))
+
+
+def write_summary(results: List[Dict[str, Any]], path: Path, wall: float) -> None:
+    ok = [r for r in results if "error" not in r]
+    lines = ["# Parametre Taraması\n", f"{len(results)} konfigürasyon, {wall:.1f} s\n"]
+    lines.append("| # | Yöntem | Parametreler | Skor | #Chunks | AvgLen | Cohesion | Boundary | Redundancy | DupRate | Chunk s | Eval s |")
+    lines.append("|---:|---|---|---:|---:|---:|---:|---:|---:|---:|---:|---:|")
+    for i, r in enumerate(ok, 1):
+        m, s = r["metrics"], r["metrics"]["stats"]
+        lines.append(
+            f"| {i} | {r['method']} | {_params_str(r['params'])} | {m['score']:.4f} | {s['num']} | "
+            f"{s['avg']:.0f} | {m['cohesion']:.3f} | {m['boundary_sharpness']:.3f} | "
+            f"{m['redundancy']:.3f} | {m['duplicate_rate']:.3f} | {r['chunk_seconds']:.2f} | "
+            f"{r['eval_seconds']:.2f} |"
+        )
+    bad = [r for r in results if "error" in r]
+    if bad:
+        lines.append("\n## Hata Verenler")
+        for r in bad:
+            lines.append(f"- **{r['method']}** ({_params_str(r['params'])}) → {r['error']}")
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+# --- ana akış --------------------------------------------------------------------
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Chunker parametre taraması (bellekte puanlama).")
+    ap.add_argument("--input", nargs="+", default=["data/rag_dataset.json"])
+    ap.add_argument("--methods", nargs="+", default=METHODS, choices=METHODS)
+    ap.add_argument("--param", dest="params", action="append", type=parse_param, default=[],
+                    metavar="K=V1,V2|K=LO:HI[:ADIM]", help="arama uzayını değiştir (tekrarlanabilir)")
+    ap.add_argument("--samples", type=int, default=0,
+                    help="yöntem başına rastgele konfigürasyon sayısı (0: tam grid)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workers", type=int, default=0, help="süreç sayısı (0: CPU sayısı kadar)")
+    ap.add_argument("--target-chars", type=float, default=900.0, help="skordaki boyut hedefi")
+    ap.add_argument("--per-chunk-idf", action="store_true", help="cohesion'da chunk başına IDF")
+    ap.add_argument("--top", type=int, default=10, help="ekrana yazılacak ilk N sonuç")
+    ap.add_argument("--out", type=Path, default=OUT_PATH)
+    args = ap.parse_args(argv)
+
+    overrides = dict(args.params)
+    known = {k for m in args.methods for k in run_params(m)}
+    unknown = sorted(set(overrides) - known)
+    if unknown:
+        ap.error(f"seçili yöntemlerde olmayan parametre(ler): {', '.join(unknown)}")
+
+    rng = random.Random(args.seed)
+    try:
+        jobs = [(m, p) for m in args.methods for p in configs(m, overrides, args.samples, rng)]
+    except ValueError as e:
+        ap.error(str(e))
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    print(f"{len(jobs)} konfigürasyon, {workers} süreç")
+
+    global _DOCS
+    t0 = time.perf_counter()
+    _DOCS = load_docs(args.input)
+    results: List[Dict[str, Any]] = []
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init, initargs=(args.input,)) as pool:
+            futs = {
+                pool.submit(evaluate, m, p, args.target_chars, args.per_chunk_idf): (m, p) for m, p in jobs
+            }
+            for fut in as_completed(futs):
+                m, p = futs[fut]
+                try:
+                    r = fut.result()
+                except Exception as e:  # worker çöktü
+                    r = {"error": str(e)}
+                results.append({"method": m, "params": p, **r})
+    else:
+        for m, p in jobs:
+            results.append({"method": m, "params": p, **evaluate(m, p, args.target_chars, args.per_chunk_idf)})
+    wall = time.perf_counter() - t0
+
+    results.sort(key=lambda r: r["metrics"]["score"] if "error" not in r else float("-inf"), reverse=True)
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(
+        json.dumps({"seconds": wall, "configs": results}, ensure_ascii=False, indent=2), encoding="utf-8"
+    )
+    summary = SUMMARY_PATH if args.out == OUT_PATH else args.out.with_suffix(".md")
+    write_summary(results, summary, wall)
+
+    for i, r in enumerate(results[:args.top], 1):
+        shown = r.get("error") or f"{r['metrics']['score']:.4f}"
+        print(f"{i:>3}. {r['method']:<16} {shown:<10} {_params_str(r['params'])}")
+    print(f"✓ {len(results)} konfigürasyon {wall:.1f} s'de puanlandı: {args.out}, {summary}")
+
+
+if __name__ == "__main__":
+    main()